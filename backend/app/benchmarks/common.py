@@ -0,0 +1,128 @@
+import os
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from sqlalchemy import Engine, create_engine, insert
+
+import models
+from database import Base
+
+# ベンチマーク共通のヘルパー。
+#
+# ベンチマークはテーブルを作り直して大量のデータを投入するため、
+# 必ず専用のデータベースを BENCH_DATABASE_URL で指定して実行する。
+
+SEED_CHUNK_SIZE = 10_000
+
+# タスク名に使う語 (名前の検索のベンチマークで、語ごとの該当件数がばらつくよう
+# 1 件あたり 3 語を選ぶ)
+TASK_NAME_WORDS = [
+    "買い物",
+    "掃除",
+    "洗濯",
+    "ゴミ出し",
+    "料理",
+    "牛乳",
+    "銀行",
+    "病院",
+    "宿題",
+    "振込",
+    "車検",
+    "郵便",
+    "散歩",
+    "水やり",
+    "布団干し",
+    "アイロン",
+    "皿洗い",
+    "予約",
+    "町内会",
+    "保育園",
+]
+
+
+def create_bench_engine() -> Engine:
+    """BENCH_DATABASE_URL からベンチマーク用エンジンを作成する。"""
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        raise SystemExit(
+            "BENCH_DATABASE_URL is not set (use a dedicated database; "
+            "all tables are dropped and re-created)"
+        )
+    return create_engine(url, echo=False)
+
+
+def label_names(n_labels: int) -> List[str]:
+    return [f"bench-label-{i:03d}" for i in range(n_labels)]
+
+
+def seed_tasks(
+    engine: Engine,
+    n_tasks: int,
+    n_labels: int = 50,
+    max_labels_per_task: int = 5,
+    seed: int = 42,
+) -> None:
+    """
+    テーブルを作り直し、n_tasks 件の通常タスクとラベルを一括投入する。
+
+    ラベルは偏りを持たせて割り当てる (番号の小さいラベルほど多くのタスクに付く)。
+    """
+    rng = random.Random(seed)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    label_ids = [str(uuid.uuid4()) for _ in range(n_labels)]
+    base_time = datetime(2025, 1, 1)
+    weights = [1 / (i + 1) for i in range(n_labels)]
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.Label),
+            [
+                {"id": label_id, "name": name}
+                for label_id, name in zip(label_ids, label_names(n_labels))
+            ],
+        )
+        for offset in range(0, n_tasks, SEED_CHUNK_SIZE):
+            task_rows = []
+            link_rows = []
+            for i in range(offset, min(offset + SEED_CHUNK_SIZE, n_tasks)):
+                task_id = str(uuid.uuid4())
+                task_rows.append(
+                    {
+                        "id": task_id,
+                        "name": "の".join(rng.sample(TASK_NAME_WORDS, 3))
+                        + f" {i}",
+                        "assigneeId": None,
+                        "dueDate": (
+                            base_time + timedelta(days=rng.randint(0, 365))
+                            if rng.random() < 0.7
+                            else None
+                        ),
+                        "isCompleted": rng.random() < 0.3,
+                        "isRecurring": False,
+                        "createdAt": base_time + timedelta(seconds=i),
+                        "updatedAt": base_time + timedelta(seconds=i),
+                    }
+                )
+                k = rng.randint(1, max_labels_per_task)
+                for label_id in set(rng.choices(label_ids, weights, k=k)):
+                    link_rows.append(
+                        {"task_id": task_id, "label_id": label_id}
+                    )
+            conn.execute(insert(models.Task), task_rows)
+            conn.execute(insert(models.task_labels_table), link_rows)
+
+
+def measure_ms(fn: Callable[[], object], repeat: int = 5) -> float:
+    """fn を repeat 回実行し、実行時間の中央値 (ミリ秒) を返す。"""
+    fn()  # ウォームアップ
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
@@ -0,0 +1,83 @@
+import argparse
+from typing import List
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+import crud
+from benchmarks.common import (
+    create_bench_engine,
+    label_names,
+    measure_ms,
+    seed_tasks,
+)
+
+# ラベルフィルターの方式 (EXISTS / GROUP BY セミジョイン) を比較するベンチマーク。
+#
+#   BENCH_DATABASE_URL=mysql+mysqlconnector://.../syncfam_bench \
+#       python -m benchmarks.label_filter --sizes 10000 100000 1000000
+#
+# 件数取得 + 1 ページ目の取得 (crud.get_tasks 1 回分) の所要時間の中央値を表示する。
+
+
+def _measure_strategy(
+    engine: Engine, filter_labels: List[str], strategy: str, repeat: int
+) -> float:
+    with Session(engine) as db:
+        elapsed_ms: float = measure_ms(
+            lambda: crud.get_tasks(
+                db, labels=filter_labels, label_filter_strategy=strategy
+            ),
+            repeat=repeat,
+        )
+    return elapsed_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="ラベルフィルター方式のベンチマーク"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="タスク件数",
+    )
+    parser.add_argument(
+        "--label-counts",
+        type=int,
+        nargs="+",
+        default=[1, 3, 5],
+        help="フィルターに指定するラベル数",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_bench_engine()
+    names = label_names(50)
+    print(f"{'tasks':>9} {'labels':>6} {'exists ms':>10} {'grouped ms':>11}")
+    for size in args.sizes:
+        seed_tasks(engine, size)
+        crud.clear_caches()
+        for k in args.label_counts:
+            # 偏りのある割り当てなので、先頭のラベルほど該当件数が多い
+            filter_labels = names[:k]
+            timings = {
+                strategy: _measure_strategy(
+                    engine, filter_labels, strategy, args.repeat
+                )
+                for strategy in (
+                    crud.LABEL_FILTER_EXISTS,
+                    crud.LABEL_FILTER_GROUPED,
+                )
+            }
+            print(
+                f"{size:>9} {k:>6} "
+                f"{timings[crud.LABEL_FILTER_EXISTS]:>10.1f} "
+                f"{timings[crud.LABEL_FILTER_GROUPED]:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+import models
+import schemas
+from responses import model_json_response, validate_model
+
+# タスク一覧のレスポンス生成 (検証 + JSON シリアライズ) の CPU 時間を比較する
+# マイクロベンチマーク。DB は使わない。
+#
+#   python -m benchmarks.response_serialization --tasks 100 --labels 5
+#
+# - standard: PaginatedTasksResponse を組み立てて返し、FastAPI が
+#             response_model で再検証して JSONResponse (標準の json) にする
+# - fast:     from_attributes で一度だけ検証し、model_dump_json でバイト列にする
+
+
+def build_tasks(n_tasks: int, n_labels: int) -> List[models.Task]:
+    """ラベルを n_labels 個ずつ持つ (セッションに属さない) タスクを作る。"""
+    base_time = datetime(2025, 1, 1)
+    labels = [
+        models.Label(
+            id=str(uuid.uuid4()),
+            name=f"bench-label-{i:03d}",
+            color="#336699",
+            createdAt=base_time,
+            updatedAt=base_time,
+        )
+        for i in range(n_labels)
+    ]
+    return [
+        models.Task(
+            id=str(uuid.uuid4()),
+            name=f"bench task {i}",
+            assigneeId=str(uuid.uuid4()),
+            dueDate=base_time + timedelta(days=i),
+            isCompleted=i % 2 == 0,
+            isRecurring=False,
+            createdAt=base_time,
+            updatedAt=base_time,
+            labels=list(labels),
+        )
+        for i in range(n_tasks)
+    ]
+
+
+def _meta(n_tasks: int) -> schemas.PaginationMeta:
+    return schemas.PaginationMeta(
+        totalItems=n_tasks, totalPages=1, currentPage=1, limit=n_tasks
+    )
+
+
+def measure_cpu_ms(fn: Callable[[], bytes], repeat: int) -> float:
+    """fn を repeat 回実行し、1 回あたりの CPU 時間の中央値 (ミリ秒) を返す。"""
+    fn()  # ウォームアップ
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        timings.append((time.process_time() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="タスク一覧のレスポンス生成のマイクロベンチマーク"
+    )
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--labels", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    tasks = build_tasks(args.tasks, args.labels)
+    field = create_response_field(
+        name="Response_read_tasks", type_=schemas.PaginatedTasksResponse
+    )
+    loop = asyncio.new_event_loop()
+
+    def standard() -> bytes:
+        content = schemas.PaginatedTasksResponse(
+            data=tasks, meta=_meta(args.tasks)
+        )
+        body = loop.run_until_complete(
+            serialize_response(field=field, response_content=content)
+        )
+        return JSONResponse(body).body
+
+    def fast() -> bytes:
+        payload = validate_model(
+            schemas.PaginatedTasksResponse,
+            {"data": tasks, "meta": _meta(args.tasks)},
+        )
+        body: bytes = model_json_response(payload).body
+        return body
+
+    # 両方の経路が同じ JSON を返すことを確認してから計測する
+    if json.loads(standard()) != json.loads(fast()):
+        raise SystemExit("standard and fast responses differ")
+
+    print(
+        f"{args.tasks} tasks x {args.labels} labels, "
+        f"{len(fast())} bytes per response"
+    )
+    for name, fn in (("standard", standard), ("fast", fast)):
+        print(f"{name:>9}: {measure_cpu_ms(fn, args.repeat):7.3f} ms CPU")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+from typing import List
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+import crud
+import task_search
+from benchmarks.common import create_bench_engine, measure_ms, seed_tasks
+
+# タスク名の検索 (GET /tasks の q) の方式 (FULLTEXT / LIKE) を比較するベンチマーク。
+#
+#   BENCH_DATABASE_URL=mysql+mysqlconnector://.../syncfam_bench \
+#       python -m benchmarks.task_search --sizes 100000 1000000
+#
+# 関連度順の 1 ページ目 + 件数の取得 (crud.get_tasks 1 回分) の所要時間の
+# 中央値と、該当件数を表示する。FULLTEXT (ngram) インデックスは
+# seed_tasks のテーブル作成時に作られる (MySQL のみ)。
+
+
+def _measure_strategy(
+    engine: Engine, q: str, strategy: str, repeat: int
+) -> float:
+    with Session(engine) as db:
+        elapsed_ms: float = measure_ms(
+            lambda: crud.get_tasks(
+                db,
+                q=q,
+                sort=crud.SORT_RELEVANCE,
+                search_strategy=strategy,
+            ),
+            repeat=repeat,
+        )
+    return elapsed_ms
+
+
+def _count_matches(engine: Engine, q: str) -> int:
+    with Session(engine) as db:
+        total: int = crud.get_tasks(
+            db, q=q, limit=0, search_strategy=task_search.SEARCH_FULLTEXT
+        )[1]
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="タスク名の検索方式のベンチマーク"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100_000, 1_000_000],
+        help="タスク件数",
+    )
+    parser.add_argument(
+        "--queries",
+        nargs="+",
+        default=["買い物", "布団干し", "牛乳 振込", "町内会の保育園"],
+        help="検索文字列 (空白区切りの語はすべて含むタスクに絞り込む)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_bench_engine()
+    if engine.dialect.name != "mysql":
+        raise SystemExit("FULLTEXT search requires MySQL")
+    print(
+        f"{'tasks':>9} {'query':<16} {'matches':>8} "
+        f"{'fulltext ms':>12} {'like ms':>9}"
+    )
+    for size in args.sizes:
+        seed_tasks(engine, size)
+        crud.clear_caches()
+        for q in args.queries:
+            timings: List[float] = [
+                _measure_strategy(engine, q, strategy, args.repeat)
+                for strategy in (
+                    task_search.SEARCH_FULLTEXT,
+                    task_search.SEARCH_LIKE,
+                )
+            ]
+            print(
+                f"{size:>9} {q:<16} {_count_matches(engine, q):>8} "
+                f"{timings[0]:>12.1f} {timings[1]:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
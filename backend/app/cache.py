@@ -0,0 +1,48 @@
+import threading
+import time
+from typing import Dict, Generic, Hashable, Optional, Self, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    有効期限付きのプロセス内キャッシュ (スレッドセーフ)。
+
+    max_entries を超えた場合は、期限切れの項目を削除したうえで古い順に削除する。
+    """
+
+    def __init__(self: Self, ttl: float, max_entries: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._items: Dict[K, Tuple[float, V]] = {}
+
+    def get(self: Self, key: K) -> Optional[V]:
+        """有効期限内の値を返す。ない場合は None。"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return None
+            return value
+
+    def set(self: Self, key: K, value: V) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._items.pop(key, None)
+            if len(self._items) >= self.max_entries:
+                self._items = {
+                    k: item for k, item in self._items.items() if item[0] > now
+                }
+                while len(self._items) >= self.max_entries:
+                    del self._items[next(iter(self._items))]
+            self._items[key] = (now + self.ttl, value)
+
+    def clear(self: Self) -> None:
+        with self._lock:
+            self._items.clear()
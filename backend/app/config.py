@@ -0,0 +1,79 @@
+from functools import lru_cache
+from typing import Literal, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+# 環境変数 (または .env ファイル) から読み込むアプリケーション設定
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # --- DB 接続先 ---
+    database_url: str
+    # 未設定の場合は database_url のドライバを置き換えて使う
+    async_database_url: Optional[str] = None
+    # True の場合、ルーターは AsyncSession (aiomysql) を使う
+    use_async_db: bool = False
+
+    # --- エンジン / コネクションプール ---
+    # SQL を標準出力へログ出力するか (負荷が高いため本番では無効にする)
+    db_echo: bool = False
+    # 常時保持するコネクション数
+    db_pool_size: int = 5
+    # pool_size を超えて一時的に作成できるコネクション数
+    db_max_overflow: int = 10
+    # プールが枯渇している場合にコネクションを待つ秒数
+    db_pool_timeout: float = 30.0
+    # この秒数を超えたコネクションは再接続する (MySQL の wait_timeout 対策)
+    db_pool_recycle: int = 1800
+    # チェックアウト時に接続の生存確認を行うか
+    db_pool_pre_ping: bool = True
+
+    # --- クエリ ---
+    # タスク一覧のラベルフィルターの方式 ("grouped" または "exists")
+    label_filter_strategy: Literal["grouped", "exists"] = "grouped"
+    # タスク一覧のクエリ発行方式 ("fused" または "standard")
+    # fused の COUNT(*) OVER () は一致する全行を読むまで LIMIT で打ち切れないため、
+    # 既定はインデックス順に先頭の行だけを読む standard にする
+    task_list_query_mode: Literal["fused", "standard"] = "standard"
+    # タスク一覧の総数の取得方式 ("exact", "cached" または "estimated")
+    task_count_strategy: Literal["exact", "cached", "estimated"] = "exact"
+    # task_count_strategy="cached" の場合のキャッシュの有効期間 (秒)
+    task_count_cache_ttl: float = 30.0
+    # ラベルカタログ (プロセス内キャッシュ) が他のワーカーでの変更を確認する間隔 (秒)
+    label_catalog_check_interval: float = 5.0
+    # タスク名の検索 (GET /tasks の q) の方式 ("fulltext" または "like")。
+    # fulltext は ngram パーサーの FULLTEXT インデックスを使う (MySQL のみ)
+    task_search_strategy: Literal["fulltext", "like"] = "fulltext"
+    # タスクのエクスポートで 1 回のクエリで読む件数
+    task_export_batch_size: int = 1000
+    # タスクのインポートで 1 回のトランザクション (コミット) で作成する件数
+    task_import_chunk_size: int = 500
+    # 変更フィード (GET /tasks/changes) で返さずにおく直近の秒数。
+    # 書き込み中のトランザクションの変更 (コミット前に updatedAt が決まる) を
+    # 読み飛ばさないための猶予。一括の書き込み (一括操作、インポート、削除) は
+    # table_versions のロックを取った後に updatedAt / deletedAt を記録するため、
+    # 単一タスクの書き込み (ロック待ちを含む) にかかる時間より長くすればよい
+    task_changes_settle_seconds: int = 2
+
+    # --- アプリケーション ---
+    # 新しいレコードの ID の生成方式 ("uuid4" または "uuid7")
+    # (uuid7 は時刻順のため、主キーへの INSERT の局所性が高い)
+    id_generator: Literal["uuid4", "uuid7"] = "uuid4"
+    # 作成/更新日時 (createdAt / updatedAt) の生成方式 ("database" または
+    # "application")。application の場合は UTC の現在時刻をアプリケーション側で
+    # 設定し、書き込み後の再読み込み (refresh) を行わない
+    # (DB 側の既定値と揃えるため、MySQL のタイムゾーンは UTC にしておくこと)
+    timestamp_source: Literal["database", "application"] = "database"
+    # 「今日の定常タスク」などの日付判定に使うタイムゾーン
+    app_timezone: str = "Asia/Tokyo"
+    # routine_occurrences を何日先まで生成しておくか
+    routine_occurrence_days: int = 14
+    # API プロセス内で routine_occurrences を生成する間隔 (秒)。0 で無効
+    routine_occurrence_job_interval: int = 0
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """設定を読み込む (プロセス内で一度だけ)。"""
+    return Settings()  # type: ignore[call-arg]
@@ -1,15 +1,30 @@
 import os
 import time
-from typing import Any, Generator
+from contextlib import nullcontext
+from typing import Any, AsyncGenerator, Generator
 
 import pytest
 from dotenv import load_dotenv
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from database import Base, get_db
+import crud
+from database import (
+    Base,
+    _to_async_url,
+    create_async_session_factory,
+    get_db,
+    get_session,
+    get_session_factory,
+)
 from main import app
 
 # .env ファイルからテスト用DB URLなどを読み込む
@@ -34,6 +49,8 @@ if not TEST_DATABASE_URL:
         f"Warning: TEST_DATABASE_URL not set,"
         f"using default: {TEST_DATABASE_URL}"
     )
+# 非同期セッション (USE_ASYNC_DB=true) のテスト用。未設定なら aiomysql の URL に変換する
+TEST_ASYNC_DATABASE_URL = os.getenv("TEST_ASYNC_DATABASE_URL")
 SERVER_URL = (
     f"mysql+mysqlconnector://root:{ROOT_PASSWORD}@{DB_HOST}:{DB_PORT}/"
     f"mysql?charset=utf8mb4"
@@ -165,6 +182,8 @@ def db_session() -> Generator[Session, Any, None]:
     各テスト関数に独立したDBセッションを提供する Fixture。
     テスト終了後にロールバックすることで、テスト間の影響を防ぐ。
     """
+    # ロールバックされたデータがプロセス内キャッシュに残らないようにする
+    crud.clear_caches()
     connection = engine.connect()
     # トランザクションを開始
     transaction = connection.begin()
@@ -204,6 +223,10 @@ def client(db_session: Session) -> Generator[TestClient, Any, None]:
 
     # アプリケーションの依存性をオーバーライド
     app.dependency_overrides[get_db] = override_get_db
+    # ストリーミングレスポンスもテスト用セッションを使う (クローズしない)
+    app.dependency_overrides[get_session_factory] = lambda: (
+        lambda: nullcontext(db_session)
+    )
 
     # TestClient を作成して提供
     with TestClient(app) as test_client:
@@ -211,3 +234,51 @@ def client(db_session: Session) -> Generator[TestClient, Any, None]:
 
     # テスト終了後にオーバーライドを元に戻す (通常は不要)
     # app.dependency_overrides.clear()
+
+
+# --- 非同期エンジン Fixture ---
+@pytest.fixture(scope="function")
+def async_engine() -> Generator[AsyncEngine, Any, None]:
+    """
+    テスト用 DB に接続する非同期エンジン (aiomysql) を提供する Fixture。
+
+    コネクションは使用するイベントループ内で作成・破棄する (NullPool)。
+    """
+    test_async_engine = create_async_engine(
+        TEST_ASYNC_DATABASE_URL or _to_async_url(TEST_DATABASE_URL),
+        poolclass=NullPool,
+    )
+    yield test_async_engine
+    test_async_engine.sync_engine.dispose()
+
+
+# --- 非同期セッション用 TestClient Fixture ---
+@pytest.fixture(scope="function")
+def async_client(
+    async_engine: AsyncEngine,
+) -> Generator[TestClient, Any, None]:
+    """
+    ルーターが AsyncSession (USE_ASYNC_DB=true の構成) を受け取る TestClient。
+
+    run_db が run_sync 経由で crud 関数を実行する経路をテストする。
+    リクエストごとにセッションを開いてコミットするため、
+    db_session のロールバックは効かない。テスト後に全テーブルを空にする。
+    """
+    crud.clear_caches()
+    # アプリケーションと同じ設定 (expire_on_commit=False など) のファクトリを使う
+    async_session_local = create_async_session_factory(async_engine)
+
+    async def override_get_session() -> AsyncGenerator[AsyncSession, None]:
+        async with async_session_local() as db:
+            yield db
+
+    app.dependency_overrides[get_session] = override_get_session
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        del app.dependency_overrides[get_session]
+        with engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(table.delete())
+        crud.clear_caches()
@@ -1,13 +1,106 @@
-from typing import List, Optional, Tuple
+import base64
+import json
+import threading
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Self,
+    Set,
+    Tuple,
+    cast,
+)
 from uuid import UUID
 
-from sqlalchemy import ColumnElement, and_, case
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    bindparam,
+    case,
+    delete,
+    false,
+    insert,
+    or_,
+    tuple_,
+    update,
+)
 from sqlalchemy import func as sql_func
 from sqlalchemy import select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.engine import CursorResult, Result
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, lazyload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 import models
+import recurrence
 import schemas
+import table_versions
+import task_search
+from cache import TTLCache
+from config import get_settings
+from db_types import new_id
+from explain import explain_json
+from label_catalog import LABELS_TABLE, LabelCatalog
+
+# タスク一覧の内容 (通常タスク、定常タスクの発生記録) のバージョン名。
+# タスクを書き込む関数は同じトランザクションで table_versions を更新し、
+# 一覧 API の ETag の計算に使う
+TASKS_TABLE = "tasks"
+
+# ラベルフィルターの方式
+# - "grouped": ラベル名を ID に解決し、task_labels の GROUP BY / HAVING で絞り込む
+# - "exists": ラベルごとに EXISTS サブクエリを発行する (従来の方式)
+LABEL_FILTER_GROUPED = "grouped"
+LABEL_FILTER_EXISTS = "exists"
+
+# タスク一覧のクエリ発行方式
+# - "fused": 総数を COUNT(*) OVER () でページと同時に取得し、
+#            定常タスクと通常タスクのラベルを 1 回のクエリでまとめて読み込む
+#            (ウィンドウ関数のために一致する全行を読むため、ORDER BY のインデックス
+#             順に読んで LIMIT で打ち切ることができない。行数が少ない場合向け)
+# - "standard": 総数・ページ・ラベルをそれぞれ別のクエリで取得する (既定)。
+#               ページはインデックス順に limit + 1 行だけ読み、最終ページでは
+#               総数を数えない
+TASK_QUERY_FUSED = "fused"
+TASK_QUERY_STANDARD = "standard"
+
+# 通常タスクの総数 (PaginationMeta.totalItems) の取得方式
+# - "exact": 毎回 COUNT で数える
+# - "cached": フィルター条件ごとに TTL 付きでキャッシュする
+#             (キーに tasks のバージョンを含めるため、他のワーカーの更新でも
+#             古い総数は使われない。同じワーカーの更新では破棄する)
+# - "estimated": MySQL のオプティマイザの推定行数を使う
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+
+# 総数のキャッシュのキー (tasks のバージョンと、_normalize_task_filters で
+# 正規化したフィルター条件: 担当者, 完了状態, ラベル名, 検索語, 期限日の範囲)
+TaskFilterKey = Tuple[
+    int,
+    Optional[str],
+    Optional[bool],
+    Tuple[str, ...],
+    Tuple[str, ...],
+    Tuple[Optional[date], Optional[date]],
+]
+
+_task_count_cache: TTLCache[TaskFilterKey, int] = TTLCache(
+    ttl=get_settings().task_count_cache_ttl
+)
+
+# 関連度順のソート (名前の検索 q を指定した場合の既定)。ページはキーセット方式
+# ではなく page で指定する (関連度は検索語ごとに変わるためカーソルにできない)
+SORT_RELEVANCE = "relevance"
+
+# routine_occurrences を一括 INSERT する際の 1 文あたりの最大行数
+OCCURRENCE_INSERT_CHUNK_SIZE = 1000
 
 
 # --- ヘルパー関数 ---
@@ -17,6 +110,9 @@ def get_labels_by_ids(
     """
     指定された ID のリストに一致する Label オブジェクトのリストを取得する。
 
+    ラベルカタログ (プロセス内キャッシュ) から取得し、セッションに取り込む
+    (通常はクエリを発行しない)。
+
     Args:
         db: SQLAlchemy セッションオブジェクト。
         label_ids: 取得したいラベルの UUID のリスト。
@@ -26,9 +122,10 @@ def get_labels_by_ids(
     """
     if not label_ids:
         return []
-    label_id_strs = [str(label_id) for label_id in label_ids]
-    stmt = select(models.Label).where(models.Label.id.in_(label_id_strs))
-    return list(db.scalars(stmt).all())
+    found, _ = label_catalog.get_by_ids(
+        db, [str(label_id) for label_id in label_ids]
+    )
+    return [db.merge(label, load=False) for label in found]
 
 
 def get_task(db: Session, task_id: str) -> models.Task | None:
@@ -51,31 +148,85 @@ def get_task(db: Session, task_id: str) -> models.Task | None:
     return db.scalars(stmt).first()
 
 
+# get_tasks 用のヘルパー関数 (担当者フィルターの解決)
+def _resolve_assignee_id(
+    assignee_id: Optional[str], current_user_id: Optional[str]
+) -> Optional[str]:
+    """assigneeId フィルターの値 ('me' または UUID) を実際の担当者IDに解決する。"""
+    if assignee_id == "me" and current_user_id:
+        return current_user_id
+    if assignee_id and assignee_id != "me":
+        try:
+            UUID(assignee_id, version=4)
+            return assignee_id
+        except ValueError:
+            print(
+                f"Warning: Invalid assigneeId format in filter: {assignee_id}"
+            )
+    return None
+
+
+# get_tasks 用のヘルパー関数 (フィルター条件の正規化)
+def _normalize_task_filters(
+    tasks_version: int,
+    assignee_id: Optional[str],
+    is_completed: Optional[bool],
+    labels: Optional[List[str]],
+    current_user_id: Optional[str],
+    search_terms: Optional[List[str]] = None,
+    due_after: Optional[date] = None,
+    due_before: Optional[date] = None,
+) -> TaskFilterKey:
+    """
+    _build_task_filter_conditions と同じ意味になるフィルター条件を、
+    キャッシュのキーに使える正規化されたタプルに変換する。
+
+    tasks_version (table_versions の tasks のバージョン) をキーに含めるため、
+    どのワーカーでタスクが更新されても以前のキャッシュ値は使われない。
+    """
+    return (
+        tasks_version,
+        _resolve_assignee_id(assignee_id, current_user_id),
+        is_completed,
+        tuple(sorted(set(labels or []))),
+        tuple(sorted(set(search_terms or []))),
+        (due_after, due_before),
+    )
+
+
+def _start_of_day(day: date) -> datetime:
+    """日付を dueDate (DATETIME) と比較できるその日の 0 時にする。"""
+    return datetime.combine(day, datetime.min.time())
+
+
 # get_tasks 用のヘルパー関数 (フィルター条件構築)
 def _build_task_filter_conditions(
     assignee_id: Optional[str],
     is_completed: Optional[bool],
     labels: Optional[List[str]],
     current_user_id: Optional[str],
+    label_id_map: Optional[Dict[str, str]] = None,
+    search_terms: Optional[List[str]] = None,
+    search_strategy: str = task_search.SEARCH_LIKE,
+    due_after: Optional[date] = None,
+    due_before: Optional[date] = None,
 ) -> List[ColumnElement[bool]]:  # SQLAlchemy の条件式のリストを返す
-    """タスク一覧取得用のフィルター条件リストを構築する。"""
+    """
+    タスク一覧取得用のフィルター条件リストを構築する。
+
+    label_id_map (ラベル名 -> ID) が指定された場合、ラベルフィルターは
+    task_labels の GROUP BY / HAVING による 1 つのセミジョインで構築する。
+    指定されない場合はラベルごとの EXISTS サブクエリで構築する。
+    search_terms (名前の検索語) は search_strategy の方式で絞り込む。
+    due_after / due_before は期限日の範囲 (いずれもその日を含む) で、
+    指定した場合は期限日のないタスクを含まない。
+    """
     filter_conditions: List[ColumnElement[bool]] = []
     # 通常タスクのみを対象とする
     filter_conditions.append(models.Task.isRecurring == 0)
 
     # 担当者フィルター
-    effective_assignee_id: Optional[str] = None
-    if assignee_id == "me" and current_user_id:
-        effective_assignee_id = current_user_id
-    elif assignee_id and assignee_id != "me":
-        try:
-            UUID(assignee_id, version=4)
-            effective_assignee_id = assignee_id
-        except ValueError:
-            print(
-                f"Warning: Invalid assigneeId format in filter: {assignee_id}"
-            )
-
+    effective_assignee_id = _resolve_assignee_id(assignee_id, current_user_id)
     if effective_assignee_id is not None:
         filter_conditions.append(
             models.Task.assigneeId == effective_assignee_id
@@ -88,42 +239,227 @@ def _build_task_filter_conditions(
         )
 
     # ラベルフィルター (AND 条件)
-    if labels:
+    if labels and label_id_map is not None:
+        filter_conditions.append(
+            _build_label_semi_join_condition(labels, label_id_map)
+        )
+    elif labels:
         label_conditions = [
             models.Task.labels.any(models.Label.name == label_name)
             for label_name in labels
         ]
         if label_conditions:
             filter_conditions.append(and_(*label_conditions))
+
+    # 期限日の範囲フィルター (dueDate は日付の 0 時で保存されている)
+    if due_after is not None:
+        filter_conditions.append(
+            models.Task.dueDate >= _start_of_day(due_after)
+        )
+    if due_before is not None:
+        filter_conditions.append(
+            models.Task.dueDate < _start_of_day(due_before + timedelta(days=1))
+        )
+
+    # 名前の検索 (すべての検索語を含む)
+    if search_terms:
+        filter_conditions.append(
+            task_search.build_condition(search_terms, search_strategy)
+        )
     return filter_conditions
 
 
+# get_tasks 用のヘルパー関数 (ラベルフィルターのセミジョイン構築)
+def _build_label_semi_join_condition(
+    labels: List[str], label_id_map: Dict[str, str]
+) -> ColumnElement[bool]:
+    """
+    指定されたラベルをすべて持つタスクに絞り込む条件式を構築する。
+
+    task_id IN (SELECT task_id FROM task_labels WHERE label_id IN (...)
+    GROUP BY task_id HAVING COUNT(*) = k) の形で、ラベル数に関係なく
+    サブクエリは 1 つになる。
+    """
+    label_ids = {label_id_map.get(name) for name in labels}
+    if None in label_ids:
+        # 存在しないラベル名が含まれる場合、該当するタスクはない
+        return false()
+    task_labels = models.task_labels_table
+    matching_task_ids = (
+        select(task_labels.c.task_id)
+        .where(task_labels.c.label_id.in_(label_ids))
+        .group_by(task_labels.c.task_id)
+        # (task_id, label_id) は主キーなので COUNT(*) は
+        # COUNT(DISTINCT label_id) と等しい
+        .having(sql_func.count() == len(label_ids))
+    )
+    condition: ColumnElement[bool] = models.Task.id.in_(matching_task_ids)
+    return condition
+
+
 # get_tasks 用のヘルパー関数 (ソート条件構築)
 def _build_task_order_by_clause(sort: str) -> Optional[ColumnElement]:
-    """タスク一覧取得用のソート条件式を構築する。"""
+    """
+    タスク一覧取得用のソート条件式を構築する。
+
+    インデックス (models.Task の ix_tasks_list_*) の順序で読めるように、
+    タイブレークの Task.id はソート列と同じ向きにする。
+    """
     order_by_clauses: List[ColumnElement] = []
     if sort == "dueDate_asc":
-        order_by_clauses.append(
-            case((models.Task.dueDate.is_(None), 1), else_=0).asc()
-        )
-        order_by_clauses.append(models.Task.dueDate.asc())
+        # NULL を最後にするため、NULL を最大値に置き換えた生成列で並べる
+        order_by_clauses.append(models.Task.dueDateSortKey.asc())
+        order_by_clauses.append(models.Task.id.asc())
     elif sort == "dueDate_desc":
-        order_by_clauses.append(
-            case((models.Task.dueDate.is_(None), 1), else_=0).asc()
-        )
+        # NULL は最小値として扱われるため、降順では最後になる
         order_by_clauses.append(models.Task.dueDate.desc())
+        order_by_clauses.append(models.Task.id.desc())
     elif sort == "createdAt_asc":
         order_by_clauses.append(models.Task.createdAt.asc())
-    elif sort == "createdAt_desc":  # デフォルト含む
+        order_by_clauses.append(models.Task.id.asc())
+    elif sort in ("createdAt_desc", SORT_RELEVANCE):  # デフォルト含む
+        # 関連度順では、関連度 (呼び出し側で先頭に追加する) が同じ行を新しい順にする
         order_by_clauses.append(models.Task.createdAt.desc())
-    order_by_clauses.append(models.Task.id.asc())
+        order_by_clauses.append(models.Task.id.desc())
+    else:
+        order_by_clauses.append(models.Task.id.asc())
     return order_by_clauses if order_by_clauses else None
 
 
+# get_tasks 用のヘルパー関数 (カーソルのエンコード)
+def _encode_task_cursor(sort: str, task: models.Task) -> str:
+    """
+    タスクのソートキーと ID を不透明なカーソル文字列にエンコードする。
+
+    _build_task_order_by_clause と同じキー (ソート列 + Task.id) を保持する。
+    """
+    sort_value: Optional[datetime] = None
+    if sort in ("dueDate_asc", "dueDate_desc"):
+        sort_value = task.dueDate
+    elif sort in ("createdAt_asc", "createdAt_desc"):
+        sort_value = task.createdAt
+    payload = {
+        "s": sort,
+        "v": sort_value.isoformat() if sort_value is not None else None,
+        "id": str(task.id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+# get_tasks 用のヘルパー関数 (カーソルのデコード)
+def _decode_task_cursor(
+    sort: str, cursor: str
+) -> Tuple[Optional[datetime], str]:
+    """
+    カーソル文字列を (ソート列の値, Task.id) にデコードする。
+
+    Raises:
+        ValueError: カーソルの形式が不正、またはソート順と一致しない場合。
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload: Any = json.loads(base64.urlsafe_b64decode(padded))
+        task_id = str(UUID(str(payload["id"])))
+        cursor_sort = payload["s"]
+        raw_value = payload["v"]
+        sort_value = (
+            datetime.fromisoformat(raw_value)
+            if raw_value is not None
+            else None
+        )
+    except (KeyError, TypeError, ValueError):
+        # binascii.Error / JSONDecodeError は ValueError のサブクラス
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError("Cursor does not match the requested sort order")
+    if sort_value is None and sort in ("createdAt_asc", "createdAt_desc"):
+        raise ValueError("Invalid cursor")
+    return sort_value, task_id
+
+
+# get_tasks 用のヘルパー関数 (キーセット条件構築)
+def _build_task_keyset_condition(
+    sort: str, sort_value: Optional[datetime], task_id: str
+) -> ColumnElement[bool]:
+    """
+    カーソル位置より後ろの行を取得するための条件式を構築する。
+
+    _build_task_order_by_clause の並び順 (dueDate は NULLS LAST、
+    Task.id のタイブレークはソート列と同じ向き) に対応する。
+    """
+    task = models.Task
+    if sort in ("dueDate_asc", "dueDate_desc"):
+        ascending = sort == "dueDate_asc"
+        after_id = task.id > task_id if ascending else task.id < task_id
+        if sort_value is None:
+            # NULL グループ (末尾) 内では id のみで順序が決まる
+            return and_(task.dueDate.is_(None), after_id)
+        if ascending:
+            sort_key = task.dueDateSortKey  # NULL は最大値に置き換え済み
+            return or_(
+                sort_key > sort_value,
+                and_(sort_key == sort_value, after_id),
+            )
+        # 降順では非 NULL の後ろに NULL グループが続く
+        return or_(
+            task.dueDate < sort_value,
+            task.dueDate.is_(None),
+            and_(task.dueDate == sort_value, after_id),
+        )
+    if sort == "createdAt_asc":
+        return or_(
+            task.createdAt > sort_value,
+            and_(task.createdAt == sort_value, task.id > task_id),
+        )
+    if sort == "createdAt_desc":
+        return or_(
+            task.createdAt < sort_value,
+            and_(task.createdAt == sort_value, task.id < task_id),
+        )
+    after: ColumnElement[bool] = task.id > task_id
+    return after
+
+
 # --- Label CRUD ---
+# ラベル一覧のプロセス内キャッシュ (ラベルの作成/更新/削除時に破棄する)
+label_catalog = LabelCatalog(
+    check_interval=get_settings().label_catalog_check_interval
+)
+
+
+def get_table_versions(db: Session, tables: List[str]) -> Dict[str, int]:
+    """
+    ETag の計算に使うテーブルのバージョンを取得する。
+
+    labels を含む場合は、ラベルカタログをそのバージョンに揃える
+    (カタログから組み立てるレスポンスが ETag より古くならないようにする)。
+    """
+    versions: Dict[str, int] = table_versions.get_versions(db, tables)
+    if LABELS_TABLE in versions:
+        label_catalog.sync(db, versions[LABELS_TABLE])
+    return versions
+
+
+def get_label_id_map(db: Session, names: List[str]) -> Dict[str, str]:
+    """
+    ラベル名から ID への対応を取得する (ラベルカタログから取得する)。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        names: ラベル名のリスト。
+
+    Returns:
+        ラベル名 -> ID 文字列の辞書。存在しないラベル名は含まれない。
+    """
+    id_map: Dict[str, str] = label_catalog.get_id_map(db, names)
+    return id_map
+
+
 def get_label_by_name(db: Session, name: str) -> models.Label | None:
     """
-    指定された名前のラベルを取得する。
+    指定された名前のラベルを取得する (ラベルカタログから取得し、
+    セッションに取り込む)。
 
     Args:
         db: SQLAlchemy セッションオブジェクト。
@@ -132,15 +468,18 @@ def get_label_by_name(db: Session, name: str) -> models.Label | None:
     Returns:
         models.Label オブジェクト、または見つからない場合は None。
     """
-    stmt = select(models.Label).where(models.Label.name == name)
-    return db.scalars(stmt).first()
+    label = label_catalog.get_by_name(db, name)
+    return db.merge(label, load=False) if label is not None else None
 
 
 def get_labels(
     db: Session, skip: int = 0, limit: int = 100
 ) -> list[models.Label]:
     """
-    ラベルの一覧を取得する (ページネーション対応)。
+    ラベルの一覧を名前順に取得する (ページネーション対応)。
+
+    ラベルカタログのインスタンスをそのまま返す (セッションには属さないため、
+    参照専用として扱うこと)。
 
     Args:
         db: SQLAlchemy セッションオブジェクト。
@@ -150,35 +489,287 @@ def get_labels(
     Returns:
         models.Label オブジェクトのリスト。
     """
+    labels: List[models.Label] = label_catalog.get_page(db, skip, limit)
+    return labels
+
+
+# ラベルの利用状況: (ラベル, 未完了のタスク数, タスク数)
+LabelUsage = Tuple[models.Label, int, int]
+
+
+def _encode_label_cursor(name: str) -> str:
+    """ラベル名を不透明なカーソル文字列にエンコードする。"""
+    raw = json.dumps({"n": name}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_label_cursor(cursor: str) -> str:
+    """
+    カーソル文字列をラベル名にデコードする。
+
+    Raises:
+        ValueError: カーソルの形式が不正な場合。
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload: Any = json.loads(base64.urlsafe_b64decode(padded))
+        name = payload["n"]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(name, str):
+        raise ValueError("Invalid cursor")
+    return name
+
+
+def get_label_usage(
+    db: Session, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[LabelUsage], Optional[str]]:
+    """
+    ラベルの一覧を名前順に、通常タスクの件数 (未完了 / 全体) とともに取得する。
+
+    ラベルはラベルカタログから名前のキーセット方式で取得し、件数は
+    そのページのラベルについて task_labels を 1 回の GROUP BY で集計する。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        cursor: 前ページの nextCursor (None の場合は先頭から)。
+        limit: 取得する最大件数。
+
+    Returns:
+        タプル: (ラベルと件数のリスト, 次ページのカーソル (ない場合は None))
+
+    Raises:
+        ValueError: カーソルの形式が不正な場合に発生。
+    """
+    after_name = _decode_label_cursor(cursor) if cursor is not None else None
+    # 次ページの有無を判定するために 1 件多く取得する
+    labels = label_catalog.get_page_after(db, after_name, limit + 1)
+    next_cursor = None
+    if len(labels) > limit:
+        labels = labels[:limit]
+        next_cursor = _encode_label_cursor(str(labels[-1].name))
+    if not labels:
+        return [], None
+
+    label_id = models.task_labels_table.c.label_id
     stmt = (
-        select(models.Label)
-        .offset(skip)
-        .limit(limit)
-        .order_by(models.Label.name)
-    )  # 名前順でソート
-    return list(db.scalars(stmt).all())
+        select(
+            label_id,
+            sql_func.count(),
+            sql_func.sum(case((models.Task.isCompleted == 0, 1), else_=0)),
+        )
+        .join(
+            models.Task, models.Task.id == models.task_labels_table.c.task_id
+        )
+        .where(
+            label_id.in_([label.id for label in labels]),
+            models.Task.isRecurring == 0,
+        )
+        .group_by(label_id)
+    )
+    counts = {
+        row_label_id: (int(open_count or 0), int(total))
+        for row_label_id, total, open_count in db.execute(stmt)
+    }
+    usage = [(label, *counts.get(str(label.id), (0, 0))) for label in labels]
+    return usage, next_cursor
+
+
+class LabelNameConflictError(ValueError):
+    """同じ名前のラベルが既に存在する場合に発生する。"""
 
 
 def create_label(db: Session, label: schemas.LabelCreate) -> models.Label:
     """
     新しいラベルを作成する。
 
+    名前の重複は事前に確認せず、INSERT の一意制約違反で検出する
+    (同時に同じ名前で作成された場合も、どちらか一方のみが成功する)。
+
     Args:
         db: SQLAlchemy セッションオブジェクト。
         label: 作成するラベルの情報 (Pydantic スキーマ)。
 
     Returns:
         作成された models.Label オブジェクト。
+
+    Raises:
+        LabelNameConflictError: 同じ名前のラベルが既に存在する場合に発生。
     """
     # Pydantic モデルから SQLAlchemy モデルのインスタンスを作成
     db_label = models.Label(**label.model_dump())
+    response_label = None
+    if _uses_app_timestamps():
+        # 全列の値を確定させ、コミット後に読み直さずに返せるようにする
+        now = _current_timestamp()
+        db_label.id = new_id()
+        db_label.createdAt = db_label.updatedAt = now
+        response_label = models.Label(
+            id=db_label.id,
+            name=db_label.name,
+            color=db_label.color,
+            createdAt=now,
+            updatedAt=now,
+        )
     db.add(db_label)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise LabelNameConflictError(
+            f"Label with name '{label.name}' already exists"
+        )
+    # 他のワーカーのラベルカタログが変更を検出できるようにバージョンを上げる
+    table_versions.bump_version(db, LABELS_TABLE)
     db.commit()  # データベースに変更をコミット
+    label_catalog.invalidate()
+    if response_label is not None:
+        return response_label
     db.refresh(db_label)  # 作成されたオブジェクト (IDなど) を再読み込み
     return db_label
 
 
+def ensure_labels(
+    db: Session, labels: List[schemas.LabelCreate]
+) -> Tuple[Dict[str, str], int]:
+    """
+    指定された名前のラベルがすべて存在するようにする (存在しないものを作成する)。
+
+    存在確認はラベルカタログで行い、存在しないラベルは 1 回の
+    INSERT IGNORE (executemany) でまとめて作成する。他のリクエストが同時に
+    同じ名前のラベルを作成した場合は、その行を使う (一意制約で無視される)。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        labels: ラベルの名前と色のリスト (同じ名前は最初の指定を使う)。
+
+    Returns:
+        タプル: (指定されたラベル名 -> ID 文字列の辞書, 作成したラベルの数)
+    """
+    names = list(dict.fromkeys(label.name for label in labels))
+    existing = label_catalog.get_id_map(db, names)
+    # ラベルカタログと同じく、大文字小文字を区別せずに重複を除く
+    missing: Dict[str, schemas.LabelCreate] = {}
+    for label in labels:
+        if label.name not in existing:
+            missing.setdefault(label.name.casefold(), label)
+    if not missing:
+        return existing, 0
+
+    now = _write_timestamp(db)
+    rows = [
+        dict(label.model_dump(), id=new_id(), createdAt=now, updatedAt=now)
+        for label in missing.values()
+    ]
+    db.execute(
+        insert(models.Label)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite"),
+        rows,
+    )
+    table_versions.bump_version(db, LABELS_TABLE)
+    db.commit()
+    label_catalog.invalidate()
+    id_map = label_catalog.get_id_map(db, names)
+    # 一意制約で無視された行 (同時に作成されたラベル) は数えない
+    new_ids = {row["id"] for row in rows}
+    return id_map, len(new_ids & set(id_map.values()))
+
+
+def clear_caches() -> None:
+    """プロセス内のキャッシュ (ラベルカタログ、タスク総数) をすべて破棄する。"""
+    label_catalog.invalidate()
+    invalidate_task_count_cache()
+
+
+# 作成/更新日時の生成方式
+# - "database": DB の NOW() を使い、書き込み後に refresh で読み直す
+# - "application": アプリケーション側で生成し、書き込み後の読み直しを行わない
+TIMESTAMPS_DATABASE = "database"
+TIMESTAMPS_APPLICATION = "application"
+
+
+def _uses_app_timestamps() -> bool:
+    timestamp_source: str = get_settings().timestamp_source
+    return timestamp_source == TIMESTAMPS_APPLICATION
+
+
+def _current_timestamp() -> datetime:
+    """
+    アプリケーション側で生成する作成/更新日時 (UTC)。
+
+    DB から読み込んだ値と同じ形式になるよう、タイムゾーン情報を持たない
+    秒単位 (DATETIME の精度) の値にする。
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def _write_timestamp(db: Session) -> datetime:
+    """一括書き込みの各行に設定する作成/更新日時を返す。"""
+    if _uses_app_timestamps():
+        return _current_timestamp()
+    return db.execute(select(sql_func.now())).scalar_one()
+
+
+def _rowcount(result: Result[Any]) -> int:
+    """DML (INSERT/UPDATE/DELETE) の実行結果から影響を受けた行数を返す。"""
+    return cast(CursorResult[Any], result).rowcount
+
+
+def _stamp_task_updates(db: Session, task_ids: List[str]) -> datetime:
+    """
+    一括で書き込んだタスクの updatedAt を現在時刻で書き直し、その時刻を返す。
+
+    bump_version の後 (コミットの直前) に呼ぶ。タスクの書き込みは
+    table_versions の行のロックで直列化されるため、ロックを取った後の時刻は
+    コミットの順に並ぶ。書き込みに時間がかかっても、変更フィード
+    (get_task_changes) が読み進めた位置より前の updatedAt でコミットされない。
+    """
+    now = _write_timestamp(db)
+    db.execute(
+        update(models.Task.__table__)
+        .where(models.Task.id.in_(task_ids))
+        .values(updatedAt=now)
+    )
+    return now
+
+
 # --- Task CRUD ---
+# create_task / update_task 用のヘルパー関数 (紐付けるラベルの取得と検証)
+def _missing_labels_error(missing_ids: List[str]) -> str:
+    return f"Labels not found with IDs: {', '.join(missing_ids)}"
+
+
+def _get_catalog_labels(
+    db: Session, label_ids: List[UUID]
+) -> List[models.Label]:
+    """
+    タスクに紐付けるラベルをラベルカタログから取得する。
+
+    返す Label はカタログの (セッションに属さない) オブジェクトのため、
+    レスポンスの組み立てにのみ使い、セッションには追加しないこと。
+
+    重複して指定されたラベルは 1 つにまとめる (指定順)。
+
+    Raises:
+        ValueError: 指定された label_id が存在しない場合に発生。
+    """
+    found: List[models.Label]
+    found, missing_ids = label_catalog.get_by_ids(
+        db, list(dict.fromkeys(str(label_id) for label_id in label_ids))
+    )
+    if missing_ids:
+        raise ValueError(_missing_labels_error(missing_ids))
+    return found
+
+
+def _merge_labels(
+    db: Session, labels: List[models.Label]
+) -> List[models.Label]:
+    """ラベルカタログの Label をセッションに取り込む (SELECT は発行しない)。"""
+    return [db.merge(label, load=False) for label in labels]
+
+
 def create_task(
     db: Session, task_data: schemas.TaskCreateApiInput
 ) -> models.Task:
@@ -195,17 +786,9 @@ def create_task(
     Raises:
         ValueError: 指定された label_id が存在しない場合に発生。
     """
-    # 1. 紐付ける Label オブジェクトを取得
-    db_labels = get_labels_by_ids(db, task_data.label_ids)
-    # 指定された ID のラベルがすべて見つかったか検証
-    if len(db_labels) != len(task_data.label_ids):
-        found_ids = {str(label.id) for label in db_labels}
-        missing_ids = [
-            str(id) for id in task_data.label_ids if str(id) not in found_ids
-        ]
-        raise ValueError(
-            f"Labels not found with IDs: {', '.join(map(str, missing_ids))}"
-        )
+    # 1. 紐付ける Label オブジェクトを取得 (ラベルカタログで検証する)
+    catalog_labels = _get_catalog_labels(db, task_data.label_ids)
+    db_labels = _merge_labels(db, catalog_labels)
 
     # 2. Task オブジェクトを作成 (labels を除く)
     #    Pydantic スキーマから SQLAlchemy モデルへの変換
@@ -218,13 +801,143 @@ def create_task(
     # 3. 取得した Label オブジェクトを Task の labels リレーションシップに追加
     db_task.labels.extend(db_labels)
 
+    response_task = None
+    if _uses_app_timestamps():
+        # 全列の値を確定させ、コミット後に読み直さずに返せるようにする
+        now = _current_timestamp()
+        db_task.id = new_id()
+        db_task.isCompleted = False
+        db_task.isRecurring = False
+        db_task.createdAt = db_task.updatedAt = now
+        response_task = _copy_task(db_task, catalog_labels)
+
     # 4. DB に追加してコミット
     db.add(db_task)
+    table_versions.bump_version(db, TASKS_TABLE)
     db.commit()
+    invalidate_task_count_cache()
+    if response_task is not None:
+        return response_task
     db.refresh(db_task)  # リレーションシップを含めて最新の状態を取得
     return db_task
 
 
+# task_labels の書き込み回数の計測
+class TaskLabelWriteStats:
+    """
+    task_labels の差分更新で書き込んだ行数と、書き込みを省略できた行数を
+    集計する (スレッドセーフ)。
+
+    省略できた行数は「既存の行をすべて DELETE して全件 INSERT する」場合の
+    書き込み行数との差。
+    """
+
+    def __init__(self: Self) -> None:
+        self._lock = threading.Lock()
+        self.updates = 0
+        self.inserted = 0
+        self.deleted = 0
+        self.avoided = 0
+
+    def record(self: Self, inserted: int, deleted: int, avoided: int) -> None:
+        with self._lock:
+            self.updates += 1
+            self.inserted += inserted
+            self.deleted += deleted
+            self.avoided += avoided
+
+    def snapshot(self: Self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "updates": self.updates,
+                "inserted": self.inserted,
+                "deleted": self.deleted,
+                "avoided": self.avoided,
+            }
+
+
+task_label_write_stats = TaskLabelWriteStats()
+
+
+def _insert_task_labels(
+    db: Session, links: List[Tuple[str, List[models.Label]]]
+) -> None:
+    """task_labels に (タスクID, ラベル) の行を一括 INSERT する。"""
+    link_rows = [
+        {"task_id": task_id, "label_id": label.id}
+        for task_id, labels in links
+        for label in labels
+    ]
+    if link_rows:
+        db.execute(insert(models.task_labels_table), link_rows)
+
+
+def _get_task_label_ids(
+    db: Session, task_ids: Set[str]
+) -> Dict[str, Set[str]]:
+    """タスクID -> 紐付いているラベルIDの集合 を 1 回のクエリで取得する。"""
+    task_labels = models.task_labels_table
+    label_ids_by_task: Dict[str, Set[str]] = {}
+    for task_id, label_id in db.execute(
+        select(task_labels.c.task_id, task_labels.c.label_id).where(
+            task_labels.c.task_id.in_(task_ids)
+        )
+    ):
+        label_ids_by_task.setdefault(task_id, set()).add(label_id)
+    return label_ids_by_task
+
+
+def _sync_task_labels(
+    db: Session,
+    current: Dict[str, Set[str]],
+    requested: Dict[str, List[str]],
+) -> None:
+    """
+    task_labels を差分のみ書き込んで、各タスクのラベルを requested に合わせる。
+
+    追加分は 1 回の INSERT (executemany)、削除分は 1 回の DELETE (executemany)
+    で書き込み、変更のない行には触れない。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        current: タスクID -> 現在紐付いているラベルIDの集合。
+        requested: タスクID -> 更新後のラベルIDのリスト。
+    """
+    task_labels = models.task_labels_table
+    delete_rows: List[Dict[str, str]] = []
+    insert_rows: List[Dict[str, str]] = []
+    full_rewrite = 0
+    for task_id, label_ids in requested.items():
+        old_ids = current.get(task_id, set())
+        new_ids = set(label_ids)
+        delete_rows.extend(
+            {"b_task_id": task_id, "b_label_id": label_id}
+            for label_id in sorted(old_ids - new_ids)
+        )
+        insert_rows.extend(
+            {"task_id": task_id, "label_id": label_id}
+            for label_id in sorted(new_ids - old_ids)
+        )
+        full_rewrite += len(old_ids) + len(new_ids)
+
+    if delete_rows:
+        db.execute(
+            delete(task_labels).where(
+                task_labels.c.task_id == bindparam("b_task_id"),
+                task_labels.c.label_id == bindparam("b_label_id"),
+            ),
+            delete_rows,
+        )
+    if insert_rows:
+        db.execute(insert(task_labels), insert_rows)
+    written = len(delete_rows) + len(insert_rows)
+    task_label_write_stats.record(
+        inserted=len(insert_rows),
+        deleted=len(delete_rows),
+        avoided=full_rewrite - written,
+    )
+
+
 def update_task(
     db: Session, task_id: str, task_data: schemas.TaskUpdateApiInput
 ) -> models.Task | None:
@@ -247,16 +960,9 @@ def update_task(
     if not db_task:
         return None  # タスクが見つからない
 
-    # 2. 紐付ける新しい Label オブジェクトを取得
-    db_labels = get_labels_by_ids(db, task_data.label_ids)
-    if len(db_labels) != len(task_data.label_ids):
-        found_ids = {str(label.id) for label in db_labels}
-        missing_ids = [
-            str(id) for id in task_data.label_ids if str(id) not in found_ids
-        ]
-        raise ValueError(
-            f"Labels not found with IDs: {', '.join(missing_ids)}"
-        )
+    # 2. 紐付ける新しい Label オブジェクトを取得 (ラベルカタログで検証する)
+    catalog_labels = _get_catalog_labels(db, task_data.label_ids)
+    db_labels = _merge_labels(db, catalog_labels)
 
     # 3. タスクの各フィールドを更新
     #    Pydantic モデルのフィールドをループして更新
@@ -269,96 +975,860 @@ def update_task(
         else:
             setattr(db_task, key, value)
 
-    # 4. ラベルの関連を更新 (既存をクリアして新しいものを追加)
-    db_task.labels.clear()  # 既存の関連をクリア
-    db_task.labels.extend(db_labels)  # 新しい関連を追加
+    # ラベルのみの変更 (tasks の列が変わらない場合) でも updatedAt を更新し、
+    # 変更フィード (get_task_changes) に現れるようにする
+    response_task = None
+    if _uses_app_timestamps():
+        db_task.updatedAt = _current_timestamp()
+        # 読み込み済みの値から、コミット後に読み直さずに返せるようにする
+        # (flush で期限切れになる生成列を読み直さないよう、flush の前に複製する)
+        response_task = _copy_task(db_task, catalog_labels)
+    else:
+        db_task.updatedAt = sql_func.now()
+    # patch_task と同じ順序 (tasks の行 -> task_labels -> table_versions) で
+    # ロックを取るよう、タスクの行の UPDATE を先に発行する
+    db.flush()
+
+    # 4. ラベルの関連を更新 (追加/削除されたラベルの行のみ書き込む)
+    _sync_task_labels(
+        db,
+        {task_id: {label.id for label in db_task.labels}},
+        {task_id: [label.id for label in db_labels]},
+    )
+    # 書き込み済みのため、リレーションシップは変更履歴を残さずに置き換える
+    set_committed_value(db_task, "labels", db_labels)
 
     # 5. DB にコミットして更新を反映
-    db.add(db_task)  # セッションに変更を通知 (必須ではない場合もある)
+    table_versions.bump_version(db, TASKS_TABLE)
     db.commit()
+    invalidate_task_count_cache()
+    if response_task is not None:
+        return response_task
     db.refresh(db_task)  # 更新後の状態を再読み込み
     return db_task
 
 
-def get_tasks(
-    db: Session,
-    assignee_id: Optional[str] = None,
-    is_completed: Optional[bool] = None,
-    labels: Optional[List[str]] = None,
-    sort: str = "createdAt_desc",
-    page: int = 1,
-    limit: int = 10,
-    current_user_id: Optional[str] = None,
-) -> Tuple[List[models.Task], int]:
+# レスポンス用のタスクを組み立てるのに必要な列
+_TASK_ROW_COLUMNS = (
+    models.Task.id,
+    models.Task.name,
+    models.Task.assigneeId,
+    models.Task.dueDate,
+    models.Task.isCompleted,
+    models.Task.isRecurring,
+    models.Task.recurrenceRule,
+    models.Task.createdAt,
+    models.Task.updatedAt,
+)
+
+
+def _read_task_row(
+    db: Session, task_id: str
+) -> Tuple[Dict[str, Any], List[str]]:
+    """タスクの行とラベルIDを 1 回のクエリ (task_labels との外部結合) で読む。"""
+    task_labels = models.task_labels_table
+    rows = db.execute(
+        select(*_TASK_ROW_COLUMNS, task_labels.c.label_id)
+        .outerjoin(task_labels, task_labels.c.task_id == models.Task.id)
+        .where(models.Task.id == task_id)
+    ).all()
+    row = rows[0]._asdict()
+    del row["label_id"]
+    return row, [r.label_id for r in rows if r.label_id is not None]
+
+
+def patch_task(
+    db: Session, task_id: str, task_data: schemas.TaskPatchApiInput
+) -> models.Task | None:
     """
-    タスク一覧を取得します (フィルター/ソート/ページネーション対応)。
-    今日の定常タスクと、フィルター/ソート/ページネーションされた通常タスクを返します。
+    指定された ID の通常タスクを部分更新する (指定された項目のみ)。
+
+    tasks の更新は 1 回の UPDATE で行い、存在確認のための事前の SELECT は
+    行わない (更新行数で判定する)。task_labels は label_ids が指定された場合
+    のみ置き換える。レスポンス用のタスクは UPDATE ... RETURNING に対応した DB
+    ではその結果から、それ以外 (MySQL) では同じトランザクション内の 1 回の
+    SELECT で組み立て、ラベルはラベルカタログから補う。
 
     Args:
-        db: DBセッション
-        assignee_id: 担当者IDフィルター ('me' または UUID)
-        is_completed: 完了状態フィルター
-        labels: ラベル名フィルター (指定されたラベルをすべて含むタスク)
-        sort: ソート順
-        page: ページ番号
-        limit: 1ページあたりの件数
-        current_user_id: assigneeId='me' の場合に使う現在のユーザーID
+        db: SQLAlchemy セッションオブジェクト。
+        task_id: 更新するタスクの UUID 文字列。
+        task_data: 更新する項目 (Pydantic スキーマ、未指定の項目は変更しない)。
 
     Returns:
-        タプル: (表示するタスクのリスト, フィルター条件に合う通常タスクの総数)
+        更新後のタスク (セッションに属さない models.Task)、
+        またはタスクが見つからない場合は None。
+
+    Raises:
+        ValueError: 指定された label_id が存在しない場合に発生。
     """
-    # --- 1. 今日の定常タスクを取得 ---
-    # (実際のバックエンドでは recurrenceRule を解釈して判定)
-    # モックと同様に isRecurring=true のものを取得
-    # TODO: 担当者フィルターも定常タスクに適用するか検討
-    routine_stmt = (
-        select(models.Task)
-        .options(selectinload(models.Task.labels))
-        .where(models.Task.isRecurring == 1)
+    values = task_data.model_dump(exclude={"label_ids"}, exclude_unset=True)
+    if values.get("assigneeId") is not None:
+        values["assigneeId"] = str(values["assigneeId"])
+    values["updatedAt"] = (
+        _current_timestamp() if _uses_app_timestamps() else sql_func.now()
     )
-    todays_routines = list(db.scalars(routine_stmt).all())
 
-    # --- 2. 通常タスクのフィルター条件を構築 ---
-    filter_conditions = _build_task_filter_conditions(
-        assignee_id, is_completed, labels, current_user_id
+    labels: Optional[List[models.Label]] = None
+    if task_data.label_ids is not None:
+        labels = _get_catalog_labels(db, task_data.label_ids)
+
+    stmt = (
+        update(models.Task)
+        .where(models.Task.id == task_id, models.Task.isRecurring == 0)
+        .values(**values)
+        .execution_options(synchronize_session=False)
     )
+    row = None
+    if db.get_bind().dialect.update_returning:
+        row = db.execute(stmt.returning(*_TASK_ROW_COLUMNS)).mappings().first()
+        found = row is not None
+    else:
+        found = _rowcount(db.execute(stmt)) > 0
+    if not found:
+        db.rollback()
+        return None
+
+    if labels is not None:
+        _sync_task_labels(
+            db,
+            _get_task_label_ids(db, {task_id}),
+            {task_id: [label.id for label in labels]},
+        )
+
+    if row is None or labels is None:
+        task_row, label_ids = _read_task_row(db, task_id)
+        if labels is None:
+            labels = label_catalog.get_by_ids(db, label_ids)[0]
+    else:
+        task_row = dict(row)
+    table_versions.bump_version(db, TASKS_TABLE)
+    db.commit()
+    invalidate_task_count_cache()
+    return _build_task_from_row(task_row, labels)
 
-    # --- 3. 通常タスクの総数をカウント ---
+
+# get_tasks 用のヘルパー関数 (通常タスクの総数)
+def _count_tasks(
+    db: Session, filter_conditions: List[ColumnElement[bool]]
+) -> int:
+    """フィルター条件に一致するタスクの総数を数える。"""
     count_query = select(sql_func.count(models.Task.id)).select_from(
         models.Task
     )
     if filter_conditions:
         count_query = count_query.where(and_(*filter_conditions))
-    total_items = db.scalar(count_query) or 0
+    return db.scalar(count_query) or 0
 
-    # --- 4. 通常タスク取得クエリを構築 ---
-    regular_task_query = select(models.Task).options(
-        selectinload(models.Task.labels)  # Eager load labels
-    )
-    if filter_conditions:
-        regular_task_query = regular_task_query.where(and_(*filter_conditions))
 
-    # ソート条件を構築して適用
-    order_by_clauses = _build_task_order_by_clause(sort)
-    if order_by_clauses is not None:
-        regular_task_query = regular_task_query.order_by(*order_by_clauses)
+# get_tasks 用のヘルパー関数 (通常タスクの推定件数)
+def _estimate_task_count(
+    db: Session, filter_conditions: List[ColumnElement[bool]]
+) -> Optional[int]:
+    """
+    MySQL のオプティマイザの推定行数 (EXPLAIN) から件数を見積もる。
 
-    # ページネーションを適用
-    offset = (page - 1) * limit
-    regular_task_query = regular_task_query.offset(offset).limit(limit)
+    Returns:
+        推定件数。MySQL 以外、または推定できない場合は None。
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "mysql":
+        return None
+    stmt = select(models.Task.id)
+    if filter_conditions:
+        stmt = stmt.where(and_(*filter_conditions))
+    plan = explain_json(db, stmt)
+    try:
+        query_block = plan["query_block"]
+        table = query_block.get("table") or (
+            query_block["nested_loop"][0]["table"]
+        )
+        return int(
+            float(
+                table.get(
+                    "rows_produced_per_join", table["rows_examined_per_scan"]
+                )
+            )
+        )
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
 
-    # --- 5. 通常タスクを取得 ---
-    paginated_regular_tasks = list(db.scalars(regular_task_query).all())
 
-    # --- 6. 結果を結合して返す ---
+# get_tasks 用のヘルパー関数 (総数の取得方式の適用)
+def _resolve_task_count(
+    db: Session,
+    filter_conditions: List[ColumnElement[bool]],
+    count_strategy: str,
+    cache_key: Callable[[int], TaskFilterKey],
+) -> Tuple[int, bool]:
+    """
+    count_strategy に従って通常タスクの総数を取得する。
+
+    cache_key は tasks のバージョンからキャッシュのキーを作る関数で、
+    cached 方式の場合のみバージョンを読んで呼び出す。
+
+    Returns:
+        タプル: (総数, 正確な値かどうか)
+    """
+    if count_strategy == COUNT_CACHED:
+        key = cache_key(table_versions.get_version(db, TASKS_TABLE))
+        cached = _task_count_cache.get(key)
+        if cached is not None:
+            return cached, False
+        total = _count_tasks(db, filter_conditions)
+        _task_count_cache.set(key, total)
+        return total, True
+    if count_strategy == COUNT_ESTIMATED:
+        estimate = _estimate_task_count(db, filter_conditions)
+        if estimate is not None:
+            return estimate, False
+    return _count_tasks(db, filter_conditions), True
+
+
+def invalidate_task_count_cache() -> None:
+    """タスク総数のキャッシュを破棄する (タスクの作成/更新/削除時に呼ぶ)。"""
+    _task_count_cache.clear()
+
+
+# get_tasks 用のヘルパー関数 (ページ取得クエリの構築)
+def _build_task_page_query(
+    filter_conditions: List[ColumnElement[bool]],
+    sort: str,
+    page: int,
+    limit: int,
+    keyset: Optional[Tuple[Optional[datetime], str]],
+    relevance: Optional[ColumnElement] = None,
+) -> Select:
+    """
+    通常タスクの 1 ページ分を取得するクエリを構築する
+    (次ページの有無の判定用に limit より 1 件多く取得する)。
+
+    relevance (検索の関連度) が指定された場合、sort が関連度順なら先頭に並べる。
+    """
+    page_query = select(models.Task)
+    if filter_conditions:
+        page_query = page_query.where(and_(*filter_conditions))
+
+    # ソート条件を構築して適用
+    order_by_clauses = _build_task_order_by_clause(sort)
+    if sort == SORT_RELEVANCE and relevance is not None:
+        page_query = page_query.order_by(relevance.desc())
+    if order_by_clauses is not None:
+        page_query = page_query.order_by(*order_by_clauses)
+
+    # ページネーションを適用
+    if keyset is not None:
+        page_query = page_query.where(
+            _build_task_keyset_condition(sort, *keyset)
+        )
+    else:
+        page_query = page_query.offset((page - 1) * limit)
+    return page_query.limit(max(limit, 0) + 1)
+
+
+# get_tasks 用のヘルパー関数 (fused モードの総数の列)
+def _add_total_column(page_query: Select) -> Select:
+    """ページ取得クエリに総数の列 (COUNT(*) OVER ()) を追加する。"""
+    return page_query.add_columns(sql_func.count().over().label("total_items"))
+
+
+# get_tasks 用のヘルパー関数 (ページの取得)
+def _fetch_task_page(
+    db: Session, page_query: Select, fused: bool, with_total: bool
+) -> Tuple[List[models.Task], Optional[int]]:
+    """
+    タスクのページを取得する。
+
+    fused の場合はラベルを読み込まず (呼び出し側でまとめて読み込む)、
+    with_total も指定されていれば COUNT(*) OVER () で総数も同じクエリで取得する。
+
+    Returns:
+        タプル: (タスクのリスト, 総数 (同時に取得できなかった場合は None))
+    """
+    if not fused:
+        page_query = page_query.options(selectinload(models.Task.labels))
+        return list(db.scalars(page_query).all()), None
+
+    page_query = page_query.options(lazyload(models.Task.labels))
+    if not with_total:
+        return list(db.scalars(page_query).all()), None
+
+    rows = db.execute(_add_total_column(page_query)).all()
+    if not rows:
+        # OFFSET が総数を超えている場合は総数がわからない
+        return [], None
+    return [row[0] for row in rows], rows[0][1]
+
+
+def _load_task_labels(db: Session, tasks: List[models.Task]) -> None:
+    """
+    複数のタスクのラベルを 1 回のクエリで読み込み、各タスクに設定する。
+    """
+    if not tasks:
+        return
+    task_labels = models.task_labels_table
+    stmt = (
+        select(task_labels.c.task_id, models.Label)
+        .join(models.Label, models.Label.id == task_labels.c.label_id)
+        .where(task_labels.c.task_id.in_({task.id for task in tasks}))
+    )
+    labels_by_task: Dict[str, List[models.Label]] = {}
+    for task_id, label in db.execute(stmt):
+        labels_by_task.setdefault(task_id, []).append(label)
+    for task in tasks:
+        set_committed_value(task, "labels", labels_by_task.get(task.id, []))
+
+
+# get_tasks 用のヘルパー関数 (名前の検索の方式の決定)
+def _resolve_task_search(
+    db: Session, q: Optional[str], search_strategy: Optional[str]
+) -> Tuple[List[str], str, Optional[ColumnElement]]:
+    """
+    検索文字列を検索語に分割し、検索の方式を決める (FULLTEXT は MySQL のみ)。
+
+    Returns:
+        タプル: (検索語のリスト, 検索の方式, 関連度の式 (FULLTEXT 以外は None))
+    """
+    search_terms = task_search.parse_terms(q) if q else []
+    strategy = search_strategy or get_settings().task_search_strategy
+    if db.get_bind().dialect.name != "mysql":
+        strategy = task_search.SEARCH_LIKE
+    relevance = (
+        task_search.fulltext_match(search_terms)
+        if search_terms and strategy == task_search.SEARCH_FULLTEXT
+        else None
+    )
+    return search_terms, strategy, relevance
+
+
+def get_tasks(
+    db: Session,
+    assignee_id: Optional[str] = None,
+    is_completed: Optional[bool] = None,
+    labels: Optional[List[str]] = None,
+    sort: str = "createdAt_desc",
+    page: int = 1,
+    limit: int = 10,
+    current_user_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    routine_date: Optional[date] = None,
+    label_filter_strategy: Optional[str] = None,
+    query_mode: Optional[str] = None,
+    count_strategy: Optional[str] = None,
+    q: Optional[str] = None,
+    search_strategy: Optional[str] = None,
+    due_after: Optional[date] = None,
+    due_before: Optional[date] = None,
+) -> Tuple[List[models.Task], int, Optional[str], bool]:
+    """
+    タスク一覧を取得します (フィルター/ソート/ページネーション対応)。
+    今日の定常タスクと、フィルター/ソート/ページネーションされた通常タスクを返します。
+
+    cursor が指定された場合は OFFSET を使わずキーセット方式でページングし、
+    定常タスクは最初のページ (cursor なし) にのみ含めます。
+
+    Args:
+        db: DBセッション
+        assignee_id: 担当者IDフィルター ('me' または UUID)
+        is_completed: 完了状態フィルター
+        labels: ラベル名フィルター (指定されたラベルをすべて含むタスク)
+        sort: ソート順
+        page: ページ番号
+        limit: 1ページあたりの件数
+        current_user_id: assigneeId='me' の場合に使う現在のユーザーID
+        cursor: 前ページのレスポンスで返された nextCursor
+        routine_date: 定常タスクの判定日 (省略時はアプリのタイムゾーンでの今日)
+        label_filter_strategy: ラベルフィルターの方式 ("grouped" または
+            "exists"、省略時は設定値 LABEL_FILTER_STRATEGY)
+        query_mode: クエリの発行方式 ("fused" または "standard"、
+            省略時は設定値 TASK_LIST_QUERY_MODE)
+        count_strategy: 総数の取得方式 ("exact", "cached" または "estimated"、
+            省略時は設定値 TASK_COUNT_STRATEGY)
+        q: 名前の検索語 (空白区切り、すべての語を含むタスク。定常タスクにも適用)
+        search_strategy: 検索の方式 ("fulltext" または "like"、省略時は
+            設定値 TASK_SEARCH_STRATEGY。MySQL 以外では常に "like")
+        due_after: 期限日がこの日以降のタスクに絞り込む
+        due_before: 期限日がこの日以前のタスクに絞り込む
+
+    Returns:
+        タプル: (表示するタスクのリスト, フィルター条件に合う通常タスクの総数,
+                 次ページのカーソル (次ページがない場合は None),
+                 総数が正確な値かどうか)
+
+    Raises:
+        ValueError: cursor の形式が不正な場合、または関連度順で cursor が
+            指定された場合に発生。
+    """
+    keyset: Optional[Tuple[Optional[datetime], str]] = None
+    if cursor:
+        if sort == SORT_RELEVANCE:
+            raise ValueError(
+                "Cursor pagination is not supported for relevance"
+            )
+        keyset = _decode_task_cursor(sort, cursor)
+
+    search_terms, search, relevance = _resolve_task_search(
+        db, q, search_strategy
+    )
+
+    fused = (
+        query_mode or get_settings().task_list_query_mode
+    ) == TASK_QUERY_FUSED
+
+    # --- 1. 今日の定常タスクを取得 ---
+    # TODO: 担当者フィルターも定常タスクに適用するか検討
+    todays_routines = (
+        get_routines_for_date(
+            db, routine_date or recurrence.today(), load_labels=not fused
+        )
+        if keyset is None
+        else []
+    )
+    if search_terms:
+        todays_routines = [
+            routine
+            for routine in todays_routines
+            if task_search.matches(str(routine.name), search_terms)
+        ]
+
+    # --- 2. 通常タスクのフィルター条件を構築 ---
+    strategy = label_filter_strategy or get_settings().label_filter_strategy
+    label_id_map = (
+        get_label_id_map(db, labels)
+        if labels and strategy == LABEL_FILTER_GROUPED
+        else None
+    )
+    filter_conditions = _build_task_filter_conditions(
+        assignee_id,
+        is_completed,
+        labels,
+        current_user_id,
+        label_id_map,
+        search_terms=search_terms,
+        search_strategy=search,
+        due_after=due_after,
+        due_before=due_before,
+    )
+
+    # --- 3. 通常タスク取得クエリを構築 ---
+    regular_task_query = _build_task_page_query(
+        filter_conditions, sort, page, limit, keyset, relevance
+    )
+
+    # --- 4. 通常タスクと総数を取得 ---
+    # fused モードでは COUNT(*) OVER () で総数をページと同時に取得する。
+    # キーセット方式では WHERE にカーソル条件が入り総数が変わるため別途数える。
+    count_strategy = count_strategy or get_settings().task_count_strategy
+    paginated_regular_tasks, total_items = _fetch_task_page(
+        db,
+        regular_task_query,
+        fused=fused,
+        with_total=keyset is None and count_strategy == COUNT_EXACT,
+    )
+    is_last_page = 0 < limit and len(paginated_regular_tasks) <= limit
+    if (
+        total_items is None
+        and keyset is None
+        and is_last_page
+        and (paginated_regular_tasks or page == 1)
+    ):
+        # 最終ページを取得できた場合は総数が確定する
+        total_items = (page - 1) * limit + len(paginated_regular_tasks)
+    total_is_exact = True
+    if total_items is None:
+        total_items, total_is_exact = _resolve_task_count(
+            db,
+            filter_conditions,
+            count_strategy,
+            partial(
+                _normalize_task_filters,
+                assignee_id=assignee_id,
+                is_completed=is_completed,
+                labels=labels,
+                current_user_id=current_user_id,
+                search_terms=search_terms,
+                due_after=due_after,
+                due_before=due_before,
+            ),
+        )
+
+    next_cursor: Optional[str] = None
+    if limit <= 0:
+        paginated_regular_tasks = []
+    elif len(paginated_regular_tasks) > limit:
+        paginated_regular_tasks = paginated_regular_tasks[:limit]
+        if sort != SORT_RELEVANCE:
+            next_cursor = _encode_task_cursor(
+                sort, paginated_regular_tasks[-1]
+            )
+
+    # --- 5. 結果を結合して返す ---
     result_tasks = todays_routines + paginated_regular_tasks
-    return result_tasks, total_items
+    if fused:
+        # 定常タスクと通常タスクのラベルを 1 回のクエリでまとめて読み込む
+        _load_task_labels(db, result_tasks)
+    return result_tasks, total_items, next_cursor, total_is_exact
+
+
+# 期限日のダッシュボード (get_due_summary) の区分
+DUE_OVERDUE = "overdue"
+DUE_TODAY = "today"
+DUE_THIS_WEEK = "thisWeek"
+DUE_NONE = "noDueDate"
+DUE_BUCKETS = (DUE_OVERDUE, DUE_TODAY, DUE_THIS_WEEK, DUE_NONE)
+# thisWeek に含める日数 (明日から DUE_WEEK_DAYS - 1 日後まで)
+DUE_WEEK_DAYS = 7
+
+# 期限日の区分ごとの結果: 区分 -> (未完了タスク数, 期限日順の先頭のタスク)
+DueSummary = Dict[str, Tuple[int, List[models.Task]]]
+
+
+def get_due_summary(
+    db: Session,
+    today: date,
+    limit: int = 5,
+    assignee_id: Optional[str] = None,
+    current_user_id: Optional[str] = None,
+) -> DueSummary:
+    """
+    未完了の通常タスクを期限日で区分し、区分ごとの件数と先頭 limit 件を取得する。
+
+    区分は overdue (今日より前)、today、thisWeek (明日から 6 日後まで)、
+    noDueDate (期限日なし)。1 回のクエリで、区分ごとの件数を
+    COUNT(*) OVER (PARTITION BY 区分)、先頭 limit 件を ROW_NUMBER() で取得する。
+    対象は (isRecurring, isCompleted, dueDate) のインデックス
+    (ix_tasks_list_completed_due) の「期限日なし〜今週末」の範囲のみを読む。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        today: 区分の基準日 (アプリのタイムゾーンでの今日)。
+        limit: 区分ごとに返すタスクの最大件数 (1 以上)。
+        assignee_id, current_user_id: get_tasks と同じ担当者フィルター。
+
+    Returns:
+        区分 -> (未完了タスク数, 期限日順 (同日は作成順) のタスクのリスト)。
+        タスクはセッションに属さない models.Task。
+
+    Raises:
+        ValueError: limit が 1 未満の場合に発生。
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    task = models.Task
+    today_start = _start_of_day(today)
+    tomorrow_start = _start_of_day(today + timedelta(days=1))
+    week_end = _start_of_day(today + timedelta(days=DUE_WEEK_DAYS))
+    bucket = case(
+        (task.dueDate.is_(None), DUE_NONE),
+        (task.dueDate < today_start, DUE_OVERDUE),
+        (task.dueDate < tomorrow_start, DUE_TODAY),
+        else_=DUE_THIS_WEEK,
+    )
+    filter_conditions = _build_task_filter_conditions(
+        assignee_id, False, None, current_user_id
+    )
+    ranked = (
+        select(
+            *_TASK_ROW_COLUMNS,
+            bucket.label("bucket"),
+            sql_func.row_number()
+            .over(
+                partition_by=bucket,
+                order_by=(task.dueDate, task.createdAt, task.id),
+            )
+            .label("position"),
+            sql_func.count().over(partition_by=bucket).label("bucket_total"),
+        )
+        .where(
+            *filter_conditions,
+            or_(task.dueDate.is_(None), task.dueDate < week_end),
+        )
+        .subquery()
+    )
+    stmt = (
+        select(ranked)
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.bucket, ranked.c.position)
+    )
+    rows = db.execute(stmt).mappings().all()
+
+    label_ids = _get_task_label_ids(db, {row["id"] for row in rows})
+    summary: DueSummary = {name: (0, []) for name in DUE_BUCKETS}
+    for row in rows:
+        task_row = {
+            column.key: row[column.key] for column in _TASK_ROW_COLUMNS
+        }
+        labels = label_catalog.get_by_ids(
+            db, sorted(label_ids.get(row["id"], ()))
+        )[0]
+        tasks = summary[row["bucket"]][1]
+        tasks.append(_build_task_from_row(task_row, labels))
+        summary[row["bucket"]] = (int(row["bucket_total"]), tasks)
+    return summary
+
+
+# --- Task Change Feed (差分同期) ---
+# 変更フィードの結果: (変更されたタスク, 削除の記録, 次回のトークン, 続きがあるか)
+TaskChanges = Tuple[
+    List[models.Task], List[models.TaskDeletion], Optional[str], bool
+]
+
+
+def _encode_change_token(changed_at: datetime, item_id: str) -> str:
+    """変更日時と ID (タイブレーク) を不透明なトークン文字列にエンコードする。"""
+    payload = {"t": changed_at.isoformat(), "id": str(item_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_change_token(token: str) -> Tuple[datetime, str]:
+    """
+    トークン文字列を (変更日時, ID) にデコードする。
+
+    Raises:
+        ValueError: トークンの形式が不正な場合。
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload: Any = json.loads(base64.urlsafe_b64decode(padded))
+        item_id = str(UUID(str(payload["id"])))
+        changed_at = datetime.fromisoformat(payload["t"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid change token")
+    return changed_at, item_id
+
+
+def _build_change_conditions(
+    changed_at_column: ColumnElement,
+    id_column: ColumnElement,
+    since: Optional[Tuple[datetime, str]],
+    until: datetime,
+) -> List[ColumnElement[bool]]:
+    """(変更日時, ID) がトークンの位置より後ろで、until 以前の行を絞り込む条件。"""
+    conditions = [changed_at_column <= until]
+    if since is not None:
+        changed_at, item_id = since
+        conditions.append(
+            or_(
+                changed_at_column > changed_at,
+                and_(changed_at_column == changed_at, id_column > item_id),
+            )
+        )
+    return conditions
+
+
+def get_task_changes(
+    db: Session,
+    since: Optional[str] = None,
+    limit: int = 100,
+    settle_seconds: int = 1,
+) -> TaskChanges:
+    """
+    トークンの位置より後に作成/更新された通常タスクと、削除されたタスクを取得する。
+
+    変更は (変更日時, ID) の昇順に並べ、タスクは updatedAt、削除は
+    task_deletions の deletedAt を変更日時とする。タスクと削除の記録を
+    それぞれのインデックス (ix_tasks_changes / ix_task_deletions_deletedAt)
+    の順に limit + 1 件まで読み、マージして先頭 limit 件を返す。
+    書き込み中のトランザクションの変更を読み飛ばさないよう、変更日時が直近
+    settle_seconds 秒以内の行はまだ返さない (次回以降の取得で返す)。
+    時間のかかる一括の書き込みは、コミットの直前に変更日時を記録する
+    (_stamp_task_updates / _record_task_deletions) ため、この猶予は
+    書き込み全体の長さによらない。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        since: 前回のレスポンスのトークン (省略時は最初から)。
+        limit: 1 回で返す変更 (タスクと削除の合計) の最大件数 (1 以上)。
+        settle_seconds: 返さずにおく直近の秒数 (0 以上)。
+
+    Returns:
+        タプル: (変更されたタスク (セッションに属さない models.Task),
+        削除の記録, 次回の取得に使うトークン (変更がない場合は since),
+        続きがあるか)
+
+    Raises:
+        ValueError: since の形式が不正、または limit / settle_seconds が
+            範囲外の場合に発生。
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    if settle_seconds < 0:
+        raise ValueError("settle_seconds must not be negative")
+    position = _decode_change_token(since) if since is not None else None
+    until = _write_timestamp(db) - timedelta(seconds=settle_seconds)
+
+    task = models.Task
+    rows = (
+        db.execute(
+            select(*_TASK_ROW_COLUMNS)
+            .where(
+                task.isRecurring == 0,
+                *_build_change_conditions(
+                    task.updatedAt, task.id, position, until
+                ),
+            )
+            .order_by(task.updatedAt, task.id)
+            .limit(limit + 1)
+        )
+        .mappings()
+        .all()
+    )
+    deletion = models.TaskDeletion
+    deletions = db.scalars(
+        select(deletion)
+        .where(
+            *_build_change_conditions(
+                deletion.deletedAt, deletion.task_id, position, until
+            )
+        )
+        .order_by(deletion.deletedAt, deletion.task_id)
+        .limit(limit + 1)
+    ).all()
+
+    # 2 つの列を (変更日時, ID) の順にマージする
+    changes = sorted(
+        [(row["updatedAt"], row["id"], row) for row in rows]
+        + [(d.deletedAt, d.task_id, d) for d in deletions],
+        key=lambda change: (change[0], change[1]),
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if not changes:
+        return [], [], since, False
+
+    changed_rows = [c[2] for c in changes if not isinstance(c[2], deletion)]
+    label_ids = _get_task_label_ids(db, {row["id"] for row in changed_rows})
+    tasks = [
+        _build_task_from_row(
+            dict(row),
+            label_catalog.get_by_ids(db, sorted(label_ids.get(row["id"], ())))[
+                0
+            ],
+        )
+        for row in changed_rows
+    ]
+    deleted = [c[2] for c in changes if isinstance(c[2], deletion)]
+    last_changed_at, last_id, _ = changes[-1]
+    return (
+        tasks,
+        deleted,
+        _encode_change_token(last_changed_at, last_id),
+        has_more,
+    )
+
+
+def iter_task_export_batches(
+    db: Session,
+    assignee_id: Optional[str] = None,
+    is_completed: Optional[bool] = None,
+    labels: Optional[List[str]] = None,
+    current_user_id: Optional[str] = None,
+    batch_size: int = 1000,
+    q: Optional[str] = None,
+    due_after: Optional[date] = None,
+    due_before: Optional[date] = None,
+) -> Iterator[List[models.Task]]:
+    """
+    エクスポート用に、条件に一致する通常タスクを batch_size 件ずつ返す。
+
+    主キー (id) の昇順にキーセット方式で読み進めるため、OFFSET の
+    スキャンや件数の取得は行わず、保持する行はテーブルの大きさによらず
+    1 バッチ分のみになる。ラベルはバッチごとに task_labels を 1 回読み、
+    ラベルカタログから補う。
+    全バッチを 1 つのトランザクションで読むため、MySQL (REPEATABLE READ) では
+    開始時点の一貫したスナップショットが出力される。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        assignee_id, is_completed, labels, current_user_id:
+            get_tasks と同じフィルター条件。
+        batch_size: 1 回のクエリで読むタスクの件数。
+        q, due_after, due_before: get_tasks と同じ検索語/期限日の範囲
+            (出力は ID 順のため、検索語は関連度順に並べず絞り込みのみに使う)。
+
+    Returns:
+        タスク (セッションに属さない models.Task) のリストのイテレーター。
+
+    Raises:
+        ValueError: batch_size が 1 未満の場合に発生。
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    label_id_map = get_label_id_map(db, labels) if labels else None
+    search_terms, search, _ = _resolve_task_search(db, q, None)
+    filter_conditions = _build_task_filter_conditions(
+        assignee_id,
+        is_completed,
+        labels,
+        current_user_id,
+        label_id_map,
+        search_terms=search_terms,
+        search_strategy=search,
+        due_after=due_after,
+        due_before=due_before,
+    )
+    # 主キー順 (クラスタインデックスの順) に読む
+    # ("id_asc" は _build_task_order_by_clause の既定の並び順になる)
+    sort = "id_asc"
+    base_query = (
+        select(*_TASK_ROW_COLUMNS).where(*filter_conditions).limit(batch_size)
+    )
+    order_by_clauses = _build_task_order_by_clause(sort)
+    if order_by_clauses is not None:
+        base_query = base_query.order_by(*order_by_clauses)
+    last_id: Optional[str] = None
+    while True:
+        query = base_query
+        if last_id is not None:
+            query = query.where(
+                _build_task_keyset_condition(sort, None, last_id)
+            )
+        rows = db.execute(query).mappings().all()
+        if not rows:
+            return
+        label_ids = _get_task_label_ids(db, {row["id"] for row in rows})
+        yield [
+            _build_task_from_row(
+                dict(row),
+                label_catalog.get_by_ids(
+                    db, sorted(label_ids.get(row["id"], ()))
+                )[0],
+            )
+            for row in rows
+        ]
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+def _record_task_deletions(db: Session, task_ids: List[str]) -> None:
+    """
+    削除したタスクを task_deletions に記録する (コミットは呼び出し側で行う)。
+
+    deletedAt がコミットの順に並ぶよう、bump_version の後 (コミットの直前) に
+    呼ぶ (_stamp_task_updates を参照)。同じタスクを並行して削除した場合に
+    備え、記録済みの行は無視する。
+    """
+    # database の場合は deletedAt を DB の NOW() (既定値) に任せる
+    values = (
+        {"deletedAt": _current_timestamp()} if _uses_app_timestamps() else {}
+    )
+    db.execute(
+        insert(models.TaskDeletion)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite"),
+        [{"task_id": task_id, **values} for task_id in task_ids],
+    )
 
 
 def delete_task(db: Session, task_id: str) -> bool:
     """
     指定された ID のタスクを削除する。
 
+    タスクを読み込まずに 1 回の DELETE で削除し、task_labels と
+    routine_occurrences の行は外部キーの ON DELETE CASCADE に任せる。
+    変更フィード用に、同じトランザクションで task_deletions に記録する。
+
     Args:
         db: SQLAlchemy セッションオブジェクト。
         task_id: 削除するタスクの UUID 文字列。
@@ -366,18 +1836,546 @@ def delete_task(db: Session, task_id: str) -> bool:
     Returns:
         削除が成功した場合は True、タスクが見つからなかった場合は False。
     """
-    task_to_delete = db.scalar(
-        select(models.Task).where(
-            models.Task.id == task_id, models.Task.isRecurring == 0
+    result = db.execute(
+        delete(models.Task)
+        .where(models.Task.id == task_id, models.Task.isRecurring == 0)
+        .execution_options(synchronize_session=False)
+    )
+    if _rowcount(result) == 0:
+        db.rollback()
+        return False
+    table_versions.bump_version(db, TASKS_TABLE)
+    _record_task_deletions(db, [task_id])
+    db.commit()
+    invalidate_task_count_cache()
+    return True
+
+
+def delete_tasks_by_filter(
+    db: Session,
+    is_completed: Optional[bool] = None,
+    updated_before: Optional[datetime] = None,
+    assignee_id: Optional[str] = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    条件に一致する通常タスクをまとめて削除する (古い完了済みタスクの掃除用)。
+
+    ロックの保持時間と undo ログを抑えるため、batch_size 件ずつ
+    (ID の取得 -> DELETE -> コミット) を繰り返す。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        is_completed: 完了状態で絞り込む場合に指定。
+        updated_before: この日時より前に更新されたタスクに絞り込む場合に指定。
+        assignee_id: 担当者の UUID 文字列で絞り込む場合に指定。
+        batch_size: 1 回の DELETE で削除する最大件数。
+
+    Returns:
+        削除したタスクの件数。
+
+    Raises:
+        ValueError: 条件が 1 つも指定されていない場合 (全件削除の防止)、
+            または batch_size が 1 未満の場合に発生。
+    """
+    conditions: List[ColumnElement[bool]] = []
+    if is_completed is not None:
+        conditions.append(models.Task.isCompleted == is_completed)
+    if updated_before is not None:
+        conditions.append(models.Task.updatedAt < updated_before)
+    if assignee_id is not None:
+        conditions.append(models.Task.assigneeId == assignee_id)
+    if not conditions:
+        raise ValueError("At least one filter is required to delete tasks")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    conditions.append(models.Task.isRecurring == 0)
+
+    deleted = 0
+    while True:
+        task_ids = db.scalars(
+            select(models.Task.id).where(*conditions).limit(batch_size)
+        ).all()
+        if not task_ids:
+            break
+        deleted += _rowcount(
+            db.execute(
+                delete(models.Task)
+                .where(models.Task.id.in_(task_ids))
+                .execution_options(synchronize_session=False)
+            )
+        )
+        table_versions.bump_version(db, TASKS_TABLE)
+        _record_task_deletions(db, list(task_ids))
+        db.commit()
+        if len(task_ids) < batch_size:
+            break
+    if deleted:
+        invalidate_task_count_cache()
+    return deleted
+
+
+# --- Task Batch CRUD ---
+# 一括作成/更新の各項目の結果: (タスク, エラーメッセージ) のどちらか一方が入る
+TaskBatchOutcome = Tuple[Optional[models.Task], Optional[str]]
+
+
+def _build_task_from_row(
+    row: Dict[str, Any], labels: List[models.Label]
+) -> models.Task:
+    """書き込んだ (または読み取った) 行から、レスポンス用の Task を組み立てる。"""
+    task = models.Task(**row)
+    # Label 側の tasks に反映されないよう、イベントを発生させずに設定する
+    set_committed_value(task, "labels", labels)
+    return task
+
+
+def _copy_task(
+    db_task: models.Task, labels: List[models.Label]
+) -> models.Task:
+    """
+    セッション内のタスクの (読み込み済み/設定済みの) 値から、レスポンス用の
+    Task を組み立てる (コミット後の読み直しを避けるため)。
+    """
+    row = {
+        column.key: getattr(db_task, column.key)
+        for column in _TASK_ROW_COLUMNS
+    }
+    return _build_task_from_row(row, labels)
+
+
+def _get_batch_label_map(
+    db: Session,
+    items: (
+        List[schemas.TaskCreateApiInput] | List[schemas.TaskBatchUpdateItem]
+    ),
+) -> Dict[str, models.Label]:
+    """
+    全項目のラベルIDをラベルカタログでまとめて検証し、ID -> Label を返す。
+
+    返す Label はカタログの (セッションに属さない) オブジェクトのため、
+    レスポンスの組み立てにのみ使い、セッションには追加しないこと。
+    """
+    label_ids = {str(i) for item in items for i in item.label_ids}
+    labels, _ = label_catalog.get_by_ids(db, label_ids)
+    return {label.id: label for label in labels}
+
+
+def create_tasks_batch(
+    db: Session, items: List[schemas.TaskCreateApiInput]
+) -> List[TaskBatchOutcome]:
+    """
+    複数のタスクを 1 トランザクションで作成する。
+
+    ラベルの検証はラベルカタログでまとめて行い、tasks と task_labels は
+    それぞれ 1 回の executemany で INSERT する。存在しないラベルを指定した
+    項目のみ失敗とし、その他の項目は作成する。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        items: 作成するタスクの情報のリスト。
+
+    Returns:
+        items と同じ順序の (作成したタスク, エラーメッセージ) のリスト。
+    """
+    label_map = _get_batch_label_map(db, items)
+    now = _write_timestamp(db)
+    outcomes: List[TaskBatchOutcome] = []
+    task_rows: List[Dict[str, Any]] = []
+    links: List[Tuple[str, List[models.Label]]] = []
+    for item in items:
+        # 同じラベルが重複して指定されても task_labels は 1 行にする
+        label_ids = list(dict.fromkeys(str(i) for i in item.label_ids))
+        missing_ids = [i for i in label_ids if i not in label_map]
+        if missing_ids:
+            outcomes.append((None, _missing_labels_error(missing_ids)))
+            continue
+        row = item.model_dump(exclude={"label_ids"})
+        if row.get("assigneeId") is not None:
+            row["assigneeId"] = str(row["assigneeId"])
+        row.update(
+            id=new_id(),
+            isCompleted=False,
+            isRecurring=False,
+            recurrenceRule=None,
+            createdAt=now,
+            updatedAt=now,
+        )
+        labels = [label_map[i] for i in label_ids]
+        task_rows.append(row)
+        links.append((row["id"], labels))
+        outcomes.append((_build_task_from_row(row, labels), None))
+
+    if task_rows:
+        db.execute(insert(models.Task), task_rows)
+        _insert_task_labels(db, links)
+        table_versions.bump_version(db, TASKS_TABLE)
+        stamp = _stamp_task_updates(db, [row["id"] for row in task_rows])
+        db.commit()
+        invalidate_task_count_cache()
+        for task, _ in outcomes:
+            if task is not None:
+                task.updatedAt = stamp
+    return outcomes
+
+
+def update_tasks_batch(
+    db: Session, items: List[schemas.TaskBatchUpdateItem]
+) -> List[TaskBatchOutcome]:
+    """
+    複数の通常タスクを 1 トランザクションで更新する (各項目は PUT と同じ全量更新)。
+
+    対象タスクの存在確認は 1 回の SELECT で行い、tasks の UPDATE と
+    task_labels は差分のみを DELETE / INSERT (それぞれ 1 回の executemany) する。
+    存在しないタスクや存在しないラベルを指定した項目のみ失敗とする。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        items: 更新するタスクの ID と更新後の情報のリスト。
+
+    Returns:
+        items と同じ順序の (更新したタスク, エラーメッセージ) のリスト。
+    """
+    task_ids = {str(item.id) for item in items}
+    created_at_by_id = {
+        task_id: created_at
+        for task_id, created_at in db.execute(
+            select(models.Task.id, models.Task.createdAt).where(
+                models.Task.id.in_(task_ids), models.Task.isRecurring == 0
+            )
+        )
+    }
+    label_map = _get_batch_label_map(db, items)
+    now = _write_timestamp(db)
+    outcomes: List[TaskBatchOutcome] = []
+    rows_by_id: Dict[str, Dict[str, Any]] = {}
+    links_by_id: Dict[str, List[models.Label]] = {}
+    for item in items:
+        task_id = str(item.id)
+        # 同じラベルが重複して指定されても task_labels は 1 行にする
+        label_ids = list(dict.fromkeys(str(i) for i in item.label_ids))
+        missing_ids = [i for i in label_ids if i not in label_map]
+        if task_id not in created_at_by_id:
+            outcomes.append((None, f"Task not found with id: {task_id}"))
+            continue
+        if missing_ids:
+            outcomes.append((None, _missing_labels_error(missing_ids)))
+            continue
+        row = item.model_dump(exclude={"id", "label_ids"})
+        if row.get("assigneeId") is not None:
+            row["assigneeId"] = str(row["assigneeId"])
+        row.update(id=task_id, updatedAt=now)
+        labels = [label_map[i] for i in label_ids]
+        # 同じ ID が複数回指定された場合は後の項目で上書きする
+        rows_by_id[task_id] = row
+        links_by_id[task_id] = labels
+        outcomes.append(
+            (
+                _build_task_from_row(
+                    dict(
+                        row,
+                        isRecurring=False,
+                        recurrenceRule=None,
+                        createdAt=created_at_by_id[task_id],
+                    ),
+                    labels,
+                ),
+                None,
+            )
+        )
+
+    if rows_by_id:
+        # 主キーを含む辞書のリストによる ORM の一括 UPDATE (executemany)
+        db.execute(update(models.Task), list(rows_by_id.values()))
+        _sync_task_labels(
+            db,
+            _get_task_label_ids(db, set(rows_by_id)),
+            {
+                task_id: [label.id for label in labels]
+                for task_id, labels in links_by_id.items()
+            },
+        )
+        table_versions.bump_version(db, TASKS_TABLE)
+        stamp = _stamp_task_updates(db, list(rows_by_id))
+        db.commit()
+        invalidate_task_count_cache()
+        for task, _ in outcomes:
+            if task is not None:
+                task.updatedAt = stamp
+    return outcomes
+
+
+def delete_tasks_batch(db: Session, task_ids: List[str]) -> List[bool]:
+    """
+    複数の通常タスクを 1 トランザクションで削除する。
+
+    task_labels と routine_occurrences の行は外部キーの ON DELETE CASCADE で
+    削除される。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        task_ids: 削除するタスクの UUID 文字列のリスト。
+
+    Returns:
+        task_ids と同じ順序の、削除できたかどうかのリスト
+        (存在しないタスクや定常タスクは False)。
+    """
+    existing_ids = set(
+        db.scalars(
+            select(models.Task.id).where(
+                models.Task.id.in_(set(task_ids)), models.Task.isRecurring == 0
+            )
         )
     )
+    if existing_ids:
+        db.execute(
+            delete(models.Task)
+            .where(models.Task.id.in_(existing_ids))
+            .execution_options(synchronize_session=False)
+        )
+        table_versions.bump_version(db, TASKS_TABLE)
+        _record_task_deletions(db, sorted(existing_ids))
+        db.commit()
+        invalidate_task_count_cache()
+    return [task_id in existing_ids for task_id in task_ids]
+
 
-    if task_to_delete:
-        db.delete(task_to_delete)
+def import_tasks_chunk(
+    db: Session,
+    rows: List[schemas.TaskImportRow],
+    label_id_map: Dict[str, str],
+) -> List[Optional[str]]:
+    """
+    インポートする行のまとまり (チャンク) を 1 トランザクションで作成する。
+
+    tasks と task_labels はそれぞれ 1 回の executemany で INSERT する。
+    ラベルは ensure_labels で作成済みであることを前提とし、label_id_map に
+    ないラベル名を指定した行のみ失敗とする。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        rows: 作成するタスクの情報のリスト。
+        label_id_map: casefold したラベル名 -> ID 文字列の辞書
+            (ラベル名は大文字小文字を区別しない)。
+
+    Returns:
+        rows と同じ順序の、エラーメッセージ (作成できた行は None) のリスト。
+    """
+    now = _write_timestamp(db)
+    errors: List[Optional[str]] = []
+    task_rows: List[Dict[str, Any]] = []
+    link_rows: List[Dict[str, str]] = []
+    for row in rows:
+        names = [label.name for label in row.labels]
+        missing_names = [
+            name for name in names if name.casefold() not in label_id_map
+        ]
+        if missing_names:
+            errors.append(f"Labels not found: {', '.join(missing_names)}")
+            continue
+        task_row = row.model_dump(exclude={"labels"})
+        if task_row.get("assigneeId") is not None:
+            task_row["assigneeId"] = str(task_row["assigneeId"])
+        task_row.update(
+            id=new_id(),
+            isRecurring=False,
+            recurrenceRule=None,
+            createdAt=now,
+            updatedAt=now,
+        )
+        task_rows.append(task_row)
+        # 同じラベルが (大文字小文字違いなどで) 重複して指定されても 1 行にする
+        for label_id in dict.fromkeys(
+            label_id_map[name.casefold()] for name in names
+        ):
+            link_rows.append({"task_id": task_row["id"], "label_id": label_id})
+        errors.append(None)
+
+    if task_rows:
+        db.execute(insert(models.Task), task_rows)
+        db.execute(insert(models.task_labels_table), link_rows)
+        table_versions.bump_version(db, TASKS_TABLE)
+        _stamp_task_updates(db, [row["id"] for row in task_rows])
         db.commit()
-        return True
-    else:
-        return False
+        invalidate_task_count_cache()
+    return errors
+
+
+# --- Routine Occurrence CRUD ---
+def generate_routine_occurrences(
+    db: Session, start: date, days: int
+) -> Tuple[int, int]:
+    """
+    start から days 日分の定常タスクの発生記録 (routine_occurrences) を生成する。
+
+    recurrenceRule の判定は期間全体で定常タスクの一覧を一度だけ読み込んで行い、
+    不足している行のみを一括 INSERT する (冪等)。ルール変更などで発生しなくなった
+    未完了の行は削除する (完了済みの行は履歴として残す)。
+    複数のワーカーで同時に実行しても、他のワーカーが先に追加した行は
+    INSERT IGNORE で無視し、その間に完了にされた行は削除しない。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        start: 生成を開始する日付。
+        days: 生成する日数。
+
+    Returns:
+        タプル: (追加した行数, 削除した行数)
+        (他のワーカーが追加/削除した行は含まない)
+    """
+    if days <= 0:
+        return 0, 0
+    end = start + timedelta(days=days)
+    rule_stmt = select(
+        models.Task.id, models.Task.recurrenceRule, models.Task.createdAt
+    ).where(models.Task.isRecurring == 1)
+    routine_rows = list(db.execute(rule_stmt).tuples())
+
+    desired: Set[Tuple[str, date]] = set()
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        for task_id in recurrence.routines_occurring_on(routine_rows, day):
+            desired.add((task_id, day))
+
+    occurrence = models.RoutineOccurrence
+    existing_stmt = select(
+        occurrence.task_id, occurrence.date, occurrence.isCompleted
+    ).where(occurrence.date >= start, occurrence.date < end)
+    existing = {
+        (task_id, day): is_completed
+        for task_id, day, is_completed in db.execute(existing_stmt)
+    }
+
+    new_rows = [
+        {"task_id": task_id, "date": day, "isCompleted": False}
+        for task_id, day in sorted(desired - existing.keys())
+    ]
+    stale_keys = [
+        key
+        for key, is_completed in existing.items()
+        if key not in desired and not is_completed
+    ]
+    inserted = 0
+    for i in range(0, len(new_rows), OCCURRENCE_INSERT_CHUNK_SIZE):
+        # 行数を得るため、ORM の一括 INSERT ではなくテーブルに対して実行する
+        inserted += _rowcount(
+            db.execute(
+                insert(occurrence.__table__)
+                .prefix_with("IGNORE", dialect="mysql")
+                .prefix_with("OR IGNORE", dialect="sqlite"),
+                new_rows[i : i + OCCURRENCE_INSERT_CHUNK_SIZE],
+            )
+        )
+    deleted = 0
+    if stale_keys:
+        deleted = _rowcount(
+            db.execute(
+                delete(occurrence).where(
+                    tuple_(occurrence.task_id, occurrence.date).in_(
+                        stale_keys
+                    ),
+                    occurrence.isCompleted == false(),
+                )
+            )
+        )
+    if inserted or deleted:
+        table_versions.bump_version(db, TASKS_TABLE)
+    db.commit()
+    return inserted, deleted
+
+
+def get_routines_for_date(
+    db: Session, day: date, load_labels: bool = True
+) -> List[models.Task]:
+    """
+    指定日に発生する定常タスクを、関連ラベルも含めて取得する。
+
+    routine_occurrences を日付インデックスで検索し、各タスクの isCompleted には
+    その日の発生記録の完了状態を反映する (タスク定義は変更しない)。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        day: 対象日。
+        load_labels: False の場合はラベルを読み込まない (呼び出し側で読み込む)。
+
+    Returns:
+        models.Task オブジェクトのリスト (作成日時順)。
+    """
+    stmt = (
+        select(models.Task, models.RoutineOccurrence.isCompleted)
+        .join(
+            models.RoutineOccurrence,
+            models.RoutineOccurrence.task_id == models.Task.id,
+        )
+        .options(
+            selectinload(models.Task.labels)
+            if load_labels
+            else lazyload(models.Task.labels)
+        )
+        .where(
+            models.RoutineOccurrence.date == day,
+            models.Task.isRecurring == 1,
+        )
+        .order_by(models.Task.createdAt.asc(), models.Task.id.asc())
+    )
+    routines = []
+    for task, is_completed in db.execute(stmt).all():
+        # 変更として扱われない (UPDATE されない) ように値を設定する
+        set_committed_value(task, "isCompleted", is_completed)
+        routines.append(task)
+    return routines
+
+
+def get_routine_occurrences(
+    db: Session, start: date, end: date
+) -> List[models.RoutineOccurrence]:
+    """
+    期間内 (start 以上 end 以下) の定常タスクの発生記録を取得する。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        start: 期間の開始日。
+        end: 期間の終了日 (この日を含む)。
+
+    Returns:
+        models.RoutineOccurrence オブジェクトのリスト (日付順)。
+    """
+    occurrence = models.RoutineOccurrence
+    stmt = (
+        select(occurrence)
+        .where(occurrence.date >= start, occurrence.date <= end)
+        .order_by(occurrence.date.asc(), occurrence.task_id.asc())
+    )
+    return list(db.scalars(stmt).all())
+
+
+def update_routine_occurrence(
+    db: Session, task_id: str, day: date, is_completed: bool
+) -> models.RoutineOccurrence | None:
+    """
+    定常タスクの指定日の発生記録の完了状態を更新する。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        task_id: 定常タスクの UUID 文字列。
+        day: 発生日。
+        is_completed: 更新後の完了状態。
+
+    Returns:
+        更新された models.RoutineOccurrence オブジェクト、
+        または発生記録が見つからない場合は None。
+    """
+    db_occurrence = db.get(models.RoutineOccurrence, (task_id, day))
+    if db_occurrence is None:
+        return None
+    db_occurrence.isCompleted = is_completed
+    db_occurrence.completedAt = (
+        datetime.now(timezone.utc) if is_completed else None
+    )
+    table_versions.bump_version(db, TASKS_TABLE)
+    db.commit()
+    db.refresh(db_occurrence)
+    return db_occurrence
 
 
 # --- User CRUD (後で実装) ---
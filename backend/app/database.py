@@ -1,27 +1,181 @@
-import os
-from collections.abc import Generator
+import threading
+import time
+from collections.abc import AsyncGenerator, Callable, Generator
+from contextlib import AbstractContextManager
+from typing import Any, Dict, Self, TypeVar
 
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    Pool,
+    QueuePool,
+)
 
-# .env ファイルを読み込む
-load_dotenv()
+from config import Settings, get_settings
 
-# --- 環境変数から直接読み込む場合 ---
-DATABASE_URL = os.getenv("DATABASE_URL")
-if DATABASE_URL is None:
-    raise ValueError("DATABASE_URL environment variable is not set")
+T = TypeVar("T")
 
-# SQLAlchemy エンジンを作成
-engine = create_engine(DATABASE_URL, echo=True)  # echo=True でSQLログ出力
+# 環境変数 (.env ファイル) から設定を読み込む
+settings = get_settings()
+DATABASE_URL = settings.database_url
+USE_ASYNC_DB = settings.use_async_db
+
+
+# --- コネクションプールの計測 ---
+class PoolWaitStats:
+    """コネクションのチェックアウト待ち時間を集計する (スレッドセーフ)。"""
+
+    def __init__(self: Self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self: Self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self: Self) -> Dict[str, float]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avgWaitMs": (
+                    self.total_wait / attempts * 1000 if attempts else 0.0
+                ),
+                "maxWaitMs": self.max_wait * 1000,
+            }
+
+
+class _WaitTimingMixin:
+    """QueuePool のチェックアウトにかかった時間を PoolWaitStats に記録する。"""
+
+    def __init__(self: Self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self: Self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            conn: ConnectionPoolEntry = super()._do_get()  # type: ignore[misc]
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return conn
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_options(settings: Settings) -> Dict[str, Any]:
+    return {
+        "echo": settings.db_echo,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _to_async_url(url: str) -> str:
+    """同期ドライバの URL を非同期ドライバ (aiomysql) の URL に変換する。"""
+    sync_url = make_url(url)
+    if sync_url.get_backend_name() != "mysql":
+        raise ValueError(
+            "ASYNC_DATABASE_URL must be set for non-MySQL databases"
+        )
+    return sync_url.set(drivername="mysql+aiomysql").render_as_string(
+        hide_password=False
+    )
+
+
+def create_db_engine(settings: Settings) -> Engine:
+    """設定に基づいて同期エンジンを作成する。"""
+    return create_engine(
+        settings.database_url,
+        poolclass=InstrumentedQueuePool,
+        **_pool_options(settings),
+    )
+
+
+def create_async_db_engine(settings: Settings) -> AsyncEngine:
+    """設定に基づいて非同期エンジン (aiomysql) を作成する。"""
+    url = settings.async_database_url or _to_async_url(settings.database_url)
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        **_pool_options(settings),
+    )
+
+
+def create_async_session_factory(
+    engine: AsyncEngine,
+) -> async_sessionmaker[AsyncSession]:
+    """非同期エンジンに対するセッションファクトリを作成する。"""
+    # commit 後に属性が失効すると、レスポンス変換時に I/O が発生してしまうため無効化
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+def get_pool_status(pool: Pool) -> Dict[str, Any]:
+    """コネクションプールの現在の状態を返す。"""
+    status: Dict[str, Any] = {"poolClass": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checkedIn=pool.checkedin(),
+            checkedOut=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            maxOverflow=pool._max_overflow,
+        )
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(wait_stats.snapshot())
+    return status
+
+
+# SQLAlchemy エンジンを作成 (Alembic やテストは常に同期エンジンを使う)
+engine = create_db_engine(settings)
 
 # セッションファクトリ
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 非同期エンジンとセッションファクトリ (USE_ASYNC_DB が有効な場合のみ作成)
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+if USE_ASYNC_DB:
+    async_engine = create_async_db_engine(settings)
+    AsyncSessionLocal = create_async_session_factory(async_engine)
+
 # モデルのベースクラス
 Base = declarative_base()
 
+# ルーターが受け取るセッションの型 (同期/非同期のどちらか)
+DbSession = Session | AsyncSession
+
 
 # DBセッション取得用の依存性関数
 def get_db() -> Generator[Session, None, None]:
@@ -30,3 +184,65 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+# 非同期DBセッション取得用の依存性関数
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database is disabled (set USE_ASYNC_DB)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# ルーターが使う依存性関数 (設定に応じて同期/非同期を切り替える)
+get_session = get_async_db if USE_ASYNC_DB else get_db
+
+
+# ストリーミングレスポンス用の依存性関数
+# (yield を使う依存性の終了処理はレスポンスの送信前に実行されるため、
+#  ストリーミング中に DB を読む処理は、このファクトリで自分でセッションを開閉する)
+SessionFactory = Callable[[], AbstractContextManager[Session]]
+
+
+def get_session_factory() -> SessionFactory:
+    return SessionLocal
+
+
+async def run_db(
+    db: DbSession,
+    fn: Callable[..., T],
+    *args: Any,
+    **kwargs: Any,
+) -> T:
+    """
+    crud 関数をイベントループをブロックせずに実行する。
+
+    AsyncSession の場合は run_sync で実行する (I/O は非同期ドライバ経由で行われ、
+    crud 関数の同期コードがそのまま非同期版として動作する)。
+    同期 Session の場合はスレッドプールで実行する。
+
+    Args:
+        db: 同期または非同期の DB セッション。
+        fn: 第1引数に同期 Session を受け取る crud 関数。
+        *args, **kwargs: fn に渡す残りの引数。
+
+    Returns:
+        fn の戻り値。
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def get_engine_pool_status() -> Dict[str, Any]:
+    """API が使うエンジンのコネクションプール状態を返す。"""
+    if async_engine is not None:
+        return get_pool_status(async_engine.sync_engine.pool)
+    return get_pool_status(engine.pool)
+
+
+async def dispose_engines() -> None:
+    """アプリケーション終了時にコネクションプールを解放する。"""
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
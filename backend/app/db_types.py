@@ -0,0 +1,62 @@
+import os
+import time
+import uuid
+from typing import Optional, Self
+
+from sqlalchemy import BINARY, Dialect
+from sqlalchemy.types import TypeDecorator
+
+from config import get_settings
+
+# DB のカラム型と ID 生成に関するモジュール。
+#
+# UUID は CHAR(36) (utf8mb4 ではインデックス上で最大 144 バイト) ではなく
+# BINARY(16) で保存する。Python 側 (モデルの属性、API のレスポンス) では
+# これまでどおり正規形の文字列 ("xxxxxxxx-xxxx-...") として扱う。
+
+
+class BinaryUUID(TypeDecorator[str]):
+    """UUID を BINARY(16) で保存し、正規形の文字列として読み書きする型。"""
+
+    impl = BINARY(16)
+    cache_ok = True
+
+    def process_bind_param(
+        self: Self, value: str | uuid.UUID | bytes | None, dialect: Dialect
+    ) -> Optional[bytes]:
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            return value
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        # 不正な文字列の場合は ValueError (呼び出し側で事前に検証すること)
+        return uuid.UUID(str(value)).bytes
+
+    def process_result_value(
+        self: Self, value: Optional[bytes], dialect: Dialect
+    ) -> Optional[str]:
+        if value is None:
+            return None
+        return str(uuid.UUID(bytes=bytes(value)))
+
+
+def uuid7() -> uuid.UUID:
+    """
+    時刻順の UUID (RFC 9562 の UUIDv7) を生成する。
+
+    先頭 48 ビットがミリ秒単位の UNIX 時刻のため、主キーに使うと
+    INSERT が B-Tree インデックスの末尾に集中し、ページ分割が減る。
+    """
+    value = (time.time_ns() // 1_000_000 & (1 << 48) - 1) << 80
+    value |= int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # variant (RFC 4122)
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    """新しいレコードの ID を生成する (ID_GENERATOR の設定に従う)。"""
+    if get_settings().id_generator == "uuid7":
+        return str(uuid7())
+    return str(uuid.uuid4())
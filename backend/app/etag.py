@@ -0,0 +1,41 @@
+import hashlib
+import json
+from typing import Optional
+
+from fastapi import Response, status
+
+# 一覧 API の条件付き GET (ETag / If-None-Match) 用のヘルパー。
+#
+# ETag はレスポンスの内容を決める値 (テーブルのバージョン、クエリパラメータなど)
+# から計算するため、304 を返す場合は一覧の取得もシリアライズも行わずに済む。
+
+
+def make_etag(*parts: object) -> str:
+    """レスポンスの内容を決める値から強い ETag を作る。"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return '"' + hashlib.sha1(payload.encode()).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match ヘッダーの値が ETag に一致するか (弱い比較)。"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
+    return etag in candidates
+
+
+def set_etag_headers(response: Response, etag: str) -> None:
+    """ETag と、毎回再検証させるための Cache-Control を設定する。"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    """304 Not Modified のレスポンス (ボディなし) を返す。"""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag_headers(response, etag)
+    return response
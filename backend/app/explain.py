@@ -0,0 +1,77 @@
+import json
+from typing import Any, Dict, Iterator, List, Self
+
+from sqlalchemy import ClauseElement, Executable, Select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.compiler import SQLCompiler
+
+# SELECT 文の実行計画 (MySQL の EXPLAIN FORMAT=JSON) を取得するモジュール。
+#
+# EXPLAIN を SQL 文字列の連結ではなく SQL 構文要素として組み立てるため、
+# バインドパラメーターには通常のクエリと同じ型変換 (BinaryUUID など) が適用される。
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN FORMAT=JSON <SELECT 文>` を表す SQL 構文要素。"""
+
+    inherit_cache = False
+
+    def __init__(self: Self, stmt: Select[Any]) -> None:
+        self.stmt = stmt
+
+
+@compiles(Explain)
+def _compile_explain(
+    element: Explain, compiler: SQLCompiler, **kw: Any
+) -> str:
+    return "EXPLAIN FORMAT=JSON " + compiler.process(element.stmt, **kw)
+
+
+def explain_json(db: Session, stmt: Select[Any]) -> Dict[str, Any]:
+    """
+    SELECT 文の実行計画を返す (MySQL のみ)。
+
+    Returns:
+        EXPLAIN FORMAT=JSON の結果をパースした辞書。
+    """
+    plan: Dict[str, Any] = json.loads(db.execute(Explain(stmt)).scalar_one())
+    return plan
+
+
+def _walk(node: object) -> Iterator[Dict[str, Any]]:
+    """実行計画 (JSON) に含まれるすべてのオブジェクトを列挙する。"""
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def uses_filesort(plan: Dict[str, Any]) -> bool:
+    """実行計画の ORDER BY がソート処理 (filesort) で行われるか。"""
+    return any(
+        node["ordering_operation"].get("using_filesort")
+        for node in _walk(plan)
+        if isinstance(node.get("ordering_operation"), dict)
+    )
+
+
+def full_scan_tables(plan: Dict[str, Any]) -> List[str]:
+    """実行計画でフルテーブルスキャン (access_type=ALL) されるテーブル名。"""
+    return [
+        str(node.get("table_name"))
+        for node in _walk(plan)
+        if node.get("access_type") == "ALL"
+    ]
+
+
+def table_keys(plan: Dict[str, Any], table_name: str) -> List[str]:
+    """実行計画で指定したテーブルの読み込みに使われるインデックス名。"""
+    return [
+        str(node.get("key"))
+        for node in _walk(plan)
+        if node.get("table_name") == table_name
+    ]
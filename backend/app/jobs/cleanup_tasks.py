@@ -0,0 +1,52 @@
+import argparse
+from datetime import datetime, timedelta, timezone
+
+import crud
+from database import SessionLocal
+
+# 古い完了済みタスクを削除するバッチジョブ。
+#
+# cron などから定期実行する:
+#   docker compose exec app python -m jobs.cleanup_tasks --days 90
+
+
+def cleanup(days: int, batch_size: int = 1000) -> int:
+    """完了から days 日以上経過した (updatedAt が days 日より前の) タスクを削除する。"""
+    # updatedAt は DB の NOW() (TIMESTAMP_SOURCE=application の場合は UTC) で
+    # 記録されるため、どちらでも同じになるよう UTC を前提に比較する
+    updated_before = datetime.now(timezone.utc).replace(
+        tzinfo=None
+    ) - timedelta(days=days)
+    with SessionLocal() as db:
+        deleted: int = crud.delete_tasks_by_filter(
+            db,
+            is_completed=True,
+            updated_before=updated_before,
+            batch_size=batch_size,
+        )
+    return deleted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="古い完了済みタスクを削除する"
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        required=True,
+        help="完了 (最終更新) から何日経過したタスクを削除するか",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="1 回の DELETE で削除する最大件数 (デフォルト 1000)",
+    )
+    args = parser.parse_args()
+    deleted = cleanup(days=args.days, batch_size=args.batch_size)
+    print(f"{deleted} completed tasks deleted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+from datetime import date
+from typing import Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+import crud
+import recurrence
+from config import get_settings
+from database import SessionLocal
+
+# 定常タスクの発生記録 (routine_occurrences) を事前生成するバッチジョブ。
+#
+# cron などから定期実行する:
+#   docker compose exec app python -m jobs.routine_occurrences --days 14
+#
+# ROUTINE_OCCURRENCE_JOB_INTERVAL (秒) を設定すると、API プロセス内でも
+# 同じ処理を定期実行する。生成処理は冪等で、複数のワーカーが同時に実行しても
+# 既に追加された行は INSERT IGNORE で無視するため、一意制約違反にならない。
+
+
+def generate(
+    start: Optional[date] = None, days: Optional[int] = None
+) -> Tuple[int, int]:
+    """start (省略時は今日) から days 日分の発生記録を生成する。"""
+    start = start or recurrence.today()
+    days = days if days is not None else get_settings().routine_occurrence_days
+    with SessionLocal() as db:
+        counts: Tuple[int, int] = crud.generate_routine_occurrences(
+            db, start=start, days=days
+        )
+    return counts
+
+
+async def run_periodically(interval: int) -> None:
+    """interval 秒ごとに発生記録を生成し続ける (API プロセスのバックグラウンド用)。"""
+    while True:
+        try:
+            inserted, deleted = await run_in_threadpool(generate)
+            print(
+                f"Routine occurrences generated: "
+                f"{inserted} inserted, {deleted} deleted"
+            )
+        except Exception as e:
+            # 失敗しても API は止めず、次の周期で再実行する
+            print(f"Error generating routine occurrences: {e}")
+        await asyncio.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="定常タスクの発生記録 (routine_occurrences) を生成する"
+    )
+    parser.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        default=None,
+        help="生成を開始する日付 (YYYY-MM-DD、省略時は今日)",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=None,
+        help="生成する日数 (省略時は ROUTINE_OCCURRENCE_DAYS)",
+    )
+    args = parser.parse_args()
+    inserted, deleted = generate(start=args.start, days=args.days)
+    print(
+        f"{inserted} occurrences inserted, {deleted} stale occurrences deleted"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Self, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+import models
+import table_versions
+
+# ラベル一覧のプロセス内キャッシュ。
+#
+# labels テーブルは小さく更新も稀なため、全件を ID と名前の索引付きで保持する。
+# キャッシュする Label はどのセッションにも属さない (detached) インスタンスで、
+# タスクに紐付ける場合は Session.merge(load=False) でクエリなしに取り込む。
+#
+# 鮮度は table_versions の "labels" のバージョンで判定する。同じワーカー内の
+# 書き込みは invalidate() で即座に反映し、他のワーカーの書き込みは
+# check_interval 秒ごとのバージョン確認 (主キー検索 1 回) で検出する。
+# ETag をバージョンから計算する API は、レスポンスを組み立てる前に sync() で
+# スナップショットをそのバージョンに揃える (古いラベルを新しい ETag で返さない)。
+#
+# 名前の索引は casefold したキーで引くが、labels.name の照合順序
+# (utf8mb4_unicode_ci) はかな・全角半角・アクセントの違いも同一視するため、
+# 索引で見つからない名前は DB の照合順序で探し直す (_find_ids_by_name)。
+
+LABELS_TABLE = "labels"
+
+
+class _Snapshot(NamedTuple):
+    version: int
+    by_id: Dict[str, models.Label]
+    # キーは casefold した名前 (大文字小文字を区別しない。照合順序で同一視される
+    # それ以外の違いは区別するため、見つからない場合は DB で探し直す)
+    by_name: Dict[str, models.Label]
+    # DB の照合順序での名前順
+    ordered: List[models.Label]
+
+
+def _name_key(name: str) -> str:
+    return name.casefold()
+
+
+def _find_ids_by_name(db: Session, names: List[str]) -> Dict[str, str]:
+    """
+    名前 -> ID 文字列の辞書を、DB の照合順序での一致で取得する。
+
+    name IN (...) の 1 回のクエリで一致する行を読み、各行がどの名前に
+    一致するかを名前ごとの比較列 (同じ照合順序での比較) で求める
+    (照合順序で同一視される名前が複数指定されても 1 回で対応付ける)。
+    一致しない名前は含まれない。
+    """
+    unique_names = list(dict.fromkeys(names))
+    if not unique_names:
+        return {}
+    stmt = select(
+        models.Label.id,
+        *[models.Label.name == name for name in unique_names],
+    ).where(models.Label.name.in_(unique_names))
+    found: Dict[str, str] = {}
+    for label_id, *matches in db.execute(stmt):
+        for name, matched in zip(unique_names, matches):
+            if matched:
+                found.setdefault(name, str(label_id))
+    return found
+
+
+class LabelCatalog:
+    """ラベル一覧のプロセス内キャッシュ (スレッドセーフ)。"""
+
+    def __init__(self: Self, check_interval: float) -> None:
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self._checked_at = 0.0
+
+    def invalidate(self: Self) -> None:
+        """キャッシュを破棄する (次回アクセス時に再読み込みする)。"""
+        with self._lock:
+            self._snapshot = None
+
+    def _load(self: Self, db: Session) -> _Snapshot:
+        version = table_versions.get_version(db, LABELS_TABLE)
+        stmt = select(
+            models.Label.id,
+            models.Label.name,
+            models.Label.color,
+            models.Label.createdAt,
+            models.Label.updatedAt,
+        ).order_by(models.Label.name)
+        ordered: List[models.Label] = []
+        for row in db.execute(stmt):
+            label = models.Label(**row._asdict())
+            make_transient_to_detached(label)
+            ordered.append(label)
+        return _Snapshot(
+            version=version,
+            by_id={str(label.id): label for label in ordered},
+            by_name={_name_key(str(label.name)): label for label in ordered},
+            ordered=ordered,
+        )
+
+    def _get(self: Self, db: Session, force_check: bool = False) -> _Snapshot:
+        """
+        キャッシュを返す。未読み込み、または確認間隔を過ぎていて
+        バージョンが変わっている場合は読み込み直す。
+        """
+        now = time.monotonic()
+        with self._lock:
+            snapshot = self._snapshot
+            if (
+                snapshot is not None
+                and not force_check
+                and now - self._checked_at < self.check_interval
+            ):
+                return snapshot
+        if snapshot is None or snapshot.version != table_versions.get_version(
+            db, LABELS_TABLE
+        ):
+            snapshot = self._load(db)
+        with self._lock:
+            self._snapshot = snapshot
+            self._checked_at = now
+        return snapshot
+
+    def sync(self: Self, db: Session, version: int) -> None:
+        """
+        スナップショットが version より古い場合は読み込み直す。
+
+        Args:
+            db: SQLAlchemy セッションオブジェクト。
+            version: 同じトランザクションで読んだ labels のバージョン。
+        """
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is not None and snapshot.version >= version:
+            return
+        snapshot = self._load(db)
+        with self._lock:
+            self._snapshot = snapshot
+            self._checked_at = time.monotonic()
+
+    def get_by_ids(
+        self: Self, db: Session, label_ids: Iterable[str]
+    ) -> Tuple[List[models.Label], List[str]]:
+        """
+        ID に一致するラベルを取得する。
+
+        見つからない ID がある場合は、他のワーカーで作成された可能性があるため
+        バージョンを確認してから一度だけ探し直す。
+
+        Returns:
+            タプル: (見つかったラベルのリスト (指定順), 見つからなかった ID のリスト)
+        """
+        ids = list(label_ids)
+        snapshot = self._get(db)
+        if any(label_id not in snapshot.by_id for label_id in ids):
+            snapshot = self._get(db, force_check=True)
+        found = [snapshot.by_id[i] for i in ids if i in snapshot.by_id]
+        missing = [i for i in ids if i not in snapshot.by_id]
+        return found, missing
+
+    def get_by_name(self: Self, db: Session, name: str) -> models.Label | None:
+        """
+        名前 (大文字小文字を区別しない) に一致するラベルを取得する。
+
+        見つからない場合はバージョンを確認してから一度だけ探し直す。
+        """
+        key = _name_key(name)
+        label = self._get(db).by_name.get(key)
+        if label is None:
+            snapshot = self._get(db, force_check=True)
+            label = snapshot.by_name.get(key)
+            if label is None:
+                label_id = _find_ids_by_name(db, [name]).get(name)
+                label = snapshot.by_id.get(label_id) if label_id else None
+        return label
+
+    def get_id_map(
+        self: Self, db: Session, names: List[str]
+    ) -> Dict[str, str]:
+        """
+        ラベル名 -> ID 文字列の辞書を返す。存在しない名前は含まれない。
+
+        見つからない名前がある場合はバージョンを確認してから一度だけ探し直し、
+        それでも見つからない名前は DB の照合順序で探す。
+        """
+        by_name = self._get(db).by_name
+        if any(_name_key(name) not in by_name for name in names):
+            by_name = self._get(db, force_check=True).by_name
+        id_map = {
+            name: str(by_name[_name_key(name)].id)
+            for name in names
+            if _name_key(name) in by_name
+        }
+        missing = [name for name in dict.fromkeys(names) if name not in id_map]
+        if missing:
+            id_map.update(_find_ids_by_name(db, missing))
+        return id_map
+
+    def get_page(
+        self: Self, db: Session, skip: int, limit: int
+    ) -> List[models.Label]:
+        """名前順のラベル一覧から skip 件目以降を最大 limit 件返す。"""
+        return self._get(db).ordered[max(skip, 0) : max(skip, 0) + limit]
+
+    def get_page_after(
+        self: Self, db: Session, after_name: Optional[str], limit: int
+    ) -> List[models.Label]:
+        """
+        名前順のラベル一覧から、after_name のラベルより後ろを最大 limit 件返す
+        (after_name が None の場合は先頭から)。
+
+        after_name のラベルが (名前の変更などで) 見つからない場合は、
+        それより大きい名前のラベルから返す。
+        """
+        ordered = self._get(db).ordered
+        start = 0
+        if after_name is not None:
+            key = _name_key(after_name)
+            positions = [
+                i
+                for i, label in enumerate(ordered)
+                if _name_key(str(label.name)) == key
+            ]
+            if positions:
+                start = positions[0] + 1
+            else:
+                start = next(
+                    (
+                        i
+                        for i, label in enumerate(ordered)
+                        if _name_key(str(label.name)) > key
+                    ),
+                    len(ordered),
+                )
+        return ordered[start : start + max(limit, 0)]
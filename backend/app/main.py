@@ -1,10 +1,18 @@
+import asyncio
 import os
 import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Dict
 
 from fastapi import FastAPI
 
-from routers import labels, tasks
+import crud
+import schemas
+from config import get_settings
+from database import USE_ASYNC_DB, dispose_engines, get_engine_pool_status
+from jobs import routine_occurrences
+from routers import labels, routines, tasks
 from fastapi.middleware.cors import CORSMiddleware
 
 # プロジェクトルートをパスに追加
@@ -12,8 +20,25 @@ APP_ROOT = os.path.dirname(os.path.abspath(__file__))
 if APP_ROOT not in sys.path:
     sys.path.insert(0, APP_ROOT)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # 定常タスクの発生記録を定期生成するバックグラウンドジョブ (設定時のみ)
+    job_interval = get_settings().routine_occurrence_job_interval
+    occurrence_job = (
+        asyncio.create_task(routine_occurrences.run_periodically(job_interval))
+        if job_interval > 0
+        else None
+    )
+    yield
+    if occurrence_job is not None:
+        occurrence_job.cancel()
+    # シャットダウン時に DB コネクションプールを解放
+    await dispose_engines()
+
+
 # FastAPI アプリケーションインスタンスを作成
-app = FastAPI(title="SyncFam API", version="1.0.0")
+app = FastAPI(title="SyncFam API", version="1.0.0", lifespan=lifespan)
 # --- ★★★ CORS ミドルウェアの設定 ★★★ ---
 #    フロントエンドのオリジン (開発環境) を許可する
 #    本番環境では、実際のフロントエンドのドメインを許可する必要がある
@@ -28,14 +53,19 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,  # 許可するオリジンのリスト
     allow_credentials=True,  # クレデンシャル (Cookie など) を許可するかどうか
-    allow_methods=["*"],  # 許可する HTTP メソッド (GET, POST, PUT, DELETE など)
+    allow_methods=[
+        "*"
+    ],  # 許可する HTTP メソッド (GET, POST, PUT, DELETE など)
     allow_headers=["*"],  # 許可する HTTP ヘッダー
+    # フロントエンドが条件付き GET (If-None-Match) に使えるよう ETag を公開する
+    expose_headers=["ETag"],
 )
 
 
 # ルーターの設定
 app.include_router(labels.router, prefix="/api/v1", tags=["Labels"])
 app.include_router(tasks.router, prefix="/api/v1", tags=["Tasks"])
+app.include_router(routines.router, prefix="/api/v1", tags=["Routines"])
 
 
 # --- ヘルスチェックエンドポイント ---
@@ -49,6 +79,37 @@ async def health_check() -> Dict[str, str]:
     return {"status": "OK"}
 
 
+@app.get(
+    "/api/v1/health/db-pool",
+    response_model=schemas.DbPoolStatus,
+    tags=["Meta"],
+)
+async def db_pool_status() -> schemas.DbPoolStatus:
+    """
+    DB コネクションプールの現在の状態と、チェックアウト待ち時間の統計を返す。
+    ワーカー数 x (pool_size + max_overflow) を MySQL の max_connections に
+    収めるためのサイジングに使う。
+    """
+    return schemas.DbPoolStatus(
+        asyncEngine=USE_ASYNC_DB, **get_engine_pool_status()
+    )
+
+
+@app.get(
+    "/api/v1/health/task-label-writes",
+    response_model=schemas.TaskLabelWriteStats,
+    tags=["Meta"],
+)
+async def task_label_write_stats() -> schemas.TaskLabelWriteStats:
+    """
+    タスク更新時の task_labels の書き込み行数と、差分更新によって
+    省略できた書き込み行数の累計を返す (このワーカープロセス内の値)。
+    """
+    return schemas.TaskLabelWriteStats(
+        **crud.task_label_write_stats.snapshot()
+    )
+
+
 # --- ルートパス (任意) ---
 @app.get("/", include_in_schema=False)  # OpenAPI ドキュメントには含めない
 async def read_root() -> Dict[str, str]:
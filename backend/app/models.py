@@ -1,12 +1,22 @@
-import uuid
 from typing import Self
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Table
-from sqlalchemy.dialects.mysql import CHAR
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Computed,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Table,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from database import Base  # database.py で定義した Base をインポート
+from db_types import BinaryUUID, new_id
 
 # --- 中間テーブル (task_labels) の定義 ---
 task_labels_table = Table(
@@ -14,13 +24,13 @@ task_labels_table = Table(
     Base.metadata,
     Column(
         "task_id",
-        CHAR(36),
+        BinaryUUID,
         ForeignKey("tasks.id", ondelete="CASCADE"),
         primary_key=True,
     ),
     Column(
         "label_id",
-        CHAR(36),
+        BinaryUUID,
         ForeignKey("labels.id", ondelete="CASCADE"),
         primary_key=True,
     ),
@@ -32,7 +42,7 @@ task_labels_table = Table(
 class Label(Base):
     __tablename__ = "labels"
 
-    id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Column[str] = Column(BinaryUUID, primary_key=True, default=new_id)
     name = Column(
         String(50), nullable=False, unique=True, index=True
     )  # ラベル名はユニーク制約
@@ -59,15 +69,23 @@ class Label(Base):
 
 
 # --- Task テーブルに対応するモデル ---
+# dueDateSortKey で NULL の代わりに使う値 (DATETIME の最大値)
+DUE_DATE_SORT_MAX = "9999-12-31 23:59:59"
+
+
 class Task(Base):
     __tablename__ = "tasks"
 
-    id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Column[str] = Column(BinaryUUID, primary_key=True, default=new_id)
     name = Column(String(100), nullable=False, index=True)
-    assigneeId = Column(CHAR(36), nullable=True, index=True)
+    assigneeId: Column[str] = Column(BinaryUUID, nullable=True)
     dueDate = Column(DateTime, nullable=True)
-    isCompleted = Column(Boolean, default=False, nullable=False, index=True)
-    isRecurring = Column(Boolean, default=False, nullable=False, index=True)
+    # dueDate 昇順 (NULL は最後) で並べるためのソートキー (NULL を最大値に置換)
+    dueDateSortKey = Column(
+        DateTime, Computed(f"COALESCE(dueDate, '{DUE_DATE_SORT_MAX}')")
+    )
+    isCompleted = Column(Boolean, default=False, nullable=False)
+    isRecurring = Column(Boolean, default=False, nullable=False)
     recurrenceRule = Column(String(100), nullable=True)
     createdAt = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -91,8 +109,136 @@ class Task(Base):
     # --- User モデルとのリレーションシップ (後で User モデル側で back_populates) ---
     # assignee = relationship("User", back_populates="assigned_tasks") # 例
 
+    # タスク一覧 (crud.get_tasks) 用の複合インデックス。
+    # 等価条件 (isRecurring + assigneeId または isCompleted) + ソート列の
+    # 組み合わせごとに用意し、filesort なしでインデックス順に読めるようにする
+    # (担当者と完了状態の両方で絞り込む場合は、担当者のインデックスを順に読み、
+    #  完了状態はその行に対して判定する。書き込みのたびに全インデックスを
+    #  更新するため、実行計画のテスト (tests/test_task_indexes.py) で
+    #  選ばれることを確認したもののみを置く)
+    # (InnoDB のセカンダリインデックスは末尾に主キー id を含むため、
+    #  id のタイブレークもインデックス順で解決される)
+    __table_args__ = (
+        # 名前の検索 (GET /tasks の q) 用の FULLTEXT インデックス。日本語の
+        # 名前を分かち書きなしで検索できるよう ngram パーサーを使う (MySQL のみ)
+        Index(
+            "ft_tasks_name",
+            "name",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+        Index("ix_tasks_list_created", "isRecurring", "createdAt"),
+        Index("ix_tasks_list_due", "isRecurring", "dueDate"),
+        # 変更フィード (GET /tasks/changes) 用。(updatedAt, id) の順に読み進める
+        Index("ix_tasks_changes", "isRecurring", "updatedAt"),
+        Index("ix_tasks_list_due_sort", "isRecurring", "dueDateSortKey"),
+        Index(
+            "ix_tasks_list_completed_created",
+            "isRecurring",
+            "isCompleted",
+            "createdAt",
+        ),
+        Index(
+            "ix_tasks_list_completed_due",
+            "isRecurring",
+            "isCompleted",
+            "dueDate",
+        ),
+        Index(
+            "ix_tasks_list_completed_due_sort",
+            "isRecurring",
+            "isCompleted",
+            "dueDateSortKey",
+        ),
+        Index(
+            "ix_tasks_list_assignee_created",
+            "assigneeId",
+            "isRecurring",
+            "createdAt",
+        ),
+        Index(
+            "ix_tasks_list_assignee_due",
+            "assigneeId",
+            "isRecurring",
+            "dueDate",
+        ),
+        Index(
+            "ix_tasks_list_assignee_due_sort",
+            "assigneeId",
+            "isRecurring",
+            "dueDateSortKey",
+        ),
+    )
+
     def __repr__(self: Self) -> str:
         return f"<Task(id={self.id}, name='{self.name}')>"
 
 
+# --- 定常タスクの発生日ごとの記録 (routine_occurrences) ---
+class RoutineOccurrence(Base):
+    __tablename__ = "routine_occurrences"
+
+    # (task_id, date) の複合主キー。日付での検索用に date にインデックスを張る
+    task_id: Column[str] = Column(
+        BinaryUUID,
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date = Column(Date, primary_key=True, index=True)
+    isCompleted = Column(Boolean, default=False, nullable=False)
+    completedAt = Column(DateTime(timezone=True), nullable=True)
+    createdAt = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updatedAt = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    task = relationship("Task", lazy="selectin")
+
+    def __repr__(self: Self) -> str:
+        return f"<RoutineOccurrence(task_id={self.task_id}, date={self.date})>"
+
+
+# --- 削除したタスクの記録 (task_deletions) ---
+# 変更フィード (GET /tasks/changes) で削除を伝えるための tombstone。
+# タスクの削除と同じトランザクションで記録する
+class TaskDeletion(Base):
+    __tablename__ = "task_deletions"
+
+    # 削除したタスクの ID (タスクの行は残らないため外部キーは張らない)
+    task_id: Column[str] = Column(BinaryUUID, primary_key=True)
+    # (deletedAt, task_id) の順に読み進めるためのインデックス
+    deletedAt = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self: Self) -> str:
+        return f"<TaskDeletion(task_id={self.task_id})>"
+
+
+# --- テーブルごとの更新バージョン (table_versions) ---
+# 書き込みのたびにインクリメントし、プロセス内キャッシュの鮮度確認に使う
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    name = Column(String(64), primary_key=True)  # 対象テーブル名
+    version = Column(BigInteger, default=0, nullable=False)
+    updatedAt = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self: Self) -> str:
+        return f"<TableVersion(name={self.name}, version={self.version})>"
+
+
 # --- User テーブルに対応するモデル (後で定義) ---
@@ -0,0 +1,398 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from config import get_settings
+
+# 定常タスクの繰り返しルール (recurrenceRule) を解釈するモジュール。
+#
+# 次の 2 つの書式に対応する:
+#   - 短縮形: "daily", "weekdays", "weekends", "weekly:Tue,Fri",
+#             "monthly:1,15,-1" (-1 は月末)
+#   - RRULE 形式 (RFC 5545 のサブセット):
+#             "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH",
+#             "FREQ=MONTHLY;BYMONTHDAY=1,-1", "FREQ=DAILY;DTSTART=20250401",
+#             "FREQ=DAILY;COUNT=3", "FREQ=WEEKLY;BYDAY=MO;UNTIL=20251231"
+#             (これ以外のキー (BYMONTH, BYSETPOS など) は ValueError にする。
+#              無視すると、期間を限ったルールが無期限に発生し続けるため)
+#             BYDAY と BYMONTHDAY は RFC 5545 と同じく、指定されたものすべてに
+#             一致する日に発生する ("FREQ=MONTHLY;BYDAY=MO" は毎月の毎週月曜、
+#             "FREQ=DAILY;BYMONTHDAY=1" は毎月 1 日)。RFC 5545 で禁止されている
+#             FREQ=WEEKLY と BYMONTHDAY の組み合わせは ValueError にする。
+#
+# ルール文字列は CompiledRule (ビットマスク中心のコンパクトな形式) に一度だけ
+# コンパイルしてキャッシュし、日付ごとの判定はビット演算と整数演算のみで行う。
+
+FREQ_DAILY = 0
+FREQ_WEEKLY = 1
+FREQ_MONTHLY = 2
+
+_FREQS = {"DAILY": FREQ_DAILY, "WEEKLY": FREQ_WEEKLY, "MONTHLY": FREQ_MONTHLY}
+
+# 対応している RRULE のキー
+_RRULE_KEYS = frozenset(
+    {"FREQ", "INTERVAL", "BYDAY", "BYMONTHDAY", "DTSTART", "UNTIL", "COUNT"}
+)
+# COUNT の上限と、COUNT 回目の発生日を探す最大日数 (発生しないルールの打ち切り)
+MAX_COUNT = 1000
+_COUNT_SCAN_DAYS = 366 * 100
+
+# 曜日 -> ビット位置 (date.weekday() と同じく月曜 = 0)
+_WEEKDAYS = {
+    "MO": 0,
+    "TU": 1,
+    "WE": 2,
+    "TH": 3,
+    "FR": 4,
+    "SA": 5,
+    "SU": 6,
+}
+ALL_WEEKDAYS = 0b1111111
+WEEKDAYS_MASK = 0b0011111
+WEEKENDS_MASK = 0b1100000
+
+
+class CompiledRule(NamedTuple):
+    """コンパイル済みの繰り返しルール。"""
+
+    freq: int
+    interval: int = 1
+    # ビット i が曜日 i (月曜 = 0) に対応。0 は曜日を限定しないことを意味する
+    # (日付も限定しない場合は、開始日の曜日 (月次は開始日の日付) を使う)
+    weekday_mask: int = 0
+    # ビット d が d 日 (1-31) に対応
+    monthday_mask: int = 0
+    # ビット n が「月末から n 日目」(1 = 月末) に対応
+    last_monthday_mask: int = 0
+    # DTSTART の序数 (date.toordinal())。None の場合はタスク作成日を使う
+    anchor: Optional[int] = None
+    # UNTIL の序数 (この日まで発生する)。None の場合は無期限
+    until: Optional[int] = None
+    # COUNT (開始日からの発生回数)。開始日が決まった後に until に置き換える
+    occurrence_count: Optional[int] = None
+
+
+def _parse_weekdays(value: str) -> int:
+    mask = 0
+    for token in value.split(","):
+        key = token.strip().upper()[:2]
+        if key not in _WEEKDAYS:
+            raise ValueError(f"Invalid weekday: {token!r}")
+        mask |= 1 << _WEEKDAYS[key]
+    return mask
+
+
+def _parse_monthdays(value: str) -> Tuple[int, int]:
+    monthday_mask = 0
+    last_monthday_mask = 0
+    for token in value.split(","):
+        day = int(token)
+        if 1 <= day <= 31:
+            monthday_mask |= 1 << day
+        elif -31 <= day <= -1:
+            last_monthday_mask |= 1 << -day
+        else:
+            raise ValueError(f"Invalid day of month: {token!r}")
+    return monthday_mask, last_monthday_mask
+
+
+def _parse_rrule_date(value: str) -> int:
+    """DTSTART / UNTIL の値 (YYYYMMDD[THHMMSS[Z]]) を日付の序数にする。"""
+    return datetime.strptime(value[:8], "%Y%m%d").toordinal()
+
+
+def _parse_count(value: str) -> int:
+    count = int(value)
+    if not 1 <= count <= MAX_COUNT:
+        raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}")
+    return count
+
+
+def _split_rrule(rule: str) -> Dict[str, str]:
+    """RRULE をキー -> 値に分割する (未対応のキーは ValueError)。"""
+    parts: Dict[str, str] = {}
+    for part in rule.split(";"):
+        if not part:
+            continue
+        key, sep, value = part.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid RRULE part: {part!r}")
+        key = key.strip().upper()
+        if key not in _RRULE_KEYS:
+            raise ValueError(f"Unsupported RRULE part {key!r} in: {rule!r}")
+        parts[key] = value.strip()
+    if "UNTIL" in parts and "COUNT" in parts:
+        raise ValueError(f"UNTIL and COUNT must not both be set: {rule!r}")
+    return parts
+
+
+def _compile_rrule(rule: str) -> CompiledRule:
+    parts = _split_rrule(rule)
+
+    freq = _FREQS.get(parts.get("FREQ", "").upper())
+    if freq is None:
+        raise ValueError(f"Unsupported FREQ in rule: {rule!r}")
+    interval = int(parts.get("INTERVAL", "1"))
+    if interval < 1:
+        raise ValueError(f"Invalid INTERVAL in rule: {rule!r}")
+
+    weekday_mask = 0
+    if "BYDAY" in parts:
+        weekday_mask = _parse_weekdays(parts["BYDAY"])
+    elif freq == FREQ_DAILY:
+        weekday_mask = ALL_WEEKDAYS
+
+    monthday_mask, last_monthday_mask = 0, 0
+    if "BYMONTHDAY" in parts:
+        if freq == FREQ_WEEKLY:
+            raise ValueError(
+                f"BYMONTHDAY is not allowed with FREQ=WEEKLY: {rule!r}"
+            )
+        monthday_mask, last_monthday_mask = _parse_monthdays(
+            parts["BYMONTHDAY"]
+        )
+
+    anchor: Optional[int] = None
+    until: Optional[int] = None
+    count: Optional[int] = None
+    if "DTSTART" in parts:
+        anchor = _parse_rrule_date(parts["DTSTART"])
+    if "UNTIL" in parts:
+        until = _parse_rrule_date(parts["UNTIL"])
+    if "COUNT" in parts:
+        count = _parse_count(parts["COUNT"])
+
+    return CompiledRule(
+        freq=freq,
+        interval=interval,
+        weekday_mask=weekday_mask,
+        monthday_mask=monthday_mask,
+        last_monthday_mask=last_monthday_mask,
+        anchor=anchor,
+        until=until,
+        occurrence_count=count,
+    )
+
+
+@lru_cache(maxsize=1024)
+def compile_rule(rule: str) -> CompiledRule:
+    """
+    繰り返しルール文字列を CompiledRule にコンパイルする (結果はキャッシュされる)。
+
+    Raises:
+        ValueError: ルールの書式が不正な場合に発生。
+    """
+    text = rule.strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[len("RRULE:") :]
+    if "=" in text:
+        return _compile_rrule(text)
+
+    kind, _, args = text.partition(":")
+    kind = kind.strip().lower()
+    if kind == "daily" and not args:
+        return CompiledRule(freq=FREQ_DAILY, weekday_mask=ALL_WEEKDAYS)
+    if kind == "weekdays" and not args:
+        return CompiledRule(freq=FREQ_WEEKLY, weekday_mask=WEEKDAYS_MASK)
+    if kind == "weekends" and not args:
+        return CompiledRule(freq=FREQ_WEEKLY, weekday_mask=WEEKENDS_MASK)
+    if kind == "weekly":
+        return CompiledRule(
+            freq=FREQ_WEEKLY,
+            weekday_mask=_parse_weekdays(args) if args else 0,
+        )
+    if kind == "monthly":
+        monthday_mask, last_monthday_mask = (
+            _parse_monthdays(args) if args else (0, 0)
+        )
+        return CompiledRule(
+            freq=FREQ_MONTHLY,
+            monthday_mask=monthday_mask,
+            last_monthday_mask=last_monthday_mask,
+        )
+    raise ValueError(f"Unsupported recurrence rule: {rule!r}")
+
+
+# 繰り返しルールが未設定または解釈できない定常タスクは毎日扱いにする
+# (表示されなくなるよりは、毎日表示される方が安全なため)
+_FALLBACK_RULE = CompiledRule(freq=FREQ_DAILY, weekday_mask=ALL_WEEKDAYS)
+
+
+def _compile_or_fallback(rule: Optional[str]) -> CompiledRule:
+    if not rule:
+        return _FALLBACK_RULE
+    try:
+        return compile_rule(rule)
+    except ValueError as e:
+        print(f"Warning: Invalid recurrenceRule {rule!r}: {e}")
+        return _FALLBACK_RULE
+
+
+def _days_in_month(day: date) -> int:
+    if day.month == 12:
+        return 31
+    return (
+        date(day.year, day.month + 1, 1) - date(day.year, day.month, 1)
+    ).days
+
+
+class _DayFacts(NamedTuple):
+    """判定対象日についての事前計算値 (全ルールで共有する)。"""
+
+    ordinal: int
+    weekday_bit: int
+    monthday_bit: int
+    last_monthday_bit: int
+    week_index: int
+    month_index: int
+
+
+def _day_facts(day: date) -> _DayFacts:
+    ordinal = day.toordinal()
+    return _DayFacts(
+        ordinal=ordinal,
+        weekday_bit=1 << day.weekday(),
+        monthday_bit=1 << day.day,
+        last_monthday_bit=1 << (_days_in_month(day) - day.day + 1),
+        # toordinal() == 1 は月曜日なので、月曜始まりの週番号になる
+        week_index=(ordinal - 1) // 7,
+        month_index=day.year * 12 + day.month - 1,
+    )
+
+
+def _needs_start(rule: CompiledRule) -> bool:
+    """ルールの判定に開始日 (DTSTART またはタスク作成日) が必要か。"""
+    if rule.anchor is not None:
+        return False
+    return (
+        rule.interval > 1
+        or not _has_days(rule)
+        or rule.occurrence_count is not None
+    )
+
+
+def _has_days(rule: CompiledRule) -> bool:
+    """BYDAY / BYMONTHDAY (または短縮形の曜日/日付) が指定されているか。"""
+    if rule.freq == FREQ_MONTHLY:
+        return bool(
+            rule.weekday_mask or rule.monthday_mask or rule.last_monthday_mask
+        )
+    return bool(rule.weekday_mask)
+
+
+def _with_start(rule: CompiledRule, start: Optional[date]) -> CompiledRule:
+    """
+    開始日を補ったルールを返す。
+
+    BYDAY / BYMONTHDAY が省略されたルールは、開始日の曜日 / 日付を使う。
+    """
+    if start is None:
+        return rule
+    rule = rule._replace(anchor=start.toordinal())
+    if _has_days(rule):
+        return rule
+    if rule.freq == FREQ_MONTHLY:
+        return rule._replace(monthday_mask=1 << start.day)
+    return rule._replace(weekday_mask=1 << start.weekday())
+
+
+@lru_cache(maxsize=1024)
+def _resolve_count(rule: CompiledRule) -> CompiledRule:
+    """
+    COUNT を COUNT 回目の発生日 (until) に置き換えたルールを返す。
+
+    開始日 (anchor) から 1 日ずつ判定するため、結果はキャッシュする。
+    開始日が決まっていない場合はそのまま返す。
+    """
+    if rule.occurrence_count is None or rule.anchor is None:
+        return rule
+    base = rule._replace(occurrence_count=None)
+    remaining = rule.occurrence_count
+    for ordinal in range(rule.anchor, rule.anchor + _COUNT_SCAN_DAYS):
+        if _occurs(base, _day_facts(date.fromordinal(ordinal))):
+            remaining -= 1
+            if remaining == 0:
+                return base._replace(until=ordinal)
+    return base._replace(until=rule.anchor + _COUNT_SCAN_DAYS)
+
+
+def _occurs(rule: CompiledRule, facts: _DayFacts) -> bool:
+    anchor = rule.anchor
+    if anchor is not None and facts.ordinal < anchor:
+        return False
+    if rule.until is not None and facts.ordinal > rule.until:
+        return False
+    # 曜日と日付は、指定されているものすべてに一致する必要がある
+    has_monthdays = rule.monthday_mask or rule.last_monthday_mask
+    if not (rule.weekday_mask or has_monthdays):
+        return False
+    if rule.weekday_mask and not rule.weekday_mask & facts.weekday_bit:
+        return False
+    if has_monthdays and not (
+        rule.monthday_mask & facts.monthday_bit
+        or rule.last_monthday_mask & facts.last_monthday_bit
+    ):
+        return False
+
+    if rule.interval == 1 or anchor is None:
+        return True
+    if rule.freq == FREQ_DAILY:
+        elapsed = facts.ordinal - anchor
+    elif rule.freq == FREQ_WEEKLY:
+        elapsed = facts.week_index - (anchor - 1) // 7
+    else:
+        start = date.fromordinal(anchor)
+        elapsed = facts.month_index - (start.year * 12 + start.month - 1)
+    return elapsed % rule.interval == 0
+
+
+def routines_occurring_on(
+    routines: Iterable[Tuple[str, Optional[str], Optional[datetime]]],
+    day: date,
+) -> List[str]:
+    """
+    定常タスクのうち、指定日に発生するもののIDを返す。
+
+    判定対象日の値は一度だけ計算し、判定結果はコンパイル済みルールごとに
+    一度だけ計算して使い回す (同じルールを持つタスクが多くても、判定コストは
+    ルールの種類数に比例する)。
+
+    Args:
+        routines: (タスクID, recurrenceRule, 作成日時) のイテラブル。
+            作成日時は DTSTART を持たないルールの開始日として使う。
+        day: 判定対象日。
+
+    Returns:
+        指定日に発生する定常タスクのIDのリスト (入力順)。
+    """
+    facts = _day_facts(day)
+    by_rule: Dict[CompiledRule, bool] = {}
+    due_ids: List[str] = []
+    for task_id, rule_text, created_at in routines:
+        rule = _compile_or_fallback(rule_text)
+        if _needs_start(rule):
+            start = created_at.date() if created_at is not None else None
+            rule = _with_start(rule, start)
+        rule = _resolve_count(rule)
+        occurs = by_rule.get(rule)
+        if occurs is None:
+            occurs = by_rule[rule] = _occurs(rule, facts)
+        if occurs:
+            due_ids.append(task_id)
+    return due_ids
+
+
+def occurs_on(
+    rule: Optional[str], day: date, start: Optional[date] = None
+) -> bool:
+    """単一のルールが指定日に発生するかを判定する。"""
+    compiled = _compile_or_fallback(rule)
+    if _needs_start(compiled):
+        compiled = _with_start(compiled, start)
+    return _occurs(_resolve_count(compiled), _day_facts(day))
+
+
+def today() -> date:
+    """アプリケーションのタイムゾーン (APP_TIMEZONE) における今日の日付。"""
+    return datetime.now(ZoneInfo(get_settings().app_timezone)).date()
@@ -0,0 +1,44 @@
+from typing import Any, List, Type, TypeVar
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+# レスポンスを 1 回の検証で組み立て、直接 JSON バイト列にするためのヘルパー。
+#
+# ルーターが Pydantic モデルを返すと、FastAPI は response_model に対して
+# もう一度検証し (モデル -> dict -> 検証)、jsonable_encoder と標準の json で
+# シリアライズする。ORM オブジェクトから from_attributes で一度だけ検証し、
+# model_dump_json (pydantic-core) でバイト列にした Response を返すと、
+# FastAPI の検証とシリアライズはすべて省略される。
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def validate_model(model: Type[M], data: object) -> M:
+    """ORM オブジェクトを含むデータを from_attributes で一度だけ検証する。"""
+    return model.model_validate(data, from_attributes=True)
+
+
+def model_json_response(
+    model: BaseModel, status_code: int = status.HTTP_200_OK
+) -> Response:
+    """検証済みのモデルを JSON バイト列にした Response を返す。"""
+    return Response(
+        content=model.model_dump_json(),
+        media_type="application/json",
+        status_code=status_code,
+    )
+
+
+def list_json_response(
+    adapter: TypeAdapter[List[Any]],
+    items: List[Any],
+    status_code: int = status.HTTP_200_OK,
+) -> Response:
+    """ORM オブジェクトのリストを adapter で一度だけ検証し、JSON にして返す。"""
+    validated = adapter.validate_python(items, from_attributes=True)
+    return Response(
+        content=adapter.dump_json(validated),
+        media_type="application/json",
+        status_code=status_code,
+    )
@@ -1,17 +1,32 @@
-from typing import List
+from typing import List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from pydantic import TypeAdapter
 
 import crud
-import models
 import schemas
-from database import get_db
+from crud import TASKS_TABLE
+from database import DbSession, get_session, run_db
+from etag import etag_matches, make_etag, not_modified, set_etag_headers
+from label_catalog import LABELS_TABLE
+from responses import list_json_response, model_json_response
 
 # ルーターインスタンスを作成
 # prefix="/labels" と tags=["Labels"] は main.py で include_router する際に指定する方が一般的
 router = APIRouter()
 
+# ラベル一覧のレスポンス用 (ORM オブジェクトのリストを一度だけ検証する)
+_LABEL_LIST_ADAPTER = TypeAdapter(List[schemas.Label])
+
 
 @router.post(
     "/labels",
@@ -22,7 +37,7 @@ router = APIRouter()
 )
 async def create_new_label(
     label: schemas.LabelCreate,  # リクエストボディを Pydantic スキーマで受け取る
-    db: Session = Depends(get_db),  # DB セッションを依存性注入で取得
+    db: DbSession = Depends(get_session),  # DB セッションを依存性注入で取得
 ) -> schemas.Label:
     """
     新しいラベルを作成します。
@@ -32,13 +47,49 @@ async def create_new_label(
 
     既に同じ名前のラベルが存在する場合はエラー (409 Conflict) を返します。
     """
-    db_label = crud.get_label_by_name(db, name=label.name)
-    if db_label:
+    try:
+        return await run_db(db, crud.create_label, label=label)
+    except crud.LabelNameConflictError as e:
+        # 重複は INSERT の一意制約違反で検出する (同時作成の競合も 409 になる)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=str(e)
+        )
+
+
+@router.post(
+    "/labels/ensure",
+    response_model=schemas.LabelEnsureResponse,
+    summary="ラベルの一括作成 (存在しないもののみ)",
+    tags=["Labels"],
+)
+async def ensure_labels(
+    ensure_input: schemas.LabelEnsureInput,
+    db: DbSession = Depends(get_session),
+) -> schemas.LabelEnsureResponse:
+    """
+    指定された名前のラベルがすべて存在するようにします (最大 500 件)。
+
+    存在しないラベルのみを 1 回の INSERT でまとめて作成し、既存のラベルは
+    そのまま (色も変更せずに) 返します。名前は大文字小文字を区別しません。
+    タスクのインポートなどで、バッチごとに一度呼び出すことを想定しています。
+    """
+    try:
+        id_map, created = await run_db(
+            db, crud.ensure_labels, labels=ensure_input.labels
+        )
+        label_ids = dict.fromkeys(
+            UUID(id_map[label.name]) for label in ensure_input.labels
+        )
+        labels = await run_db(
+            db, crud.get_labels_by_ids, label_ids=list(label_ids)
+        )
+    except Exception as e:
+        print(f"Error ensuring labels: {e}")
         raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Label with name '{label.name}' already exists",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while creating the labels.",
         )
-    return crud.create_label(db=db, label=label)
+    return schemas.LabelEnsureResponse(data=labels, created=created)
 
 
 @router.get(
@@ -48,13 +99,81 @@ async def create_new_label(
     tags=["Labels"],
 )
 async def read_labels(
+    request: Request,
     skip: int = 0,  # クエリパラメータ (デフォルト値付き)
     limit: int = 100,  # クエリパラメータ (デフォルト値付き)
-    db: Session = Depends(get_db),
-) -> List[models.Label]:
+    db: DbSession = Depends(get_session),
+) -> Response:
     """
     登録されているラベルの一覧を取得します。
+
+    レスポンスには `ETag` ヘッダーが付きます。`If-None-Match` に前回の `ETag` を
+    指定すると、ラベルに変更がない場合は 304 (ボディなし) を返します。
+    """
+    versions = await run_db(db, crud.get_table_versions, [LABELS_TABLE])
+    etag = make_etag(versions, skip, limit)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        response: Response = not_modified(etag)
+        return response
+
+    db_labels = await run_db(db, crud.get_labels, skip=skip, limit=limit)
+    # 一度だけ検証して直接 JSON にする (FastAPI による再検証を行わない)
+    response = list_json_response(_LABEL_LIST_ADAPTER, db_labels)
+    set_etag_headers(response, etag)
+    return response
+
+
+@router.get(
+    "/labels/usage",
+    response_model=schemas.LabelUsageResponse,
+    summary="ラベル一覧取得 (タスク数付き)",
+    tags=["Labels"],
+)
+async def read_label_usage(
+    request: Request,
+    cursor: Optional[str] = None,  # 前ページの nextCursor
+    limit: int = Query(100, ge=1, le=500),
+    db: DbSession = Depends(get_session),
+) -> Response:
     """
-    db_labels = crud.get_labels(db, skip=skip, limit=limit)
-    # SQLAlchemy モデルのリストを Pydantic モデルのリストに自動変換してくれる
-    return db_labels
+    ラベルの一覧を名前順に、各ラベルが付いた通常タスクの数とともに取得します。
+
+    - **openTasks**: 未完了の通常タスクの数
+    - **totalTasks**: 通常タスクの数 (完了済みを含む)
+
+    `cursor` に前回レスポンスの `meta.nextCursor` を指定すると続きを取得します。
+    不正なカーソルの場合は 400 エラーを返します。レスポンスには `ETag`
+    ヘッダーが付きます (ラベル/タスクに変更がない場合は 304)。
+    """
+    versions = await run_db(
+        db, crud.get_table_versions, [LABELS_TABLE, TASKS_TABLE]
+    )
+    etag = make_etag(versions, cursor, limit)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        response: Response = not_modified(etag)
+        return response
+
+    try:
+        usage, next_cursor = await run_db(
+            db, crud.get_label_usage, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    payload = schemas.LabelUsageResponse(
+        data=[
+            schemas.LabelUsage(
+                id=label.id,
+                name=label.name,
+                color=label.color,
+                openTasks=open_tasks,
+                totalTasks=total_tasks,
+            )
+            for label, open_tasks, total_tasks in usage
+        ],
+        meta=schemas.LabelUsageMeta(limit=limit, nextCursor=next_cursor),
+    )
+    response = model_json_response(payload)
+    set_etag_headers(response, etag)
+    return response
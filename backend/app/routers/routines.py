@@ -0,0 +1,90 @@
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+import crud
+import models
+import recurrence
+import schemas
+from database import DbSession, get_session, run_db
+
+# ルーターインスタンスを作成
+router = APIRouter()
+
+
+@router.get(
+    "/routines/occurrences",
+    response_model=List[schemas.RoutineOccurrence],
+    summary="定常タスクの発生記録一覧取得",
+    tags=["Routines"],
+)
+async def read_routine_occurrences(
+    startDate: Optional[date] = None,
+    endDate: Optional[date] = None,
+    db: DbSession = Depends(get_session),
+) -> List[models.RoutineOccurrence]:
+    """
+    指定期間の定常タスクの発生記録 (日付ごとの完了状態) を取得します。
+
+    - **startDate**: 期間の開始日 (省略時は今日)
+    - **endDate**: 期間の終了日 (省略時は startDate と同じ日)
+
+    発生記録はバッチジョブで事前に生成されます。
+    """
+    start = startDate or recurrence.today()
+    end = endDate or start
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="endDate must not be earlier than startDate",
+        )
+    occurrences: List[models.RoutineOccurrence] = await run_db(
+        db, crud.get_routine_occurrences, start=start, end=end
+    )
+    return occurrences
+
+
+@router.put(
+    "/routines/{task_id}/occurrences/{occurrence_date}",
+    response_model=schemas.RoutineOccurrence,
+    summary="定常タスクの発生記録の完了状態更新",
+    tags=["Routines"],
+)
+async def update_routine_occurrence(
+    task_id: str,
+    occurrence_date: date,
+    occurrence_input: schemas.RoutineOccurrenceUpdate,
+    db: DbSession = Depends(get_session),
+) -> models.RoutineOccurrence:
+    """
+    定常タスクの指定日の完了状態を更新します。
+    定常タスクの定義自体は変更されません。
+
+    発生記録が見つからない場合は 404 エラーを返します。
+    """
+    try:
+        UUID(task_id, version=4)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid task ID format",
+        )
+
+    db_occurrence = await run_db(
+        db,
+        crud.update_routine_occurrence,
+        task_id=task_id,
+        day=occurrence_date,
+        is_completed=occurrence_input.isCompleted,
+    )
+    if db_occurrence is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=(
+                f"Routine occurrence not found for task {task_id} "
+                f"on {occurrence_date}"
+            ),
+        )
+    return db_occurrence
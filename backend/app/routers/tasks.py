@@ -1,18 +1,77 @@
-from typing import Optional
+import io
+import tempfile
+from datetime import date
+from typing import Iterator, List, Literal, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
 import crud
 import models
+import recurrence
 import schemas
-from database import get_db
+import task_io
+from config import get_settings
+from database import (
+    DbSession,
+    SessionFactory,
+    get_session,
+    get_session_factory,
+    run_db,
+)
+from etag import etag_matches, make_etag, not_modified, set_etag_headers
+from label_catalog import LABELS_TABLE
+from responses import model_json_response, validate_model
 
 # ルーターインスタンスを作成
 router = APIRouter()
 
 
+def _get_current_user_id(assignee_id: Optional[str]) -> Optional[str]:
+    """
+    assigneeId='me' の場合に使う現在のユーザーIDを返す。
+
+    Raises:
+        HTTPException: 'me' が指定されたが現在のユーザーが不明な場合 (401)。
+    """
+    # ★ current_user_id を取得 (認証が必要) - 今は仮の ID
+    current_user_id = (
+        "f0e9d8c7-b6a5-4321-fedc-ba9876543210" if assignee_id == "me" else None
+    )
+    if assignee_id == "me" and not current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required for 'me' filter",
+        )
+    return current_user_id
+
+
+def _validate_task_id(task_id: str) -> None:
+    """
+    パスで指定されたタスク ID が UUID 文字列として妥当か確認する
+    (タスク ID を受け取るすべてのルートで使う)。
+
+    Raises:
+        HTTPException: UUID として解釈できない場合 (400)。
+    """
+    try:
+        UUID(task_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid task ID format",
+        )
+
+
 @router.post(
     "/tasks",
     response_model=schemas.Task,
@@ -21,7 +80,8 @@ router = APIRouter()
     tags=["Tasks"],
 )
 async def create_new_task(
-    task_input: schemas.TaskCreateApiInput, db: Session = Depends(get_db)
+    task_input: schemas.TaskCreateApiInput,
+    db: DbSession = Depends(get_session),
 ) -> models.Task:
     """
     新しい通常のタスクを作成し、指定されたラベルを紐付けます。
@@ -34,7 +94,7 @@ async def create_new_task(
     指定されたラベル ID が存在しない場合は 404 エラーを返します。
     """
     try:
-        created_task = crud.create_task(db=db, task_data=task_input)
+        created_task = await run_db(db, crud.create_task, task_data=task_input)
         # FastAPI が response_model に基づいて models.Task -> schemas.Task へ変換
         return created_task
     except ValueError as e:
@@ -51,6 +111,128 @@ async def create_new_task(
         )
 
 
+def _batch_response(
+    outcomes: List[Tuple[Optional[models.Task], Optional[str]]],
+    success_status: int,
+    ids: Optional[List[UUID]] = None,
+) -> schemas.TaskBatchResponse:
+    """crud の一括操作の結果を項目ごとの結果に変換する (失敗は 404)。"""
+    results = []
+    for index, (task, error) in enumerate(outcomes):
+        result = schemas.TaskBatchItemResult(
+            index=index,
+            status=(
+                success_status if error is None else status.HTTP_404_NOT_FOUND
+            ),
+            id=task.id if task is not None else (ids[index] if ids else None),
+            data=task,
+            error=error,
+        )
+        results.append(result)
+    failed = sum(1 for _, error in outcomes if error is not None)
+    return schemas.TaskBatchResponse(
+        results=results, succeeded=len(outcomes) - failed, failed=failed
+    )
+
+
+# 一括操作のルートは "/tasks/{task_id}" より先に登録する
+@router.post(
+    "/tasks/batch",
+    response_model=schemas.TaskBatchResponse,
+    summary="通常タスクの一括作成",
+    tags=["Tasks"],
+)
+async def create_tasks_batch(
+    batch_input: schemas.TaskBatchCreateInput,
+    db: DbSession = Depends(get_session),
+) -> schemas.TaskBatchResponse:
+    """
+    複数の通常タスクを 1 トランザクションで作成します (最大 500 件)。
+
+    各項目の内容は `POST /tasks` と同じです。結果は `results` に項目ごとに
+    リクエストと同じ順序で返します (作成した項目は `status` が 201、
+    存在しないラベル ID を指定した項目は 404 で、その項目のみ作成されません)。
+    """
+    try:
+        outcomes = await run_db(
+            db, crud.create_tasks_batch, items=batch_input.items
+        )
+    except Exception as e:
+        print(f"Error creating tasks in batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while creating the tasks.",
+        )
+    return _batch_response(outcomes, status.HTTP_201_CREATED)
+
+
+@router.put(
+    "/tasks/batch",
+    response_model=schemas.TaskBatchResponse,
+    summary="通常タスクの一括更新 (全量)",
+    tags=["Tasks"],
+)
+async def update_tasks_batch(
+    batch_input: schemas.TaskBatchUpdateInput,
+    db: DbSession = Depends(get_session),
+) -> schemas.TaskBatchResponse:
+    """
+    複数の通常タスクを 1 トランザクションで更新します (最大 500 件)。
+
+    各項目は `id` に加えて `PUT /tasks/{task_id}` と同じ内容を指定します。
+    結果は `results` に項目ごとにリクエストと同じ順序で返します (更新した項目は
+    `status` が 200、タスクまたはラベルが見つからない項目は 404 で、
+    その項目のみ更新されません)。
+    """
+    try:
+        outcomes = await run_db(
+            db, crud.update_tasks_batch, items=batch_input.items
+        )
+    except Exception as e:
+        print(f"Error updating tasks in batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while updating the tasks.",
+        )
+    return _batch_response(
+        outcomes, status.HTTP_200_OK, [item.id for item in batch_input.items]
+    )
+
+
+@router.post(
+    "/tasks/batch/delete",
+    response_model=schemas.TaskBatchResponse,
+    summary="通常タスクの一括削除",
+    tags=["Tasks"],
+)
+async def delete_tasks_batch(
+    batch_input: schemas.TaskBatchDeleteInput,
+    db: DbSession = Depends(get_session),
+) -> schemas.TaskBatchResponse:
+    """
+    複数の通常タスクを 1 トランザクションで削除します (最大 500 件)。
+
+    結果は `results` に項目ごとにリクエストと同じ順序で返します (削除した項目は
+    `status` が 204、見つからない項目や定常タスクは 404)。
+    """
+    task_ids = [str(task_id) for task_id in batch_input.ids]
+    try:
+        deleted = await run_db(db, crud.delete_tasks_batch, task_ids=task_ids)
+    except Exception as e:
+        print(f"Error deleting tasks in batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while deleting the tasks.",
+        )
+    outcomes: List[Tuple[Optional[models.Task], Optional[str]]] = [
+        (None, None if ok else f"Task not found with id: {task_id}")
+        for task_id, ok in zip(task_ids, deleted)
+    ]
+    return _batch_response(
+        outcomes, status.HTTP_204_NO_CONTENT, batch_input.ids
+    )
+
+
 @router.put(
     "/tasks/{task_id}",
     response_model=schemas.Task,
@@ -60,7 +242,7 @@ async def create_new_task(
 async def update_existing_task(
     task_id: str,
     task_input: schemas.TaskUpdateApiInput,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
 ) -> models.Task:
     """
     指定された ID の通常のタスク情報を、リクエストボディの内容で完全に上書きします。
@@ -76,36 +258,77 @@ async def update_existing_task(
     タスクが見つからない場合は 404 エラー、指定されたラベル ID が
     存在しない場合は 404 エラーを返します。
     """
-    # UUID 文字列として妥当か簡易チェック (FastAPIの機能でも可)
+    _validate_task_id(task_id)
+
     try:
-        UUID(task_id, version=4)
-    except ValueError:
+        updated_task = await run_db(
+            db, crud.update_task, task_id=task_id, task_data=task_input
+        )
+    except ValueError as e:
+        # crud.update_task で指定ラベルが見つからない場合に発生
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid task ID format",
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
         )
+    except Exception as e:
+        print(f"Error updating task {task_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while updating the task.",
+        )
+    # 404 の HTTPException を上の except Exception で 500 にしないよう try の外で判定する
+    if updated_task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task not found with id: {task_id}",
+        )
+    return updated_task
+
+
+@router.patch(
+    "/tasks/{task_id}",
+    response_model=schemas.Task,
+    summary="通常タスク部分更新 (完了状態の切り替えなど)",
+    tags=["Tasks"],
+)
+async def patch_existing_task(
+    task_id: str,
+    task_input: schemas.TaskPatchApiInput,
+    db: DbSession = Depends(get_session),
+) -> models.Task:
+    """
+    指定された ID の通常のタスクのうち、リクエストボディで指定した項目のみを更新します。
+
+    - **name** / **assigneeId** / **dueDate** / **isCompleted**: 更新する項目 (任意)
+    - **label_ids**: 指定した場合のみ、紐付けるラベルを置き換えます (最低1つ)
+
+    完了状態の切り替え (`{"isCompleted": true}`) のように、ラベルを変更しない
+    更新ではラベルの紐付けに触れません。
+    タスクが見つからない場合や、指定されたラベル ID が存在しない場合は
+    404 エラーを返します。
+    """
+    _validate_task_id(task_id)
 
     try:
-        updated_task = crud.update_task(
-            db=db, task_id=task_id, task_data=task_input
+        updated_task = await run_db(
+            db, crud.patch_task, task_id=task_id, task_data=task_input
         )
-        if updated_task is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Task not found with id: {task_id}",
-            )
-        return updated_task
     except ValueError as e:
-        # crud.update_task で指定ラベルが見つからない場合に発生
+        # crud.patch_task で指定ラベルが見つからない場合に発生
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
         )
     except Exception as e:
-        print(f"Error updating task {task_id}: {e}")
+        print(f"Error patching task {task_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred while updating the task.",
         )
+    if updated_task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task not found with id: {task_id}",
+        )
+    return updated_task
 
 
 @router.get(
@@ -115,46 +338,93 @@ async def update_existing_task(
     tags=["Tasks"],
 )
 async def read_tasks(
+    request: Request,
     # クエリパラメータを受け取る (OpenAPI定義に合わせる)
     assigneeId: Optional[str] = None,
     isCompleted: Optional[bool] = None,
-    sort: str = "createdAt_desc",
+    # 省略時は createdAt_desc (q を指定した場合は relevance)
+    sort: Optional[str] = None,
     labels: Optional[str] = None,  # カンマ区切り文字列
+    q: Optional[str] = None,  # 名前の検索語 (空白区切り)
+    dueAfter: Optional[date] = None,  # 期限日がこの日以降
+    dueBefore: Optional[date] = None,  # 期限日がこの日以前
     page: int = 1,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,  # 前ページの nextCursor (キーセット方式)
+    # 総数の取得方式 (省略時は設定値 TASK_COUNT_STRATEGY)
+    countStrategy: Optional[Literal["exact", "cached", "estimated"]] = None,
+    db: DbSession = Depends(get_session),
     # current_user: models.User = Depends(get_current_user) # ★ 認証実装後
-) -> schemas.PaginatedTasksResponse:
+) -> Response:
     """
     指定されたフィルター、ソート、ページネーション条件に基づいてタスク一覧を取得します。
     このリストには、条件に一致する**通常のタスク**と、**今日の定常タスク**が含まれる場合があります。
     ページネーション情報(`meta`)は、通常のタスクのみを対象として計算される想定です。
+
+    `cursor` に前回レスポンスの `meta.nextCursor` を指定すると、`page` の代わりに
+    キーセット方式で続きを取得します (深いページでも OFFSET のスキャンが発生しません)。
+    カーソルは同じ `sort` でのみ有効です。
+
+    `q` を指定すると、名前にすべての検索語 (空白区切り) を含むタスクに絞り込み、
+    既定では関連度順 (`sort=relevance`) に並べます。関連度順では `cursor` は
+    使えないため、`page` で続きを取得します。
+
+    `dueAfter` / `dueBefore` を指定すると、期限日がその範囲 (指定日を含む) の
+    タスクに絞り込みます (期限日のないタスクは含みません)。
+
+    `countStrategy` に `cached` / `estimated` を指定すると、`meta.totalItems` に
+    キャッシュ値 / 推定値を返す場合があります (その場合 `meta.totalItemsExact` は
+    false になります)。
+
+    レスポンスには `ETag` ヘッダーが付きます。`If-None-Match` に前回の `ETag` を
+    指定すると、タスク/ラベルに変更がない場合は 304 (ボディなし) を返します。
     """
+    # ETag はタスク/ラベルのバージョン、今日の日付 (今日の定常タスクが変わるため)
+    # とクエリパラメータから計算し、変更がなければ一覧を取得せずに 304 を返す
+    versions = await run_db(
+        db, crud.get_table_versions, [crud.TASKS_TABLE, LABELS_TABLE]
+    )
+    etag = make_etag(
+        versions,
+        recurrence.today().isoformat(),
+        sorted(request.query_params.multi_items()),
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        response: Response = not_modified(etag)
+        return response
+
     # ★ ラベル文字列をリストに変換 (空の場合は None)
     label_list = (
         [label.strip() for label in labels.split(",")] if labels else None
     )
 
-    # ★ current_user_id を取得 (認証が必要) - 今は仮で None
-    current_user_id_placeholder = (
-        "f0e9d8c7-b6a5-4321-fedc-ba9876543210" if assigneeId == "me" else None
-    )
-
-    if assigneeId == "me" and not current_user_id_placeholder:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication required for 'me' filter",
-        )
+    current_user_id = _get_current_user_id(assigneeId)
     try:
-        tasks_list, total_regular_tasks = crud.get_tasks(
-            db=db,
+        (
+            tasks_list,
+            total_regular_tasks,
+            next_cursor,
+            total_is_exact,
+        ) = await run_db(
+            db,
+            crud.get_tasks,
             assignee_id=assigneeId,
             is_completed=isCompleted,
             labels=label_list,
-            sort=sort,
+            sort=sort or (crud.SORT_RELEVANCE if q else "createdAt_desc"),
             page=page,
             limit=limit,
-            current_user_id=current_user_id_placeholder,
+            current_user_id=current_user_id,
+            cursor=cursor,
+            count_strategy=countStrategy,
+            q=q,
+            due_after=dueAfter,
+            due_before=dueBefore,
+        )
+    except ValueError as e:
+        # crud.get_tasks でカーソルの形式が不正な場合に発生
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
         )
     except Exception as e:
         # CRUD 層で予期せぬエラーが発生した場合
@@ -168,19 +438,263 @@ async def read_tasks(
         (total_regular_tasks + limit - 1) // limit if limit > 0 else 0
     )
 
-    # レスポンスを構築
-    response = schemas.PaginatedTasksResponse(
-        data=tasks_list,  # FastAPI が models -> schemas に変換
-        meta=schemas.PaginationMeta(
-            totalItems=total_regular_tasks,
-            totalPages=total_pages,
-            currentPage=page,
+    # レスポンスを構築 (ORM オブジェクトから一度だけ検証し、直接 JSON にする。
+    # Response を返すため FastAPI による再検証とシリアライズは行われない)
+    payload = validate_model(
+        schemas.PaginatedTasksResponse,
+        {
+            "data": tasks_list,
+            "meta": schemas.PaginationMeta(
+                totalItems=total_regular_tasks,
+                totalPages=total_pages,
+                currentPage=page,
+                limit=limit,
+                nextCursor=next_cursor,
+                totalItemsExact=total_is_exact,
+            ),
+        },
+    )
+    response = model_json_response(payload)
+    set_etag_headers(response, etag)
+    return response
+
+
+@router.get(
+    "/tasks/due-summary",
+    response_model=schemas.TaskDueSummaryResponse,
+    summary="期限日ごとの未完了タスクの集計 (ダッシュボード用)",
+    tags=["Tasks"],
+)
+async def read_due_summary(
+    request: Request,
+    assigneeId: Optional[str] = None,
+    limit: int = Query(5, ge=1, le=50),
+    db: DbSession = Depends(get_session),
+) -> Response:
+    """
+    未完了の通常タスクを期限日で区分し、区分ごとの件数と先頭 `limit` 件を返します。
+
+    - **overdue**: 期限切れ (今日より前)
+    - **today**: 期限が今日
+    - **thisWeek**: 期限が明日から 6 日後まで
+    - **noDueDate**: 期限日なし
+
+    今日はアプリケーションのタイムゾーン (APP_TIMEZONE) で判定します。
+    レスポンスには `ETag` ヘッダーが付きます (タスクに変更がない場合は 304)。
+    """
+    today = recurrence.today()
+    versions = await run_db(
+        db, crud.get_table_versions, [crud.TASKS_TABLE, LABELS_TABLE]
+    )
+    etag = make_etag(
+        versions, today.isoformat(), sorted(request.query_params.multi_items())
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        response: Response = not_modified(etag)
+        return response
+
+    current_user_id = _get_current_user_id(assigneeId)
+    try:
+        summary = await run_db(
+            db,
+            crud.get_due_summary,
+            today=today,
+            limit=limit,
+            assignee_id=assigneeId,
+            current_user_id=current_user_id,
+        )
+    except Exception as e:
+        print(f"Error fetching due summary: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve the due summary",
+        )
+
+    payload = validate_model(
+        schemas.TaskDueSummaryResponse,
+        {
+            "baseDate": today,
+            **{
+                name: {"count": count, "tasks": tasks}
+                for name, (count, tasks) in summary.items()
+            },
+        },
+    )
+    response = model_json_response(payload)
+    set_etag_headers(response, etag)
+    return response
+
+
+@router.get(
+    "/tasks/changes",
+    response_model=schemas.TaskChangesResponse,
+    summary="タスクの変更フィード (差分同期)",
+    tags=["Tasks"],
+)
+async def read_task_changes(
+    since: Optional[str] = None,  # 前回レスポンスの nextToken
+    limit: int = Query(100, ge=1, le=1000),
+    db: DbSession = Depends(get_session),
+) -> Response:
+    """
+    `since` のトークンより後に作成/更新された通常タスク (`data`) と、
+    削除されたタスク (`deleted`) を変更順に返します。
+
+    `since` を省略すると最初から返します (初回の全件同期)。レスポンスの
+    `meta.nextToken` を次回の `since` に指定すると、その後の変更のみを取得
+    できます。`meta.hasMore` が true の場合は続けて取得してください。
+    書き込み中の変更を取りこぼさないよう、直近数秒
+    (TASK_CHANGES_SETTLE_SECONDS) の変更は次回以降に返します。
+
+    トークンの形式が不正な場合は 400 エラーを返します。
+    """
+    try:
+        tasks, deleted, next_token, has_more = await run_db(
+            db,
+            crud.get_task_changes,
+            since=since,
             limit=limit,
-        ),
+            settle_seconds=get_settings().task_changes_settle_seconds,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    except Exception as e:
+        print(f"Error fetching task changes: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve task changes",
+        )
+
+    payload = validate_model(
+        schemas.TaskChangesResponse,
+        {
+            "data": tasks,
+            "deleted": deleted,
+            "meta": {
+                "limit": limit,
+                "nextToken": next_token,
+                "hasMore": has_more,
+            },
+        },
     )
+    response: Response = model_json_response(payload)
     return response
 
 
+@router.get(
+    "/tasks/export",
+    summary="通常タスクのエクスポート (NDJSON / CSV)",
+    tags=["Tasks"],
+    response_class=StreamingResponse,
+)
+async def export_tasks(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    assigneeId: Optional[str] = None,
+    isCompleted: Optional[bool] = None,
+    labels: Optional[str] = None,  # カンマ区切り文字列
+    q: Optional[str] = None,
+    dueAfter: Optional[date] = None,
+    dueBefore: Optional[date] = None,
+    session_factory: SessionFactory = Depends(get_session_factory),
+) -> StreamingResponse:
+    """
+    条件に一致する通常のタスクを、ラベルを含めてすべてストリーミングで出力します。
+
+    - **format**: `ndjson` (1 行 1 タスク、一覧の `data` の要素と同じ形式) または
+      `csv` (ラベルはラベル名を `|` 区切りで 1 列に出力)
+    - **assigneeId** / **isCompleted** / **labels** / **q** / **dueAfter** /
+      **dueBefore**: `GET /tasks` と同じフィルター (`q` は絞り込みのみで、
+      出力は関連度順ではなく ID 順)
+
+    タスクは ID 順に一定件数ずつ読み出して出力するため、件数が多くても
+    サーバーのメモリ使用量は増えません。
+    """
+    label_list = (
+        [label.strip() for label in labels.split(",")] if labels else None
+    )
+    current_user_id = _get_current_user_id(assigneeId)
+    batch_size = get_settings().task_export_batch_size
+
+    def generate() -> Iterator[bytes]:
+        # リクエストの依存性のセッションはストリーミング前に閉じられるため、
+        # 専用のセッションで読む (同期イテレーターはスレッドプールで実行される)
+        with session_factory() as db:
+            yield from task_io.export_chunks(
+                format,
+                crud.iter_task_export_batches(
+                    db,
+                    assignee_id=assigneeId,
+                    is_completed=isCompleted,
+                    labels=label_list,
+                    current_user_id=current_user_id,
+                    batch_size=batch_size,
+                    q=q,
+                    due_after=dueAfter,
+                    due_before=dueBefore,
+                ),
+            )
+
+    return StreamingResponse(
+        generate(),
+        media_type=task_io.MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{format}"'
+        },
+    )
+
+
+@router.post(
+    "/tasks/import",
+    summary="通常タスクのインポート (NDJSON / CSV)",
+    tags=["Tasks"],
+    response_class=StreamingResponse,
+)
+async def import_tasks(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    session_factory: SessionFactory = Depends(get_session_factory),
+) -> StreamingResponse:
+    """
+    リクエストボディ (NDJSON または CSV) の各行から通常のタスクを作成します。
+
+    - **format**: `ndjson` (1 行 1 タスク) または `csv` (ヘッダー行が必要)。
+      エクスポート (`GET /tasks/export`) と同じ形式を受け付けます
+    - 各行: `name` (必須)、`assigneeId`、`dueDate`、`isCompleted`、
+      `labels` (ラベル名。NDJSON は配列、CSV は `|` 区切り。1 つ以上必須)
+
+    存在しないラベルは最初にまとめて作成します。タスクは一定件数ごとに
+    作成・コミットし、その都度エラーになった行 (`type: "error"`) と進捗
+    (`type: "progress"`) を NDJSON で返し、最後に集計 (`type: "summary"`) を
+    返します。エラーになった行があっても、他の行のインポートは続けます。
+    """
+    # ボディは受信しながら一時ファイルに書き出す (大きな場合もメモリに載せない)。
+    # ストリーミングレスポンスの送信中はボディを読めないため、受信を終えてから
+    # 解析と書き込みを行う
+    spool = tempfile.SpooledTemporaryFile(
+        max_size=task_io.IMPORT_SPOOL_MAX_BYTES
+    )
+    async for body_chunk in request.stream():
+        spool.write(body_chunk)
+    spool.seek(0)
+    chunk_size = get_settings().task_import_chunk_size
+
+    def generate() -> Iterator[bytes]:
+        # エクスポートと同じく、専用のセッションで書き込む
+        with (
+            session_factory() as db,
+            io.TextIOWrapper(
+                spool, encoding="utf-8-sig", errors="replace", newline=""
+            ) as source,
+        ):
+            yield from task_io.import_tasks(db, format, source, chunk_size)
+
+    return StreamingResponse(
+        generate(), media_type=task_io.MEDIA_TYPES[task_io.FORMAT_NDJSON]
+    )
+
+
 @router.delete(
     "/tasks/{task_id}",
     status_code=status.HTTP_204_NO_CONTENT,  # 成功時はボディなし
@@ -188,7 +702,7 @@ async def read_tasks(
     tags=["Tasks"],
 )
 async def delete_existing_task(
-    task_id: str, db: Session = Depends(get_db)
+    task_id: str, db: DbSession = Depends(get_session)
 ) -> None:
     """
     指定された ID の通常のタスクを削除します。
@@ -196,15 +710,9 @@ async def delete_existing_task(
 
     タスクが見つからない場合は 404 エラーを返します。
     """
-    try:
-        UUID(task_id, version=4)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid task ID format",
-        )
+    _validate_task_id(task_id)
 
-    deleted = crud.delete_task(db=db, task_id=task_id)
+    deleted = await run_db(db, crud.delete_task, task_id=task_id)
     if not deleted:
         # crud.delete_task が False を返した場合 (見つからない or 定常タスク)
         raise HTTPException(
@@ -1,7 +1,8 @@
 from datetime import date, datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
+from uuid import UUID
 
-from pydantic import UUID4, BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 # APIのリクエストボディやレスポンスで使うデータの形状を定義。OpenAPI仕様と密接。
 
@@ -29,20 +30,56 @@ class LabelUpdate(BaseModel):
 
 # API の Label レスポンスに対応
 class Label(LabelBase):
-    id: UUID4
+    id: UUID
     # createdAt, updatedAt は含めない (OpenAPI 仕様に合わせる)
 
     class Config:
         from_attributes = True
 
 
+# ラベルの一括作成 (存在しないもののみ作成) 1 リクエストあたりの最大件数
+LABEL_ENSURE_MAX_ITEMS = 500
+
+
+class LabelEnsureInput(BaseModel):
+    labels: List[LabelCreate] = Field(
+        ..., min_length=1, max_length=LABEL_ENSURE_MAX_ITEMS
+    )
+
+
+class LabelEnsureResponse(BaseModel):
+    data: List[Label] = Field(
+        ..., description="指定された名前のラベル (指定順、重複は除く)"
+    )
+    created: int = Field(..., description="作成したラベルの数")
+
+
+# ラベルと、そのラベルが付いた通常タスクの件数
+class LabelUsage(Label):
+    openTasks: int = Field(..., description="未完了の通常タスクの数")
+    totalTasks: int = Field(..., description="通常タスクの数")
+
+
+class LabelUsageMeta(BaseModel):
+    limit: int
+    nextCursor: Optional[str] = Field(
+        None,
+        description="次ページ取得用のカーソル (次ページがない場合は null)",
+    )
+
+
+class LabelUsageResponse(BaseModel):
+    data: List[LabelUsage]
+    meta: LabelUsageMeta
+
+
 # --- Task Schemas ---
 # ベースとなる Task スキーマ (共通フィールド)
 class TaskBase(BaseModel):
     name: str = Field(
         ..., min_length=1, max_length=100, description="タスク名"
     )
-    assigneeId: Optional[UUID4] = Field(None, description="担当者のユーザーID")
+    assigneeId: Optional[UUID] = Field(None, description="担当者のユーザーID")
     dueDate: Optional[date] = Field(None, description="期限日 (YYYY-MM-DD)")
 
     # Pydantic モデルを ORM モデルと連携させるための設定
@@ -53,7 +90,7 @@ class TaskBase(BaseModel):
 
 # TaskCreate (API の CreateTaskInput に対応)
 class TaskCreateApiInput(TaskBase):
-    label_ids: List[UUID4] = Field(
+    label_ids: List[UUID] = Field(
         ..., description="紐付けるラベルのID配列", min_length=1
     )
 
@@ -61,14 +98,37 @@ class TaskCreateApiInput(TaskBase):
 # TaskUpdate (API の PutTaskInput に対応)
 class TaskUpdateApiInput(TaskBase):
     isCompleted: bool  # PUT では必須
-    label_ids: List[UUID4] = Field(
+    label_ids: List[UUID] = Field(
         ..., description="更新後のラベルID配列", min_length=1
     )
 
 
+# TaskPatch (部分更新。指定された項目のみ更新する)
+class TaskPatchApiInput(BaseModel):
+    name: Optional[str] = Field(
+        None, min_length=1, max_length=100, description="タスク名"
+    )
+    assigneeId: Optional[UUID] = Field(None, description="担当者のユーザーID")
+    dueDate: Optional[date] = Field(None, description="期限日 (YYYY-MM-DD)")
+    isCompleted: Optional[bool] = Field(None, description="完了状態")
+    label_ids: Optional[List[UUID]] = Field(
+        None,
+        description="更新後のラベルID配列 (指定した場合のみ置き換える)",
+        min_length=1,
+    )
+
+    # 必須項目は null を指定して消去できない (省略は可)
+    @field_validator("name", "isCompleted", "label_ids")
+    @classmethod
+    def _not_null(cls: type, value: object) -> object:
+        if value is None:
+            raise ValueError("must not be null")
+        return value
+
+
 # API から読み取る Task スキーマ (DB モデルに対応)
 class Task(TaskBase):
-    id: UUID4
+    id: UUID
     isCompleted: bool
     labels: List[Label] = Field(
         default=[], description="タスクに付与されたラベルのリスト"
@@ -85,6 +145,14 @@ class PaginationMeta(BaseModel):
     totalPages: int
     currentPage: int
     limit: int
+    nextCursor: Optional[str] = Field(
+        None,
+        description="次ページ取得用のカーソル (次ページがない場合は null)",
+    )
+    totalItemsExact: bool = Field(
+        True,
+        description="totalItems が正確な値か (キャッシュ値/推定値の場合は false)",
+    )
 
 
 class PaginatedTasksResponse(BaseModel):
@@ -92,6 +160,172 @@ class PaginatedTasksResponse(BaseModel):
     meta: PaginationMeta
 
 
+# --- Due Summary Schemas (期限日のダッシュボード) ---
+class TaskDueBucket(BaseModel):
+    count: int = Field(..., description="区分に含まれる未完了タスクの数")
+    tasks: List[Task] = Field(
+        ..., description="期限日の近い順 (同日は作成順) の先頭のタスク"
+    )
+
+
+class TaskDueSummaryResponse(BaseModel):
+    baseDate: date = Field(..., description="区分の基準日 (今日)")
+    overdue: TaskDueBucket = Field(..., description="期限切れ (今日より前)")
+    today: TaskDueBucket = Field(..., description="期限が今日")
+    thisWeek: TaskDueBucket = Field(
+        ..., description="期限が明日から 6 日後まで"
+    )
+    noDueDate: TaskDueBucket = Field(..., description="期限日なし")
+
+
+# --- Task Change Feed Schemas (差分同期) ---
+class TaskTombstone(BaseModel):
+    id: UUID = Field(
+        ..., validation_alias="task_id", description="削除したタスクのID"
+    )
+    deletedAt: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TaskChangesMeta(BaseModel):
+    limit: int
+    nextToken: Optional[str] = Field(
+        None,
+        description="次回の since に指定するトークン (変更がない場合は since と同じ)",
+    )
+    hasMore: bool = Field(
+        ..., description="続きの変更があるか (true の場合はすぐに次を取得する)"
+    )
+
+
+class TaskChangesResponse(BaseModel):
+    data: List[Task] = Field(..., description="作成/更新されたタスク")
+    deleted: List[TaskTombstone] = Field(..., description="削除されたタスク")
+    meta: TaskChangesMeta
+
+
+# --- Task Batch Schemas ---
+# 一括操作 1 リクエストあたりの最大件数
+TASK_BATCH_MAX_ITEMS = 500
+
+
+class TaskBatchCreateInput(BaseModel):
+    items: List[TaskCreateApiInput] = Field(
+        ..., min_length=1, max_length=TASK_BATCH_MAX_ITEMS
+    )
+
+
+class TaskBatchUpdateItem(TaskUpdateApiInput):
+    id: UUID
+
+
+class TaskBatchUpdateInput(BaseModel):
+    items: List[TaskBatchUpdateItem] = Field(
+        ..., min_length=1, max_length=TASK_BATCH_MAX_ITEMS
+    )
+
+
+class TaskBatchDeleteInput(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=TASK_BATCH_MAX_ITEMS)
+
+
+# 一括操作の各項目の結果 (リクエストの items / ids と同じ順序で返す)
+class TaskBatchItemResult(BaseModel):
+    index: int = Field(..., description="リクエスト内の項目の位置 (0 始まり)")
+    status: int = Field(..., description="項目ごとの HTTP ステータスコード")
+    id: Optional[UUID] = None
+    data: Optional[Task] = None
+    error: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    results: List[TaskBatchItemResult]
+    succeeded: int
+    failed: int
+
+
+# --- Task Import Schemas ---
+# インポートする 1 行分のタスク (ラベルは ID ではなく名前で指定する)
+class TaskImportRow(TaskBase):
+    isCompleted: bool = False
+    labels: List[LabelCreate] = Field(
+        ...,
+        description="紐付けるラベル (存在しないラベルは作成する)",
+        min_length=1,
+    )
+
+
+# インポートのレスポンス (NDJSON) の各行
+class TaskImportRowError(BaseModel):
+    type: Literal["error"] = "error"
+    row: int = Field(..., description="エラーになった行の番号 (1 始まり)")
+    error: str
+
+
+class TaskImportProgress(BaseModel):
+    type: Literal["progress", "summary"]
+    processed: int = Field(..., description="処理済みの行数")
+    imported: int = Field(..., description="作成したタスクの数")
+    failed: int = Field(..., description="エラーになった行の数")
+    labelsCreated: int = Field(..., description="作成したラベルの数")
+
+
+# --- Routine Occurrence Schemas ---
+# 定常タスクの発生日ごとの記録 (完了状態は発生日ごとに持つ)
+class RoutineOccurrence(BaseModel):
+    taskId: UUID = Field(..., validation_alias="task_id")
+    date: date
+    isCompleted: bool
+    completedAt: Optional[datetime] = None
+    task: Task
+
+    class Config:
+        from_attributes = True
+
+
+class RoutineOccurrenceUpdate(BaseModel):
+    isCompleted: bool
+
+
+# --- Meta Schemas ---
+class DbPoolStatus(BaseModel):
+    asyncEngine: bool = Field(..., description="非同期エンジンを使用中か")
+    poolClass: str
+    size: Optional[int] = Field(None, description="プールの保持コネクション数")
+    checkedIn: Optional[int] = Field(
+        None, description="待機中のコネクション数"
+    )
+    checkedOut: Optional[int] = Field(
+        None, description="使用中 (チェックアウト済み) のコネクション数"
+    )
+    overflow: Optional[int] = Field(
+        None, description="pool_size を超えて作成されているコネクション数"
+    )
+    maxOverflow: Optional[int] = None
+    checkouts: Optional[int] = Field(None, description="累計チェックアウト数")
+    timeouts: Optional[int] = Field(
+        None, description="プール枯渇によるタイムアウトの累計数"
+    )
+    avgWaitMs: Optional[float] = Field(
+        None, description="チェックアウト待ち時間の平均 (ミリ秒)"
+    )
+    maxWaitMs: Optional[float] = Field(
+        None, description="チェックアウト待ち時間の最大 (ミリ秒)"
+    )
+
+
+class TaskLabelWriteStats(BaseModel):
+    updates: int = Field(..., description="ラベルの紐付けを更新した回数")
+    inserted: int = Field(..., description="INSERT した task_labels の行数")
+    deleted: int = Field(..., description="DELETE した task_labels の行数")
+    avoided: int = Field(
+        ...,
+        description="全件 DELETE / INSERT する場合と比べて省略できた書き込み行数",
+    )
+
+
 # --- User Schemas (後で定義) ---
 # class UserBase(BaseModel):
 #     name: str
@@ -101,7 +335,7 @@ class PaginatedTasksResponse(BaseModel):
 #     pass
 
 # class User(UserBase):
-#     id: UUID4
+#     id: UUID
 #     createdAt: datetime
 #     updatedAt: datetime
 
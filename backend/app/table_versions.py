@@ -0,0 +1,65 @@
+from typing import Dict, Iterable
+
+from sqlalchemy import Insert, func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+import models
+
+# テーブルごとの更新バージョン (table_versions テーブル) を扱うモジュール。
+#
+# 書き込み側は対象テーブルの変更と同じトランザクションで bump_version を呼ぶ。
+# 読み取り側 (プロセス内キャッシュ) は、保持しているバージョンと get_version の
+# 値を比べるだけで、他のワーカーによる変更を主キー検索 1 回で検出できる。
+
+
+def get_version(db: Session, table: str) -> int:
+    """テーブルの現在のバージョンを返す (未記録の場合は 0)。"""
+    stmt = select(models.TableVersion.version).where(
+        models.TableVersion.name == table
+    )
+    return db.scalar(stmt) or 0
+
+
+def get_versions(db: Session, tables: Iterable[str]) -> Dict[str, int]:
+    """複数のテーブルのバージョンを 1 回のクエリで返す (未記録の場合は 0)。"""
+    names = list(tables)
+    stmt = select(models.TableVersion.name, models.TableVersion.version).where(
+        models.TableVersion.name.in_(names)
+    )
+    versions = {name: 0 for name in names}
+    versions.update({name: version for name, version in db.execute(stmt)})
+    return versions
+
+
+def bump_version(db: Session, table: str) -> None:
+    """
+    テーブルのバージョンをインクリメントする (コミットは呼び出し側で行う)。
+
+    バージョンの行は書き込みのたびにロックされるため、セッションの保留中の
+    変更を先に flush し、トランザクションの最後にロックを取る (書き込み経路に
+    よってロックの順序が変わるとデッドロックになる)。行がない場合は作成する
+    (同時に作成しても一意制約違反にならないよう 1 回の UPSERT で行う)。
+
+    Args:
+        db: SQLAlchemy セッションオブジェクト。
+        table: 変更したテーブル名。
+    """
+    db.flush()
+    version = models.TableVersion
+    increment = {"version": version.version + 1, "updatedAt": func.now()}
+    stmt: Insert
+    if db.get_bind().dialect.name == "mysql":
+        stmt = (
+            mysql_insert(version)
+            .values(name=table, version=1)
+            .on_duplicate_key_update(**increment)
+        )
+    else:
+        stmt = (
+            sqlite_insert(version)
+            .values(name=table, version=1)
+            .on_conflict_do_update(index_elements=["name"], set_=increment)
+        )
+    db.execute(stmt)
@@ -0,0 +1,258 @@
+import csv
+import io
+import json
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+
+# タスクのエクスポート / インポート (NDJSON / CSV) の書式を扱うモジュール。
+#
+# NDJSON は 1 行に 1 タスク (GET /tasks の data の要素と同じ形式)。
+# CSV はラベルをラベル名の LABEL_SEPARATOR 区切りで 1 列にまとめる。
+# インポートはエクスポートと同じ形式を受け付ける (id や作成日時などは無視する)。
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+
+MEDIA_TYPES = {
+    FORMAT_NDJSON: "application/x-ndjson",
+    FORMAT_CSV: "text/csv; charset=utf-8",
+}
+
+CSV_COLUMNS = [
+    "id",
+    "name",
+    "assigneeId",
+    "dueDate",
+    "isCompleted",
+    "isRecurring",
+    "recurrenceRule",
+    "createdAt",
+    "updatedAt",
+    "labels",
+]
+LABEL_SEPARATOR = "|"
+
+# インポートのリクエストボディをメモリに保持する上限 (超えた分は一時ファイルへ)
+IMPORT_SPOOL_MAX_BYTES = 1024 * 1024
+
+
+def _validate(tasks: List[models.Task]) -> List[schemas.Task]:
+    return [
+        schemas.Task.model_validate(task, from_attributes=True)
+        for task in tasks
+    ]
+
+
+def _ndjson_chunk(tasks: List[models.Task]) -> bytes:
+    return b"".join(
+        task.model_dump_json().encode() + b"\n" for task in _validate(tasks)
+    )
+
+
+def _csv_chunk(tasks: List[models.Task], header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for task in _validate(tasks):
+        row = task.model_dump(mode="json")
+        row["labels"] = LABEL_SEPARATOR.join(
+            label["name"] for label in row["labels"]
+        )
+        writer.writerow(
+            ["" if row[c] is None else row[c] for c in CSV_COLUMNS]
+        )
+    return buffer.getvalue().encode()
+
+
+def export_chunks(
+    fmt: str, batches: Iterable[List[models.Task]]
+) -> Iterator[bytes]:
+    """
+    タスクのバッチを、指定された書式のバイト列 (バッチごと) に変換する。
+
+    CSV の場合は、タスクが 0 件でもヘッダー行を出力する。
+    """
+    if fmt == FORMAT_CSV:
+        header = True
+        for batch in batches:
+            yield _csv_chunk(batch, header)
+            header = False
+        if header:
+            yield _csv_chunk([], True)
+        return
+    for batch in batches:
+        yield _ndjson_chunk(batch)
+
+
+# インポートの 1 行分の解析結果: (行番号, タスク, エラーメッセージ)
+# (タスクとエラーメッセージはどちらか一方が入る)
+ImportRow = Tuple[int, Optional[schemas.TaskImportRow], Optional[str]]
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+def _validate_import_row(line_no: int, data: object) -> ImportRow:
+    if not isinstance(data, dict):
+        return line_no, None, "Row must be an object"
+    try:
+        return line_no, schemas.TaskImportRow.model_validate(data), None
+    except ValidationError as e:
+        return line_no, None, _format_validation_error(e)
+
+
+def _parse_ndjson_line(line_no: int, line: str) -> ImportRow:
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError as e:
+        return line_no, None, f"Invalid JSON: {e.msg}"
+    if isinstance(data, dict) and isinstance(data.get("labels"), list):
+        # ラベルは名前の文字列、またはエクスポート形式のオブジェクトで指定できる
+        data["labels"] = [
+            {"name": label} if isinstance(label, str) else label
+            for label in data["labels"]
+        ]
+    return _validate_import_row(line_no, data)
+
+
+def _csv_record_to_dict(record: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    # 空の列は未指定として扱う (既定値または null になる)
+    data: Dict[str, Any] = {
+        key: value for key, value in record.items() if key and value
+    }
+    data["labels"] = [
+        {"name": name.strip()}
+        for name in (record.get("labels") or "").split(LABEL_SEPARATOR)
+        if name.strip()
+    ]
+    return data
+
+
+def parse_import_rows(fmt: str, lines: Iterable[str]) -> Iterator[ImportRow]:
+    """
+    インポートするデータを 1 行ずつ解析して検証する。
+
+    行番号は NDJSON では行の番号 (空行は読み飛ばす)、CSV ではヘッダー行を
+    除いたレコードの番号 (いずれも 1 始まり)。
+    解析や検証に失敗した行はエラーメッセージを返し、以降の行の処理を続ける。
+    """
+    if fmt == FORMAT_CSV:
+        reader = csv.DictReader(lines)
+        for record_no, record in enumerate(reader, start=1):
+            yield _validate_import_row(record_no, _csv_record_to_dict(record))
+        return
+    for line_no, line in enumerate(lines, start=1):
+        if line.strip():
+            yield _parse_ndjson_line(line_no, line)
+
+
+def _ndjson_line(event: BaseModel) -> bytes:
+    return event.model_dump_json().encode() + b"\n"
+
+
+def _write_import_chunk(
+    db: Session,
+    chunk: List[Tuple[int, schemas.TaskImportRow]],
+    label_id_map: Dict[str, str],
+) -> List[schemas.TaskImportRowError]:
+    """チャンクのタスクを作成してコミットし、エラーになった行を返す。"""
+    if not chunk:
+        return []
+    try:
+        results = crud.import_tasks_chunk(
+            db, [row for _, row in chunk], label_id_map
+        )
+    except SQLAlchemyError as e:
+        # チャンク全体を失敗とし、次のチャンクから続ける
+        db.rollback()
+        print(f"Error importing tasks: {e}")
+        results = [
+            "An unexpected error occurred while importing the row."
+        ] * len(chunk)
+    return [
+        schemas.TaskImportRowError(row=row_no, error=error)
+        for (row_no, _), error in zip(chunk, results)
+        if error is not None
+    ]
+
+
+def import_tasks(
+    db: Session, fmt: str, source: TextIO, chunk_size: int
+) -> Iterator[bytes]:
+    """
+    インポートするデータ (source) からタスクを作成し、進捗を NDJSON で返す。
+
+    source は 2 回読む (先頭へ戻せること)。1 回目で全行のラベルを
+    (大文字小文字を区別せずに重複を除きながら) 集めて存在しないラベルを
+    まとめて作成し、2 回目で chunk_size 件ずつタスクを
+    作成してコミットする。チャンクごとに、その範囲のエラー行
+    (schemas.TaskImportRowError) と進捗 (schemas.TaskImportProgress) を出力し、
+    最後に集計 (type="summary") を出力する。
+    """
+    # 保持するのは異なるラベルのみ (行数によらない)
+    labels: Dict[str, schemas.LabelCreate] = {}
+    for _, row, _ in parse_import_rows(fmt, source):
+        for label in row.labels if row is not None else []:
+            labels.setdefault(label.name.casefold(), label)
+    id_map, labels_created = crud.ensure_labels(db, list(labels.values()))
+    label_id_map = {
+        key: id_map[label.name]
+        for key, label in labels.items()
+        if label.name in id_map
+    }
+    source.seek(0)
+
+    progress = schemas.TaskImportProgress(
+        type="progress",
+        processed=0,
+        imported=0,
+        failed=0,
+        labelsCreated=labels_created,
+    )
+    errors: List[schemas.TaskImportRowError] = []
+    chunk: List[Tuple[int, schemas.TaskImportRow]] = []
+
+    def flush() -> Iterator[bytes]:
+        chunk_errors = _write_import_chunk(db, chunk, label_id_map)
+        progress.processed += len(errors) + len(chunk)
+        progress.imported += len(chunk) - len(chunk_errors)
+        progress.failed += len(errors) + len(chunk_errors)
+        for error in sorted(errors + chunk_errors, key=lambda e: e.row):
+            yield _ndjson_line(error)
+        errors.clear()
+        chunk.clear()
+
+    for row_no, row, error in parse_import_rows(fmt, source):
+        if row is None:
+            errors.append(
+                schemas.TaskImportRowError(row=row_no, error=error or "")
+            )
+        else:
+            chunk.append((row_no, row))
+        if len(chunk) >= chunk_size:
+            yield from flush()
+            yield _ndjson_line(progress)
+    yield from flush()
+    progress.type = "summary"
+    yield _ndjson_line(progress)
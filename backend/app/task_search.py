@@ -0,0 +1,63 @@
+from typing import List
+
+from sqlalchemy import ColumnElement, and_
+from sqlalchemy.dialects.mysql import match
+
+import models
+
+# タスク名の検索 (GET /tasks の q) を扱うモジュール。
+#
+# 検索語は空白 (全角空白を含む) 区切りで、すべての語を含むタスクに絞り込む。
+# MySQL では ngram パーサーの FULLTEXT インデックス (ft_tasks_name) を
+# BOOLEAN MODE で検索し、スコアで関連度順に並べる。それ以外の DB (テストの
+# SQLite など) や SEARCH_LIKE を指定した場合は LIKE '%語%' で絞り込む。
+
+SEARCH_FULLTEXT = "fulltext"
+SEARCH_LIKE = "like"
+
+# MySQL の ngram_token_size (デフォルト 2)。これより短い語は前方一致で検索する
+NGRAM_TOKEN_SIZE = 2
+
+# BOOLEAN MODE の演算子として解釈される文字 (検索語からは取り除く)
+_BOOLEAN_OPERATORS = str.maketrans("", "", '+-<>()~*"@')
+
+
+def parse_terms(q: str) -> List[str]:
+    """検索文字列を検索語のリストに分割する (空の語と重複は除く)。"""
+    terms = [term.translate(_BOOLEAN_OPERATORS) for term in q.split()]
+    return list(dict.fromkeys(term for term in terms if term))
+
+
+def _fulltext_query(terms: List[str]) -> str:
+    """
+    検索語を BOOLEAN MODE の検索式にする。
+
+    各語は必須 (+) のフレーズ検索にし、ngram の並びが連続する行
+    (= 語を部分文字列として含む行) のみに一致させる。
+    """
+    return " ".join(
+        f"+{term}*" if len(term) < NGRAM_TOKEN_SIZE else f'+"{term}"'
+        for term in terms
+    )
+
+
+def fulltext_match(terms: List[str]) -> ColumnElement:
+    """MATCH (name) AGAINST (... IN BOOLEAN MODE) (条件式にも関連度にも使う)。"""
+    return match(
+        models.Task.name, against=_fulltext_query(terms)
+    ).in_boolean_mode()
+
+
+def build_condition(terms: List[str], strategy: str) -> ColumnElement[bool]:
+    """すべての検索語を名前に含むタスクに絞り込む条件式を構築する。"""
+    if strategy == SEARCH_FULLTEXT:
+        return fulltext_match(terms)
+    return and_(
+        *[models.Task.name.contains(term, autoescape=True) for term in terms]
+    )
+
+
+def matches(name: str, terms: List[str]) -> bool:
+    """名前がすべての検索語を含むか (DB を使わずに絞り込む場合)。"""
+    folded = name.casefold()
+    return all(term.casefold() in folded for term in terms)
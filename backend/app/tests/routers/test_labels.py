@@ -1,5 +1,16 @@
+from uuid import uuid4
+
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+import table_versions
+from config import get_settings
 
 
 def test_create_label_success(client: TestClient):
@@ -43,6 +54,25 @@ def test_create_label_duplicate_name(client: TestClient):
     assert "already exists" in data["detail"]  # エラーメッセージの内容を確認
 
 
+def test_create_label_async_session(async_client: TestClient):
+    """POST /labels, GET /labels: AsyncSession (USE_ASYNC_DB=true) でも動作するか"""
+    # Act
+    created = async_client.post(
+        "/api/v1/labels", json={"name": "非同期ラベル", "color": "#123456"}
+    )
+    duplicate = async_client.post(
+        "/api/v1/labels", json={"name": "非同期ラベル"}
+    )
+    listed = async_client.get("/api/v1/labels")
+
+    # Assert: run_sync 内の一意制約違反も 409 に変換される
+    assert created.status_code == status.HTTP_201_CREATED
+    assert created.json()["color"] == "#123456"
+    assert duplicate.status_code == status.HTTP_409_CONFLICT
+    assert listed.status_code == status.HTTP_200_OK
+    assert listed.json() == [created.json()]
+
+
 def test_create_label_missing_name(client: TestClient):
     """POST /labels: 必須項目 name がない場合にエラーになるケース"""
     # Arrange: name を含まないデータを用意
@@ -55,6 +85,36 @@ def test_create_label_missing_name(client: TestClient):
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+def test_create_label_without_refresh(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    """POST /labels: TIMESTAMP_SOURCE=application の場合に読み直さないか"""
+    # Arrange
+    monkeypatch.setattr(get_settings(), "timestamp_source", "application")
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))  # (conn, cursor, statement, ...)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        # Act
+        response = client.post("/api/v1/labels", json={"name": "No Refresh"})
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    # Assert: 重複確認 (ラベルカタログの読み込み) 以降に labels を読まない
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["name"] == "No Refresh"
+    insert_index = next(
+        i for i, stmt in enumerate(statements) if "INSERT INTO labels" in stmt
+    )
+    assert not [
+        stmt for stmt in statements[insert_index:] if "FROM labels" in stmt
+    ]
+
+
 def test_read_labels_empty(client: TestClient):
     """GET /labels: ラベルがまだ作成されていない場合に空リストが返るケース"""
     # Arrange: 事前準備は不要 (db_session fixture がクリーンな状態を保証)
@@ -102,7 +162,277 @@ def test_read_labels_after_creation(client: TestClient):
         assert "id" in item
 
 
+def test_read_labels_etag(client: TestClient):
+    """GET /labels: 変更がなければ 304、ラベル作成後は 200 を返すか"""
+    # Arrange
+    client.post("/api/v1/labels", json={"name": "ETag 1"})
+    etag = client.get("/api/v1/labels").headers["ETag"]
+
+    # Act
+    not_modified = client.get(
+        "/api/v1/labels", headers={"If-None-Match": etag}
+    )
+    client.post("/api/v1/labels", json={"name": "ETag 2"})
+    after_write = client.get("/api/v1/labels", headers={"If-None-Match": etag})
+
+    # Assert
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert after_write.status_code == status.HTTP_200_OK
+    assert [label["name"] for label in after_write.json()] == [
+        "ETag 1",
+        "ETag 2",
+    ]
+
+
+def test_label_catalog_detects_other_worker_changes(db_session: Session):
+    """ラベルカタログ: 他のワーカーでのラベル作成をバージョンで検出するか"""
+    # Arrange: カタログを読み込んだ後、invalidate せずに直接ラベルを追加する
+    crud.create_label(db_session, schemas.LabelCreate(name="Catalog A"))
+    assert [lbl.name for lbl in crud.get_labels(db_session)] == ["Catalog A"]
+    label_id = str(uuid4())
+    db_session.execute(
+        insert(models.Label).values(id=label_id, name="Catalog B")
+    )
+    table_versions.bump_version(db_session, "labels")
+
+    # Act & Assert: 未知の ID は探し直されるため、タスクに紐付けられる
+    task = crud.create_task(
+        db_session,
+        schemas.TaskCreateApiInput(name="Catalog Task", label_ids=[label_id]),
+    )
+    assert [str(lbl.id) for lbl in task.labels] == [label_id]
+    assert [lbl.name for lbl in crud.get_labels(db_session)] == [
+        "Catalog A",
+        "Catalog B",
+    ]
+
+
+def test_read_labels_etag_matches_catalog(
+    client: TestClient, db_session: Session
+):
+    """GET /labels: 他のワーカーでの変更後、古いラベルを新しい ETag で返さないか"""
+    # Arrange: カタログを読み込んだ後、invalidate せずに直接ラベルを追加する
+    client.post("/api/v1/labels", json={"name": "Sync A"})
+    old_etag = client.get("/api/v1/labels").headers["ETag"]
+    db_session.execute(
+        insert(models.Label).values(id=str(uuid4()), name="Sync B")
+    )
+    table_versions.bump_version(db_session, "labels")
+    db_session.commit()
+
+    # Act: 確認間隔内でもバージョンの違いで読み込み直す
+    response = client.get("/api/v1/labels")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != old_etag
+    assert [label["name"] for label in response.json()] == [
+        "Sync A",
+        "Sync B",
+    ]
+
+
+def test_label_catalog_falls_back_to_db_collation(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    """ラベルカタログ: 索引で引けない名前も DB の照合順序での一致で見つけるか"""
+    # Arrange: 照合順序では同一視されるが casefold では一致しない名前
+    # (かなの全角/半角など) を、名前の索引を空にして再現する
+    label = crud.create_label(db_session, schemas.LabelCreate(name="Kana"))
+    load = crud.label_catalog._load
+    monkeypatch.setattr(
+        crud.label_catalog,
+        "_load",
+        lambda db: load(db)._replace(by_name={}),
+    )
+    crud.label_catalog.invalidate()
+
+    # Act
+    id_map = crud.get_label_id_map(db_session, ["Kana", "Unknown"])
+    response = client.post(
+        "/api/v1/labels/ensure", json={"labels": [{"name": "Kana"}]}
+    )
+
+    # Assert: 既存のラベルに対応付け、新しいラベルは作成しない
+    assert id_map == {"Kana": str(label.id)}
+    assert crud.get_label_by_name(db_session, "Kana").id == label.id
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["created"] == 0
+    assert [lbl["id"] for lbl in response.json()["data"]] == [str(label.id)]
+
+
+def test_label_catalog_db_lookup_single_query(
+    db_session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    """ラベルカタログ: 索引で引けない複数の名前を 1 回の IN クエリで探すか"""
+    # Arrange: 名前の索引を空にして、すべての名前を DB で探させる
+    label = crud.create_label(db_session, schemas.LabelCreate(name="Kana"))
+    load = crud.label_catalog._load
+    monkeypatch.setattr(
+        crud.label_catalog,
+        "_load",
+        lambda db: load(db)._replace(by_name={}),
+    )
+    crud.label_catalog.invalidate()
+    crud.get_labels(db_session)  # ラベルカタログを読み込む
+    names = ["Kana"] + [f"Unknown {i}" for i in range(5)]
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))  # (conn, cursor, statement, ...)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        # Act
+        id_map = crud.get_label_id_map(db_session, names)
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    # Assert
+    assert id_map == {"Kana": str(label.id)}
+    label_queries = [stmt for stmt in statements if "FROM labels" in stmt]
+    assert len(label_queries) == 1
+    assert "UNION" not in label_queries[0]
+    if db_session.get_bind().dialect.name == "mysql":
+        # 照合順序で同一視される名前を複数指定しても、それぞれ対応付ける
+        assert crud.get_label_id_map(db_session, ["KANA", "kana"]) == {
+            "KANA": str(label.id),
+            "kana": str(label.id),
+        }
+
+
+def test_label_catalog_create_task_without_label_query(db_session: Session):
+    """ラベルカタログ: 読み込み済みならタスク作成時に labels を参照しないか"""
+    # Arrange
+    label = crud.create_label(db_session, schemas.LabelCreate(name="No Query"))
+    crud.get_labels(db_session)  # カタログを読み込む
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))  # (conn, cursor, statement, ...)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        # Act
+        crud.create_task(
+            db_session,
+            schemas.TaskCreateApiInput(name="No Query", label_ids=[label.id]),
+        )
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    # Assert: ラベルの検証のための SELECT が発行されていない
+    # (task_labels との JOIN は作成後のリレーション読み込み)
+    assert not [
+        stmt
+        for stmt in statements
+        if "FROM labels" in stmt and "task_labels" not in stmt
+    ]
+
+
 # --- (任意) 将来追加するテスト ---
 # def test_update_label(...)
 # def test_delete_label(...)
 # def test_read_labels_pagination(...) # ページネーションを実装した場合
+
+
+def test_read_label_usage(client: TestClient, db_session: Session):
+    """GET /labels/usage: ラベルごとのタスク数を名前のカーソルでページングできるか"""
+    # Arrange: 3 つのラベルと、完了/未完了のタスク
+    home = crud.create_label(db_session, schemas.LabelCreate(name="Usage A"))
+    work = crud.create_label(db_session, schemas.LabelCreate(name="Usage B"))
+    crud.create_label(db_session, schemas.LabelCreate(name="Usage C"))
+    for i in range(3):
+        task = crud.create_task(
+            db_session,
+            schemas.TaskCreateApiInput(
+                name=f"Usage {i}",
+                label_ids=[home.id, work.id] if i == 0 else [home.id],
+            ),
+        )
+        if i == 2:
+            crud.patch_task(
+                db_session,
+                str(task.id),
+                schemas.TaskPatchApiInput(isCompleted=True),
+            )
+
+    # Act
+    first = client.get("/api/v1/labels/usage?limit=2")
+    cursor = first.json()["meta"]["nextCursor"]
+    second = client.get(f"/api/v1/labels/usage?limit=2&cursor={cursor}")
+    invalid = client.get("/api/v1/labels/usage?cursor=not-a-cursor")
+
+    # Assert
+    assert first.status_code == status.HTTP_200_OK
+    assert [
+        (item["name"], item["openTasks"], item["totalTasks"])
+        for item in first.json()["data"] + second.json()["data"]
+    ] == [("Usage A", 2, 3), ("Usage B", 1, 1), ("Usage C", 0, 0)]
+    assert second.json()["meta"]["nextCursor"] is None
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_create_label_conflict_single_insert(
+    client: TestClient, db_session: Session
+):
+    """POST /labels: 重複は事前の SELECT なしに INSERT の一意制約違反で 409 になるか"""
+    # Arrange: 他のワーカーが作成した (カタログに反映されていない) ラベル
+    crud.get_labels(db_session)
+    db_session.execute(
+        insert(models.Label).values(id=str(uuid4()), name="Conflict")
+    )
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))  # (conn, cursor, statement, ...)
+
+    # Act
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        response = client.post("/api/v1/labels", json={"name": "Conflict"})
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    # Assert
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert "already exists" in response.json()["detail"]
+    assert [s.split()[0] for s in statements if "labels" in s] == ["INSERT"]
+
+
+def test_ensure_labels(client: TestClient, db_session: Session):
+    """POST /labels/ensure: 存在しないラベルのみを作成し、指定順に返すか"""
+    # Arrange
+    existing = crud.create_label(
+        db_session, schemas.LabelCreate(name="Ensure A", color="#111111")
+    )
+
+    # Act
+    response = client.post(
+        "/api/v1/labels/ensure",
+        json={
+            "labels": [
+                {"name": "Ensure B", "color": "#222222"},
+                {"name": "Ensure A", "color": "#999999"},
+                {"name": "Ensure B"},
+            ]
+        },
+    )
+    again = client.post(
+        "/api/v1/labels/ensure", json={"labels": [{"name": "Ensure B"}]}
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["created"] == 1
+    assert [(lbl["name"], lbl["color"]) for lbl in body["data"]] == [
+        ("Ensure B", "#222222"),
+        ("Ensure A", "#111111"),
+    ]
+    assert body["data"][1]["id"] == str(existing.id)
+    assert again.json()["created"] == 0
+    assert again.json()["data"][0]["id"] == body["data"][0]["id"]
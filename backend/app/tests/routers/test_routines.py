@@ -0,0 +1,139 @@
+import uuid
+from datetime import date, timedelta
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+
+# 2025-05-05 は月曜日
+MONDAY = date(2025, 5, 5)
+
+
+def create_test_routine(
+    db: Session, name: str, rule: str | None
+) -> models.Task:
+    """テスト用の定常タスクを作成するヘルパー"""
+    label = crud.get_label_by_name(db, name="Routine Test Label")
+    if label is None:
+        label = crud.create_label(
+            db=db, label=schemas.LabelCreate(name="Routine Test Label")
+        )
+    routine = models.Task(
+        name=name, labels=[label], isRecurring=True, recurrenceRule=rule
+    )
+    db.add(routine)
+    db.commit()
+    db.refresh(routine)
+    return routine
+
+
+def test_generate_routine_occurrences_idempotent(db_session: Session):
+    """発生記録の生成は冪等で、ルールに該当する日だけ行が作られる"""
+    daily = create_test_routine(db_session, "Daily", "daily")
+    weekly = create_test_routine(db_session, "Tuesday", "weekly:Tue")
+
+    inserted, deleted = crud.generate_routine_occurrences(
+        db_session, start=MONDAY, days=7
+    )
+    assert (inserted, deleted) == (8, 0)  # 毎日 7 件 + 火曜 1 件
+
+    # 2 回目は何も追加されない
+    assert crud.generate_routine_occurrences(
+        db_session, start=MONDAY, days=7
+    ) == (0, 0)
+
+    occurrences = crud.get_routine_occurrences(
+        db_session, start=MONDAY, end=MONDAY + timedelta(days=6)
+    )
+    weekly_dates = [o.date for o in occurrences if o.task_id == weekly.id]
+    assert weekly_dates == [MONDAY + timedelta(days=1)]
+    assert sum(o.task_id == daily.id for o in occurrences) == 7
+
+
+def test_generate_routine_occurrences_concurrent_insert(db_session: Session):
+    """発生記録の生成: 他のワーカーが先に追加した行を無視して続けるか"""
+    # Arrange: 生成の INSERT の直前に、他のワーカーが月曜分を追加する
+    routine = create_test_routine(db_session, "Concurrent", "daily")
+    bind = db_session.get_bind()
+    done: list[bool] = []
+
+    def insert_first(*args: object) -> None:
+        conn, statement = args[0], str(args[2])
+        if done or not statement.startswith("INSERT"):
+            return
+        if "routine_occurrences" in statement:
+            done.append(True)
+            conn.connection.cursor().execute(  # type: ignore[attr-defined]
+                "INSERT INTO routine_occurrences "
+                '(task_id, date, "isCompleted") VALUES (?, ?, 0)',
+                (uuid.UUID(routine.id).bytes, str(MONDAY)),
+            )
+
+    event.listen(bind, "before_cursor_execute", insert_first)
+
+    # Act
+    try:
+        inserted, deleted = crud.generate_routine_occurrences(
+            db_session, start=MONDAY, days=2
+        )
+    finally:
+        event.remove(bind, "before_cursor_execute", insert_first)
+
+    # Assert: 一意制約違反にならず、自分が追加した行のみを数える
+    assert (inserted, deleted) == (1, 0)
+    occurrences = crud.get_routine_occurrences(
+        db_session, start=MONDAY, end=MONDAY + timedelta(days=1)
+    )
+    assert [o.date for o in occurrences] == [
+        MONDAY,
+        MONDAY + timedelta(days=1),
+    ]
+
+
+def test_update_routine_occurrence_completion(
+    client: TestClient, db_session: Session
+):
+    """PUT /routines/{id}/occurrences/{date}: 発生日ごとに完了状態を記録できる"""
+    # Arrange
+    routine = create_test_routine(db_session, "Stretch", "daily")
+    crud.generate_routine_occurrences(db_session, start=MONDAY, days=2)
+
+    # Act: 月曜分のみ完了にする
+    response = client.put(
+        f"/api/v1/routines/{routine.id}/occurrences/{MONDAY}",
+        json={"isCompleted": True},
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["taskId"] == str(routine.id)
+    assert data["isCompleted"] is True
+    assert data["completedAt"] is not None
+
+    history = client.get(
+        "/api/v1/routines/occurrences",
+        params={
+            "startDate": str(MONDAY),
+            "endDate": str(MONDAY + timedelta(1)),
+        },
+    ).json()
+    assert [o["isCompleted"] for o in history] == [True, False]
+    # 定常タスクの定義は変更されない
+    assert history[0]["task"]["isCompleted"] is False
+
+
+def test_update_routine_occurrence_not_found(client: TestClient):
+    """PUT /routines/{id}/occurrences/{date}: 発生記録がない場合は 404"""
+    response = client.put(
+        "/api/v1/routines/8f1a6e3c-6b0d-4d8e-9a43-2f6c5b1d7e90"
+        f"/occurrences/{MONDAY}",
+        json={"isCompleted": True},
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
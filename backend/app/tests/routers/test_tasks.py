@@ -1,13 +1,20 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
 from uuid import uuid4
 
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import event, select
 from sqlalchemy.orm import Session
 
 import crud
 import models
+import recurrence
 import schemas
+from config import get_settings
 
 
 # --- テストデータ準備用のヘルパー関数 ---
@@ -91,6 +98,405 @@ def test_read_tasks_pagination(client: TestClient, db_session: Session):
     )
 
 
+@pytest.mark.parametrize(
+    "sort", ["dueDate_asc", "dueDate_desc", "createdAt_asc", "createdAt_desc"]
+)
+def test_read_tasks_cursor_pagination(
+    client: TestClient, db_session: Session, sort: str
+):
+    """GET /tasks: nextCursor をたどると全件を重複なく取得できるか"""
+    # Arrange: 期限日あり/なしが混在するタスクを作成
+    label = create_test_label(db=db_session, name="Cursor Label")
+    due_dates = ["2025-05-01", None, "2025-05-01", "2025-06-01", None]
+    for i, due_date in enumerate(due_dates):
+        create_test_task(
+            db=db_session,
+            data=schemas.TaskCreateApiInput(
+                name=f"Cursor Task {i+1}",
+                dueDate=due_date,
+                label_ids=[label.id],
+            ),
+        )
+    response_all = client.get(f"/api/v1/tasks?sort={sort}&limit=100")
+    assert response_all.status_code == status.HTTP_200_OK
+    expected_ids = [t["id"] for t in response_all.json()["data"]]
+    assert response_all.json()["meta"]["nextCursor"] is None
+    if sort.startswith("dueDate"):
+        # 期限日なしのタスクはどちらの向きでも最後に並ぶ
+        assert [t["dueDate"] is None for t in response_all.json()["data"]] == [
+            False,
+            False,
+            False,
+            True,
+            True,
+        ]
+
+    # Act: limit=2 でカーソルをたどる
+    collected_ids: list[str] = []
+    cursor = None
+    for _ in range(len(due_dates)):
+        params: dict[str, str | int] = {"sort": sort, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/tasks", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        collected_ids.extend(t["id"] for t in body["data"])
+        cursor = body["meta"]["nextCursor"]
+        if cursor is None:
+            break
+
+    # Assert: OFFSET 方式と同じ順序で全件が返る
+    assert collected_ids == expected_ids
+
+
+def test_read_tasks_etag(client: TestClient, db_session: Session):
+    """GET /tasks: If-None-Match が一致すれば 304、変更後は 200 を返すか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="ETag Label")
+    task = create_test_task(
+        db_session,
+        schemas.TaskCreateApiInput(name="ETag Task", label_ids=[label.id]),
+    )
+    task_id = str(task.id)
+    first = client.get("/api/v1/tasks?limit=5")
+    etag = first.headers["ETag"]
+
+    # Act
+    not_modified = client.get(
+        "/api/v1/tasks?limit=5", headers={"If-None-Match": etag}
+    )
+    other_query = client.get(
+        "/api/v1/tasks?limit=6", headers={"If-None-Match": etag}
+    )
+    client.patch(f"/api/v1/tasks/{task_id}", json={"isCompleted": True})
+    after_write = client.get(
+        "/api/v1/tasks?limit=5", headers={"If-None-Match": etag}
+    )
+
+    # Assert
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+    assert other_query.status_code == status.HTTP_200_OK
+    assert after_write.status_code == status.HTTP_200_OK
+    assert after_write.headers["ETag"] != etag
+    assert after_write.json()["data"][0]["isCompleted"] is True
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_export_tasks(
+    client: TestClient,
+    db_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    export_format: str,
+):
+    """GET /tasks/export: フィルターに一致する全タスクをラベル付きで出力するか"""
+    # Arrange: バッチの境界をまたぐように件数を設定する
+    monkeypatch.setattr(get_settings(), "task_export_batch_size", 2)
+    home = create_test_label(db=db_session, name="Export Home")
+    work = create_test_label(db=db_session, name="Export Work")
+    for i in range(5):
+        create_test_task(
+            db_session,
+            schemas.TaskCreateApiInput(
+                name=f"Export {i}",
+                label_ids=[home.id, work.id] if i % 2 == 0 else [work.id],
+            ),
+        )
+
+    # Act
+    response = client.get(
+        f"/api/v1/tasks/export?format={export_format}&labels=Export Home"
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    if export_format == "ndjson":
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        labels = [sorted(lbl["name"] for lbl in r["labels"]) for r in rows]
+    else:
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        labels = [sorted(r["labels"].split("|")) for r in rows]
+    assert sorted(r["name"] for r in rows) == [
+        "Export 0",
+        "Export 2",
+        "Export 4",
+    ]
+    assert labels == [["Export Home", "Export Work"]] * 3
+
+
+def test_export_tasks_filters(client: TestClient, db_session: Session):
+    """GET /tasks/export: assigneeId=me / q / dueAfter / dueBefore で絞り込むか"""
+    # Arrange: 'me' は (認証実装前の) 仮の現在のユーザーIDに解決される
+    me = "f0e9d8c7-b6a5-4321-fedc-ba9876543210"
+    label = create_test_label(db=db_session, name="Export Filter")
+    for name, assignee, due in [
+        ("Mine Report", me, date(2024, 5, 10)),
+        ("Mine Shopping", me, date(2024, 6, 1)),
+        ("Other Report", str(uuid4()), date(2024, 5, 10)),
+    ]:
+        create_test_task(
+            db_session,
+            schemas.TaskCreateApiInput(
+                name=name,
+                assigneeId=assignee,
+                dueDate=due,
+                label_ids=[label.id],
+            ),
+        )
+
+    def export_names(query: str) -> list[str]:
+        response = client.get(f"/api/v1/tasks/export?{query}")
+        assert response.status_code == status.HTTP_200_OK
+        return sorted(
+            json.loads(line)["name"] for line in response.text.splitlines()
+        )
+
+    # Act & Assert
+    assert export_names("assigneeId=me") == ["Mine Report", "Mine Shopping"]
+    assert export_names("q=Report") == ["Mine Report", "Other Report"]
+    assert export_names("assigneeId=me&dueBefore=2024-05-31") == [
+        "Mine Report"
+    ]
+    assert export_names("dueAfter=2024-05-11") == ["Mine Shopping"]
+
+
+@pytest.mark.parametrize("import_format", ["ndjson", "csv"])
+def test_import_tasks(
+    client: TestClient,
+    db_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    import_format: str,
+):
+    """POST /tasks/import: ラベルを作成してチャンクごとに作成し、エラー行を報告するか"""
+    # Arrange: 既存のラベル (大文字小文字違いで指定) と新しいラベル
+    monkeypatch.setattr(get_settings(), "task_import_chunk_size", 2)
+    existing = create_test_label(db=db_session, name="Import Home")
+    if import_format == "ndjson":
+        body = "\n".join(
+            [
+                json.dumps({"name": "Import 1", "labels": ["import home"]}),
+                "{not json",
+                json.dumps(
+                    {
+                        "name": "Import 2",
+                        "isCompleted": True,
+                        "labels": [{"name": "Import New", "color": "#FF0000"}],
+                    }
+                ),
+                json.dumps({"labels": ["Import New"]}),
+                json.dumps({"name": "Import 3", "labels": ["Import New"]}),
+            ]
+        )
+    else:
+        body = "\n".join(
+            [
+                "name,dueDate,isCompleted,labels",
+                "Import 1,,,import home",
+                "Import X,not-a-date,,Import New",
+                "Import 2,2025-05-01,true,Import New|Import Home",
+                ",,,Import New",
+                "Import 3,,false,Import New",
+            ]
+        )
+
+    ensured: list[list[str]] = []
+    ensure_labels = crud.ensure_labels
+
+    def record_ensure(
+        db: Session, labels: list[schemas.LabelCreate]
+    ) -> tuple[dict[str, str], int]:
+        ensured.append([label.name for label in labels])
+        result: tuple[dict[str, str], int] = ensure_labels(db, labels)
+        return result
+
+    monkeypatch.setattr(crud, "ensure_labels", record_ensure)
+
+    # Act
+    response = client.post(
+        f"/api/v1/tasks/import?format={import_format}", content=body
+    )
+
+    # Assert: エラー行と進捗 (チャンクごと)、最後に集計を返す
+    assert response.status_code == status.HTTP_200_OK
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["row"] for e in events if e["type"] == "error"] == [2, 4]
+    assert [e["type"] for e in events if e["type"] != "error"] == [
+        "progress",
+        "summary",
+    ]
+    assert events[-1] == {
+        "type": "summary",
+        "processed": 5,
+        "imported": 3,
+        "failed": 2,
+        "labelsCreated": 1,
+    }
+    tasks = {
+        task.name: task
+        for task in db_session.scalars(
+            select(models.Task).where(models.Task.name.like("Import %"))
+        )
+    }
+    assert sorted(tasks) == ["Import 1", "Import 2", "Import 3"]
+    assert [label.id for label in tasks["Import 1"].labels] == [existing.id]
+    assert tasks["Import 2"].isCompleted is True
+    new_label = crud.get_label_by_name(db_session, "Import New")
+    assert new_label is not None
+    assert new_label.id in [label.id for label in tasks["Import 3"].labels]
+    # ラベルは行ごとではなく (大文字小文字を区別せずに) 重複を除いて渡す
+    assert ensured == [["import home", "Import New"]]
+    assert {label.id for label in tasks["Import 2"].labels} == (
+        {new_label.id}
+        if import_format == "ndjson"
+        else {new_label.id, existing.id}
+    )
+
+
+def test_read_tasks_search(client: TestClient, db_session: Session):
+    """GET /tasks?q=: 名前の検索語と他のフィルターを組み合わせて絞り込めるか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="Search Label")
+    names = ["牛乳の買い物", "週末の買い物リスト", "部屋の掃除", "100% 買い物"]
+    for name in names:
+        create_test_task(
+            db_session,
+            schemas.TaskCreateApiInput(name=name, label_ids=[label.id]),
+        )
+    done = crud.get_tasks(db_session, q="週末")[0][0]
+    crud.patch_task(
+        db_session, str(done.id), schemas.TaskPatchApiInput(isCompleted=True)
+    )
+
+    # Act
+    all_matches = client.get("/api/v1/tasks?q=買い物")
+    combined = client.get("/api/v1/tasks?q=買い物&isCompleted=false")
+    multi_term = client.get("/api/v1/tasks?q=買い物　牛乳")
+    literal = client.get("/api/v1/tasks?q=100%")
+    with_cursor = client.get("/api/v1/tasks?q=買い物&cursor=abc")
+
+    # Assert
+    assert all_matches.status_code == status.HTTP_200_OK
+    assert all_matches.json()["meta"]["totalItems"] == 3
+    assert sorted(t["name"] for t in combined.json()["data"]) == [
+        "100% 買い物",
+        "牛乳の買い物",
+    ]
+    assert [t["name"] for t in multi_term.json()["data"]] == ["牛乳の買い物"]
+    assert [t["name"] for t in literal.json()["data"]] == ["100% 買い物"]
+    assert with_cursor.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_read_tasks_due_range(client: TestClient, db_session: Session):
+    """GET /tasks: dueAfter / dueBefore で期限日の範囲 (両端を含む) に絞り込めるか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="Due Range")
+    for name, due_date in [
+        ("Due 04-30", "2025-04-30"),
+        ("Due 05-01", "2025-05-01"),
+        ("Due 05-07", "2025-05-07"),
+        ("Due 05-08", "2025-05-08"),
+        ("Due None", None),
+    ]:
+        create_test_task(
+            db_session,
+            schemas.TaskCreateApiInput(
+                name=name, dueDate=due_date, label_ids=[label.id]
+            ),
+        )
+
+    # Act
+    in_range = client.get(
+        "/api/v1/tasks?dueAfter=2025-05-01&dueBefore=2025-05-07"
+        "&sort=dueDate_asc"
+    )
+    before = client.get("/api/v1/tasks?dueBefore=2025-05-01&sort=dueDate_asc")
+
+    # Assert
+    assert [t["name"] for t in in_range.json()["data"]] == [
+        "Due 05-01",
+        "Due 05-07",
+    ]
+    assert in_range.json()["meta"]["totalItems"] == 2
+    assert [t["name"] for t in before.json()["data"]] == [
+        "Due 04-30",
+        "Due 05-01",
+    ]
+
+
+def test_read_due_summary(client: TestClient, db_session: Session):
+    """GET /tasks/due-summary: 期限日の区分ごとの件数と先頭のタスクを返すか"""
+    # Arrange: 今日を基準に各区分のタスクを作成 (完了済みと来週以降は対象外)
+    label = create_test_label(db=db_session, name="Due Summary")
+    today = recurrence.today()
+    for name, offset in [
+        ("Overdue 2", -2),
+        ("Overdue 1", -1),
+        ("Overdue 3", -3),
+        ("Today", 0),
+        ("Week 6", 6),
+        ("Next Week", 7),
+        ("No Due", None),
+    ]:
+        create_test_task(
+            db_session,
+            schemas.TaskCreateApiInput(
+                name=name,
+                dueDate=(
+                    today + timedelta(days=offset)
+                    if offset is not None
+                    else None
+                ),
+                label_ids=[label.id],
+            ),
+        )
+    done = create_test_task(
+        db_session,
+        schemas.TaskCreateApiInput(
+            name="Done", dueDate=today, label_ids=[label.id]
+        ),
+    )
+    crud.patch_task(
+        db_session, str(done.id), schemas.TaskPatchApiInput(isCompleted=True)
+    )
+
+    # Act
+    response = client.get("/api/v1/tasks/due-summary?limit=2")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["baseDate"] == today.isoformat()
+    summary = {
+        bucket: (
+            body[bucket]["count"],
+            [t["name"] for t in body[bucket]["tasks"]],
+        )
+        for bucket in ("overdue", "today", "thisWeek", "noDueDate")
+    }
+    assert summary == {
+        "overdue": (3, ["Overdue 3", "Overdue 2"]),
+        "today": (1, ["Today"]),
+        "thisWeek": (1, ["Week 6"]),
+        "noDueDate": (1, ["No Due"]),
+    }
+    assert body["today"]["tasks"][0]["labels"][0]["name"] == "Due Summary"
+
+
+def test_read_tasks_invalid_cursor(client: TestClient):
+    """GET /tasks: 不正なカーソル、またはソート順が異なるカーソルは 400"""
+    response = client.get("/api/v1/tasks?cursor=not-a-cursor")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    cursor = crud._encode_task_cursor(
+        "createdAt_desc",
+        models.Task(id=str(uuid4()), createdAt=datetime(2025, 5, 1)),
+    )
+    response = client.get(f"/api/v1/tasks?sort=dueDate_asc&cursor={cursor}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 def test_read_tasks_sort_due_date(client: TestClient, db_session: Session):
     """GET /tasks: 期限日 (dueDate) でソートできるか"""
     # Arrange: 期限日の異なるタスクを作成
@@ -223,6 +629,450 @@ def test_read_tasks_filter_labels(client: TestClient, db_session: Session):
     assert str(task_bc.id) not in returned_a_ids  # task_bc は含まれない
 
 
+def test_read_tasks_only_todays_routines(
+    client: TestClient, db_session: Session
+):
+    """GET /tasks: 今日の発生記録がある定常タスクのみ含まれるか"""
+    # Arrange: 今日発生する定常タスクと、発生しない定常タスクを作成
+    label = create_test_label(db=db_session, name="Routine Filter Label")
+    tomorrow = (recurrence.today().weekday() + 1) % 7
+    byday = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"][tomorrow]
+    due_routine = models.Task(
+        name="Daily Routine",
+        labels=[label],
+        isRecurring=True,
+        recurrenceRule="daily",
+    )
+    not_due_routine = models.Task(
+        name="Tomorrow Routine",
+        labels=[label],
+        isRecurring=True,
+        recurrenceRule=f"FREQ=WEEKLY;BYDAY={byday}",
+    )
+    db_session.add_all([due_routine, not_due_routine])
+    db_session.commit()
+    crud.generate_routine_occurrences(
+        db_session, start=recurrence.today(), days=2
+    )
+
+    # Act
+    response = client.get("/api/v1/tasks")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    routine_ids = [
+        t["id"] for t in response.json()["data"] if t["isRecurring"]
+    ]
+    assert routine_ids == [str(due_routine.id)]
+
+
+@pytest.mark.parametrize("strategy", ["grouped", "exists"])
+def test_get_tasks_label_filter_strategies(db_session: Session, strategy: str):
+    """crud.get_tasks: どちらのラベルフィルター方式でも同じ結果になるか"""
+    # Arrange
+    label_x = create_test_label(db=db_session, name="StrategyX")
+    label_y = create_test_label(db=db_session, name="StrategyY")
+    task_xy = create_test_task(
+        db=db_session,
+        data=schemas.TaskCreateApiInput(
+            name="Task XY", label_ids=[label_x.id, label_y.id]
+        ),
+    )
+    create_test_task(
+        db=db_session,
+        data=schemas.TaskCreateApiInput(name="Task X", label_ids=[label_x.id]),
+    )
+
+    # Act
+    tasks, total, _, _ = crud.get_tasks(
+        db_session,
+        labels=["StrategyX", "StrategyY"],
+        label_filter_strategy=strategy,
+    )
+    unknown_tasks, unknown_total, _, _ = crud.get_tasks(
+        db_session,
+        labels=["StrategyX", "NoSuchLabel"],
+        label_filter_strategy=strategy,
+    )
+
+    # Assert
+    assert [t.id for t in tasks if not t.isRecurring] == [task_xy.id]
+    assert total == 1
+    assert [t for t in unknown_tasks if not t.isRecurring] == []
+    assert unknown_total == 0
+
+
+def test_get_tasks_fused_matches_standard(db_session: Session):
+    """crud.get_tasks: fused モードでも standard モードと同じ結果になるか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="Fused Label")
+    for i in range(5):
+        create_test_task(
+            db=db_session,
+            data=schemas.TaskCreateApiInput(
+                name=f"Fused Task {i+1}", label_ids=[label.id]
+            ),
+        )
+
+    for page in (1, 2, 3):  # 3 ページ目は OFFSET が総数を超える
+        # Act
+        results = {
+            mode: crud.get_tasks(
+                db_session, page=page, limit=2, query_mode=mode
+            )
+            for mode in ("standard", "fused")
+        }
+
+        # Assert: タスク・ラベル・総数・カーソルが一致する
+        std_tasks, std_total, std_cursor, _ = results["standard"]
+        fused_tasks, fused_total, fused_cursor, _ = results["fused"]
+        assert [t.id for t in fused_tasks] == [t.id for t in std_tasks]
+        assert [[lbl.id for lbl in t.labels] for t in fused_tasks] == [
+            [lbl.id for lbl in t.labels] for t in std_tasks
+        ]
+        assert fused_total == std_total == 5
+        assert fused_cursor == std_cursor
+
+
+def test_get_tasks_cached_count(
+    db_session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    """crud.get_tasks: cached 方式で総数がキャッシュされ、作成時に破棄されるか"""
+    # Arrange
+    crud.invalidate_task_count_cache()
+    label = create_test_label(db=db_session, name="Cached Label")
+    for i in range(3):
+        create_test_task(
+            db=db_session,
+            data=schemas.TaskCreateApiInput(
+                name=f"Cached Task {i+1}", label_ids=[label.id]
+            ),
+        )
+
+    # Act: 1 件ずつ取得する (最終ページではないため総数を数える必要がある)
+    def fetch_total() -> tuple:
+        _, total, _, exact = crud.get_tasks(
+            db_session, page=1, limit=1, count_strategy="cached"
+        )
+        return total, exact
+
+    first = fetch_total()
+    second = fetch_total()
+    create_test_task(
+        db=db_session,
+        data=schemas.TaskCreateApiInput(
+            name="Cached Task 4", label_ids=[label.id]
+        ),
+    )
+    after_create = fetch_total()
+    # 他のワーカーでの作成を再現する (このプロセスのキャッシュは破棄されず、
+    # tasks のバージョンだけが進む)
+    monkeypatch.setattr(crud, "invalidate_task_count_cache", lambda: None)
+    create_test_task(
+        db=db_session,
+        data=schemas.TaskCreateApiInput(
+            name="Cached Task 5", label_ids=[label.id]
+        ),
+    )
+    after_other_worker = fetch_total()
+
+    # Assert
+    assert first == (3, True)  # キャッシュがないため数える
+    assert second == (3, False)  # キャッシュ値
+    assert after_create == (4, True)  # 作成時にキャッシュが破棄される
+    # バージョンがキーに含まれるため、古いキャッシュ値は使われない
+    assert after_other_worker == (5, True)
+
+
+def test_get_tasks_total_from_last_page(db_session: Session):
+    """crud.get_tasks: 最終ページを取得した場合は数えずに正確な総数を返すか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="Last Page Label")
+    for i in range(3):
+        create_test_task(
+            db=db_session,
+            data=schemas.TaskCreateApiInput(
+                name=f"Last Page Task {i+1}", label_ids=[label.id]
+            ),
+        )
+
+    # Act
+    _, total, _, exact = crud.get_tasks(
+        db_session, page=2, limit=2, count_strategy="estimated"
+    )
+
+    # Assert
+    assert (total, exact) == (3, True)
+
+
+# --- POST /tasks テスト ---
+def test_create_task_duplicate_label_ids(
+    client: TestClient, db_session: Session
+):
+    """POST /tasks: 同じラベルが重複して指定されても 1 つだけ紐付けるか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="Duplicate Label")
+
+    # Act
+    response = client.post(
+        "/api/v1/tasks",
+        json={
+            "name": "Duplicate Labels",
+            "label_ids": [str(label.id), str(label.id)],
+        },
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [lbl["id"] for lbl in response.json()["labels"]] == [str(label.id)]
+    task = crud.get_task(db_session, task_id=response.json()["id"])
+    assert [str(lbl.id) for lbl in task.labels] == [str(label.id)]
+
+
+# --- PUT /tasks/{taskId} テスト ---
+def test_update_task_label_diff(client: TestClient, db_session: Session):
+    """PUT /tasks/{taskId}: task_labels は追加/削除されたラベルのみ書き込むか"""
+    # Arrange
+    labels = [
+        create_test_label(db=db_session, name=f"Diff {i}") for i in range(3)
+    ]
+    task = create_test_task(
+        db_session,
+        schemas.TaskCreateApiInput(
+            name="Diff", label_ids=[labels[0].id, labels[1].id]
+        ),
+    )
+    before = crud.task_label_write_stats.snapshot()
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))  # (conn, cursor, statement, ...)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        # Act: Diff 1 を Diff 2 に置き換える (Diff 0 はそのまま)
+        response = client.put(
+            f"/api/v1/tasks/{task.id}",
+            json={
+                "name": "Diff",
+                "isCompleted": False,
+                "label_ids": [str(labels[0].id), str(labels[2].id)],
+            },
+        )
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert {lbl["id"] for lbl in response.json()["labels"]} == {
+        str(labels[0].id),
+        str(labels[2].id),
+    }
+    after = crud.task_label_write_stats.snapshot()
+    # 全件書き換え (DELETE 2 行 + INSERT 2 行) に対して 2 行の書き込みで済む
+    assert after["inserted"] - before["inserted"] == 1
+    assert after["deleted"] - before["deleted"] == 1
+    assert after["avoided"] - before["avoided"] == 2
+    label_writes = [
+        stmt
+        for stmt in statements
+        if stmt.startswith(
+            ("INSERT INTO task_labels", "DELETE FROM task_labels")
+        )
+    ]
+    assert len(label_writes) == 2
+
+
+def test_write_without_refresh(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    """TIMESTAMP_SOURCE=application: 作成/更新後にタスクを読み直さないか"""
+    # Arrange
+    monkeypatch.setattr(get_settings(), "timestamp_source", "application")
+    label = create_test_label(db=db_session, name="No Refresh")
+    crud.get_labels(db_session)  # ラベルカタログを読み込む
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))  # (conn, cursor, statement, ...)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        # Act
+        created = client.post(
+            "/api/v1/tasks",
+            json={"name": "No Refresh", "label_ids": [str(label.id)]},
+        )
+        create_statements = list(statements)
+        updated = client.put(
+            f"/api/v1/tasks/{created.json()['id']}",
+            json={
+                "name": "Renamed",
+                "isCompleted": True,
+                "label_ids": [str(label.id)],
+            },
+        )
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    # Assert
+    assert created.status_code == status.HTTP_201_CREATED
+    assert updated.status_code == status.HTTP_200_OK
+    assert created.json()["labels"][0]["name"] == "No Refresh"
+    assert updated.json()["name"] == "Renamed"
+    assert updated.json()["createdAt"] == created.json()["createdAt"]
+    assert not [s for s in create_statements if s.startswith("SELECT")]
+    # 更新は対象タスクと既存ラベルの読み込みのみ (コミット後の読み直しなし)
+    task_selects = [
+        s for s in statements if s.startswith("SELECT") and "tasks" in s
+    ]
+    assert len(task_selects) == 2
+    db_session.expire_all()
+    task = crud.get_task(db_session, task_id=created.json()["id"])
+    assert (task.name, task.isCompleted) == ("Renamed", True)
+
+
+# --- PATCH /tasks/{taskId} テスト ---
+@pytest.mark.parametrize("returning", [True, False])
+def test_patch_task_completion(
+    client: TestClient,
+    db_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    returning: bool,
+):
+    """PATCH /tasks/{taskId}: 完了状態のみを 1 回の UPDATE で切り替えるか"""
+    # Arrange: returning=False は UPDATE ... RETURNING 非対応の DB (MySQL) 相当
+    dialect = db_session.get_bind().dialect
+    monkeypatch.setattr(
+        dialect, "update_returning", returning and dialect.update_returning
+    )
+    label = create_test_label(db=db_session, name="Patch Label")
+    task = create_test_task(
+        db_session,
+        schemas.TaskCreateApiInput(name="Patch Me", label_ids=[label.id]),
+    )
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))  # (conn, cursor, statement, ...)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        # Act
+        response = client.patch(
+            f"/api/v1/tasks/{task.id}", json={"isCompleted": True}
+        )
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["name"], data["isCompleted"]) == ("Patch Me", True)
+    assert [lbl["id"] for lbl in data["labels"]] == [str(label.id)]
+    # (table_versions の更新は ETag 用のバージョン管理)
+    writes = [
+        s
+        for s in statements
+        if s.startswith(("UPDATE", "INSERT")) and "table_versions" not in s
+    ]
+    assert len(writes) == 1 and writes[0].startswith("UPDATE tasks")
+    assert not [s for s in statements if s.startswith("DELETE")]
+    db_session.expire_all()
+    assert crud.get_task(db_session, task_id=str(task.id)).isCompleted
+
+
+def test_patch_task_labels(client: TestClient, db_session: Session):
+    """PATCH /tasks/{taskId}: label_ids を指定した場合のみラベルを置き換えるか"""
+    # Arrange
+    label_a = create_test_label(db=db_session, name="Patch A")
+    label_b = create_test_label(db=db_session, name="Patch B")
+    task = create_test_task(
+        db_session,
+        schemas.TaskCreateApiInput(
+            name="Patch Labels", label_ids=[label_a.id]
+        ),
+    )
+
+    # Act
+    response = client.patch(
+        f"/api/v1/tasks/{task.id}",
+        json={"name": "Renamed", "label_ids": [str(label_b.id)]},
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["name"] == "Renamed"
+    assert data["isCompleted"] is False
+    assert [lbl["id"] for lbl in data["labels"]] == [str(label_b.id)]
+    db_session.expire_all()
+    updated = crud.get_task(db_session, task_id=str(task.id))
+    assert [str(lbl.id) for lbl in updated.labels] == [str(label_b.id)]
+
+
+@pytest.mark.parametrize(
+    "body, expected_status",
+    [
+        ({"isCompleted": True}, status.HTTP_404_NOT_FOUND),
+        ({"name": None}, status.HTTP_422_UNPROCESSABLE_ENTITY),
+        ({"label_ids": [str(uuid4())]}, status.HTTP_404_NOT_FOUND),
+    ],
+)
+def test_patch_task_errors(
+    client: TestClient, db_session: Session, body: dict, expected_status: int
+):
+    """PATCH /tasks/{taskId}: 存在しないタスク/ラベル、null の必須項目"""
+    label = create_test_label(db=db_session, name="Patch Errors")
+    task = create_test_task(
+        db_session,
+        schemas.TaskCreateApiInput(name="Patch Errors", label_ids=[label.id]),
+    )
+    task_id = uuid4() if "isCompleted" in body else task.id
+
+    response = client.patch(f"/api/v1/tasks/{task_id}", json=body)
+
+    assert response.status_code == expected_status
+
+
+@pytest.mark.parametrize("method", ["PUT", "PATCH", "DELETE"])
+@pytest.mark.parametrize(
+    "task_id, expected_status",
+    [
+        ("not-a-uuid", status.HTTP_400_BAD_REQUEST),
+        # バージョン 4 以外の UUID も形式としては受け付ける
+        ("6ba7b810-9dad-11d1-80b4-00c04fd430c8", status.HTTP_404_NOT_FOUND),
+    ],
+)
+def test_task_routes_validate_task_id(
+    client: TestClient,
+    db_session: Session,
+    method: str,
+    task_id: str,
+    expected_status: int,
+):
+    """PUT/PATCH/DELETE /tasks/{taskId}: タスク ID の形式を同じ規則で検証するか"""
+    label = create_test_label(db=db_session, name="Task ID Label")
+    body = {
+        "name": "Task ID",
+        "isCompleted": False,
+        "label_ids": [str(label.id)],
+    }
+
+    response = client.request(
+        method,
+        f"/api/v1/tasks/{task_id}",
+        json=body if method != "DELETE" else None,
+    )
+
+    assert response.status_code == expected_status
+    if expected_status == status.HTTP_400_BAD_REQUEST:
+        assert response.json()["detail"] == "Invalid task ID format"
+
+
 # --- DELETE /tasks/{taskId} テスト ---
 def test_delete_task_success(client: TestClient, db_session: Session):
     """DELETE /tasks/{taskId}: 通常タスクの削除が成功するケース"""
@@ -246,6 +1096,220 @@ def test_delete_task_success(client: TestClient, db_session: Session):
     assert deleted_task is None
 
 
+def test_delete_task_single_statement(client: TestClient, db_session: Session):
+    """DELETE /tasks/{taskId}: タスクを読み込まずに 1 回の DELETE で削除するか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="Delete Once")
+    task = create_test_task(
+        db_session,
+        schemas.TaskCreateApiInput(name="Delete Once", label_ids=[label.id]),
+    )
+    task_id = str(task.id)
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))  # (conn, cursor, statement, ...)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        # Act
+        response = client.delete(f"/api/v1/tasks/{task_id}")
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    # Assert: task_labels は ON DELETE CASCADE で削除される
+    # (INSERT は変更フィード用の task_deletions への記録)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    dml = [
+        s.split()[0]
+        for s in statements
+        if not s.startswith(("SAVEPOINT", "RELEASE"))
+        and "table_versions" not in s
+    ]
+    assert dml == ["DELETE", "INSERT"]
+    task_labels = models.task_labels_table
+    assert not db_session.execute(
+        task_labels.select().where(task_labels.c.task_id == task_id)
+    ).all()
+    assert db_session.get(models.TaskDeletion, task_id) is not None
+
+
+def test_read_task_changes(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    """GET /tasks/changes: トークン以降の作成/更新と削除のみを変更順に返すか"""
+    # Arrange: 既存のタスクは過去に更新されたものにする
+    monkeypatch.setattr(get_settings(), "task_changes_settle_seconds", 0)
+    label = create_test_label(db=db_session, name="Changes")
+    other = create_test_label(db=db_session, name="Changes Other")
+    tasks = [
+        create_test_task(
+            db_session,
+            schemas.TaskCreateApiInput(
+                name=f"Changes {i}", label_ids=[label.id]
+            ),
+        )
+        for i in range(3)
+    ]
+    db_session.execute(
+        models.Task.__table__.update().values(updatedAt=datetime(2025, 1, 1))
+    )
+    db_session.commit()
+
+    # Act: 初回は最初から 2 件ずつ取得する
+    first = client.get("/api/v1/tasks/changes?limit=2").json()
+    second = client.get(
+        f"/api/v1/tasks/changes?limit=2&since={first['meta']['nextToken']}"
+    ).json()
+
+    # Assert: (updatedAt, id) の順に重複なく返す
+    expected_ids = sorted(str(task.id) for task in tasks)
+    assert [t["id"] for t in first["data"]] == expected_ids[:2]
+    assert first["meta"]["hasMore"] is True
+    assert [t["id"] for t in second["data"]] == expected_ids[2:]
+    assert second["meta"]["hasMore"] is False
+    token = second["meta"]["nextToken"]
+
+    # Act: ラベルのみの更新と削除の後に、前回のトークン以降を取得する
+    updated_id, deleted_id = expected_ids[0], expected_ids[1]
+    assert (
+        client.put(
+            f"/api/v1/tasks/{updated_id}",
+            json={
+                "name": "Changes 0",
+                "isCompleted": False,
+                "label_ids": [str(other.id)],
+            },
+        ).status_code
+        == status.HTTP_200_OK
+    )
+    assert (
+        client.delete(f"/api/v1/tasks/{deleted_id}").status_code
+        == status.HTTP_204_NO_CONTENT
+    )
+    response = client.get(f"/api/v1/tasks/changes?since={token}")
+
+    # Assert: 変更されたタスクと削除の記録のみを返す
+    assert response.status_code == status.HTTP_200_OK
+    changes = response.json()
+    assert [t["id"] for t in changes["data"]] == [updated_id]
+    assert [lb["name"] for lb in changes["data"][0]["labels"]] == [
+        "Changes Other"
+    ]
+    assert [d["id"] for d in changes["deleted"]] == [deleted_id]
+    assert changes["meta"]["hasMore"] is False
+
+    # Act/Assert: 変更がなければ空で、トークンはそのまま返す
+    next_token = changes["meta"]["nextToken"]
+    empty = client.get(f"/api/v1/tasks/changes?since={next_token}").json()
+    assert empty["data"] == [] and empty["deleted"] == []
+    assert empty["meta"]["nextToken"] == next_token
+
+    # Act/Assert: 不正なトークンは 400
+    response = client.get("/api/v1/tasks/changes?since=invalid")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_task_changes_long_bulk_write(
+    db_session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    """変更フィード: 読み取り位置が追い越した後にコミットした一括更新も返すか"""
+    # Arrange: アプリケーション側の時刻を固定する
+    monkeypatch.setattr(get_settings(), "timestamp_source", "application")
+    clock = [datetime(2025, 1, 1, 9, 0, 0)]
+    monkeypatch.setattr(crud, "_current_timestamp", lambda: clock[0])
+    label = create_test_label(db=db_session, name="Long Write")
+    task = create_test_task(
+        db_session,
+        schemas.TaskCreateApiInput(name="Long Write", label_ids=[label.id]),
+    )
+    start = clock[0] + timedelta(seconds=1)
+    clock[0] = start
+    bind = db_session.get_bind()
+
+    def slow_write(*args: object) -> None:
+        # 行の書き込みの後、table_versions のロックまでに 10 秒かかったとする
+        if "table_versions" in str(args[2]):
+            clock[0] = start + timedelta(seconds=10)
+
+    event.listen(bind, "before_cursor_execute", slow_write)
+    try:
+        # Act: 一括更新の途中 (開始の 5 秒後) まで読み進めたクライアントが
+        # 後で続きを取得する
+        outcomes = crud.update_tasks_batch(
+            db_session,
+            [
+                schemas.TaskBatchUpdateItem(
+                    id=task.id,
+                    name="Long Write 2",
+                    isCompleted=False,
+                    label_ids=[label.id],
+                )
+            ],
+        )
+    finally:
+        event.remove(bind, "before_cursor_execute", slow_write)
+    token = crud._encode_change_token(
+        start + timedelta(seconds=5), str(uuid4())
+    )
+    changed, _, _, _ = crud.get_task_changes(
+        db_session, since=token, settle_seconds=0
+    )
+
+    # Assert: updatedAt はロックを取った後の時刻で記録される
+    assert outcomes[0][0].updatedAt == start + timedelta(seconds=10)
+    assert [(t.id, t.name) for t in changed] == [(task.id, "Long Write 2")]
+
+    # Act/Assert: 削除の記録 (deletedAt) も同様
+    clock[0] = start
+    event.listen(bind, "before_cursor_execute", slow_write)
+    try:
+        crud.delete_tasks_batch(db_session, [str(task.id)])
+    finally:
+        event.remove(bind, "before_cursor_execute", slow_write)
+    _, deleted, _, _ = crud.get_task_changes(
+        db_session, since=token, settle_seconds=0
+    )
+    assert [d.task_id for d in deleted] == [task.id]
+
+
+def test_delete_tasks_by_filter(db_session: Session):
+    """delete_tasks_by_filter: 条件に一致する通常タスクのみを分割して削除するか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="Cleanup")
+    tasks = [
+        create_test_task(
+            db_session,
+            schemas.TaskCreateApiInput(
+                name=f"Cleanup {i}", label_ids=[label.id]
+            ),
+        )
+        for i in range(5)
+    ]
+    for task in tasks[:3]:
+        task.isCompleted = True
+    routine = models.Task(
+        name="Routine", labels=[label], isRecurring=True, isCompleted=True
+    )
+    db_session.add(routine)
+    db_session.commit()
+
+    # Act
+    deleted = crud.delete_tasks_by_filter(
+        db_session, is_completed=True, batch_size=2
+    )
+
+    # Assert
+    assert deleted == 3
+    remaining = db_session.scalars(
+        select(models.Task.name).order_by(models.Task.name)
+    ).all()
+    assert remaining == ["Cleanup 3", "Cleanup 4", "Routine"]
+    with pytest.raises(ValueError):
+        crud.delete_tasks_by_filter(db_session)
+
+
 def test_delete_task_not_found(client: TestClient):
     """DELETE /tasks/{taskId}: 存在しないタスクIDを指定した場合に 404 エラー"""
     # Arrange: 存在しない UUID を用意
@@ -258,6 +1322,89 @@ def test_delete_task_not_found(client: TestClient):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+@pytest.mark.parametrize("timestamp_source", ["database", "application"])
+def test_task_crud_async_session(
+    async_client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    timestamp_source: str,
+):
+    """/tasks: AsyncSession (USE_ASYNC_DB=true) で作成から削除まで行えるか"""
+    # Arrange
+    monkeypatch.setattr(get_settings(), "timestamp_source", timestamp_source)
+    label_id, other_id = (
+        async_client.post("/api/v1/labels", json={"name": name}).json()["id"]
+        for name in ("Async 1", "Async 2")
+    )
+
+    # Act & Assert: コミット後の属性が失効しないので、レスポンス変換で I/O しない
+    created = async_client.post(
+        "/api/v1/tasks", json={"name": "Async Task", "label_ids": [label_id]}
+    )
+    assert created.status_code == status.HTTP_201_CREATED
+    task_id = created.json()["id"]
+    assert [lbl["id"] for lbl in created.json()["labels"]] == [label_id]
+
+    updated = async_client.put(
+        f"/api/v1/tasks/{task_id}",
+        json={
+            "name": "Renamed",
+            "isCompleted": False,
+            "label_ids": [other_id],
+        },
+    )
+    assert updated.status_code == status.HTTP_200_OK
+    assert updated.json()["name"] == "Renamed"
+    assert [lbl["id"] for lbl in updated.json()["labels"]] == [other_id]
+
+    patched = async_client.patch(
+        f"/api/v1/tasks/{task_id}", json={"isCompleted": True}
+    )
+    assert patched.status_code == status.HTTP_200_OK
+    assert patched.json()["isCompleted"] is True
+
+    # 一括操作はコミット前に読み込んだオブジェクトをそのまま返す
+    batch_updated = async_client.put(
+        "/api/v1/tasks/batch",
+        json={
+            "items": [
+                {
+                    "id": task_id,
+                    "name": "Batch",
+                    "isCompleted": False,
+                    "label_ids": [label_id, other_id],
+                }
+            ]
+        },
+    )
+    assert batch_updated.status_code == status.HTTP_200_OK
+    result = batch_updated.json()["results"][0]
+    assert (result["status"], result["data"]["name"]) == (200, "Batch")
+    assert {lbl["id"] for lbl in result["data"]["labels"]} == {
+        label_id,
+        other_id,
+    }
+
+    listed = async_client.get("/api/v1/tasks")
+    assert listed.status_code == status.HTTP_200_OK
+    assert [task["id"] for task in listed.json()["data"]] == [task_id]
+
+    # crud の ValueError / None も同期セッションと同じステータスに変換される
+    unknown_label = async_client.put(
+        f"/api/v1/tasks/{task_id}",
+        json={"name": "X", "isCompleted": False, "label_ids": [str(uuid4())]},
+    )
+    assert unknown_label.status_code == status.HTTP_404_NOT_FOUND
+    missing = async_client.put(
+        f"/api/v1/tasks/{uuid4()}",
+        json={"name": "X", "isCompleted": False, "label_ids": [label_id]},
+    )
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+    deleted = async_client.delete(f"/api/v1/tasks/{task_id}")
+    assert deleted.status_code == status.HTTP_204_NO_CONTENT
+    assert async_client.get("/api/v1/tasks").json()["data"] == []
+
+
 def test_delete_recurring_task_fails(client: TestClient, db_session: Session):
     """DELETE /tasks/{taskId}: 定常タスクを削除しようとすると失敗する (404) ケース"""
     # Arrange: 定常タスクを作成 (isRecurring=True)
@@ -282,3 +1429,152 @@ def test_delete_recurring_task_fails(client: TestClient, db_session: Session):
     # Assert: DB から削除されていないことを確認
     task_in_db = crud.get_task(db=db_session, task_id=str(task_id))
     assert task_in_db is not None
+
+
+# --- 一括操作 (/tasks/batch) テスト ---
+def test_create_tasks_batch(client: TestClient, db_session: Session):
+    """POST /tasks/batch: 項目ごとの結果を返し、正しい項目のみ作成するか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="Batch Label")
+    missing_label_id = str(uuid4())
+    items = [
+        {"name": "Batch 1", "label_ids": [str(label.id)]},
+        {"name": "Batch 2", "label_ids": [missing_label_id]},
+        # 同じラベルの重複指定は 1 つにまとめる
+        {
+            "name": "Batch 3",
+            "label_ids": [str(label.id), str(label.id)],
+            "dueDate": None,
+        },
+    ]
+
+    # Act
+    response = client.post("/api/v1/tasks/batch", json={"items": items})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert [r["status"] for r in body["results"]] == [201, 404, 201]
+    assert missing_label_id in body["results"][1]["error"]
+    created = body["results"][0]["data"]
+    assert created["name"] == "Batch 1"
+    assert [lbl["id"] for lbl in created["labels"]] == [str(label.id)]
+    task = crud.get_task(db_session, task_id=created["id"])
+    assert task is not None
+    assert [str(lbl.id) for lbl in task.labels] == [str(label.id)]
+    deduped = body["results"][2]["data"]
+    assert [lbl["id"] for lbl in deduped["labels"]] == [str(label.id)]
+    _, total, _, _ = crud.get_tasks(db_session, limit=10)
+    assert total == 2
+
+
+def test_create_tasks_batch_statement_count(db_session: Session):
+    """一括作成: 件数によらず INSERT がテーブルごとに 1 回で済むか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="Batch Count")
+    items = [
+        schemas.TaskCreateApiInput(name=f"Count {i}", label_ids=[label.id])
+        for i in range(20)
+    ]
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))  # (conn, cursor, statement, ...)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        # Act
+        outcomes = crud.create_tasks_batch(db_session, items)
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    # Assert
+    assert all(task is not None for task, _ in outcomes)
+    inserts = [
+        stmt
+        for stmt in statements
+        if stmt.startswith("INSERT") and "table_versions" not in stmt
+    ]
+    assert len(inserts) == 2
+
+
+def test_update_tasks_batch(client: TestClient, db_session: Session):
+    """PUT /tasks/batch: 存在するタスクのみ更新し、ラベルを置き換えるか"""
+    # Arrange
+    label_a = create_test_label(db=db_session, name="Batch Update A")
+    label_b = create_test_label(db=db_session, name="Batch Update B")
+    task = create_test_task(
+        db_session,
+        schemas.TaskCreateApiInput(name="Before", label_ids=[label_a.id]),
+    )
+    task_id = str(task.id)
+    missing_id = str(uuid4())
+    items = [
+        {
+            "id": task_id,
+            "name": "After",
+            "isCompleted": True,
+            "label_ids": [str(label_b.id)],
+        },
+        {
+            "id": missing_id,
+            "name": "Missing",
+            "isCompleted": False,
+            "label_ids": [str(label_a.id)],
+        },
+    ]
+
+    # Act
+    response = client.put("/api/v1/tasks/batch", json={"items": items})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert [r["status"] for r in body["results"]] == [200, 404]
+    assert body["results"][1]["id"] == missing_id
+    assert body["results"][0]["data"]["isCompleted"] is True
+    db_session.expire_all()
+    updated = crud.get_task(db_session, task_id=task_id)
+    assert updated is not None
+    assert (updated.name, updated.isCompleted) == ("After", True)
+    assert [str(lbl.id) for lbl in updated.labels] == [str(label_b.id)]
+
+
+def test_delete_tasks_batch(client: TestClient, db_session: Session):
+    """POST /tasks/batch/delete: 通常タスクのみ削除し、項目ごとの結果を返すか"""
+    # Arrange
+    label = create_test_label(db=db_session, name="Batch Delete")
+    task = create_test_task(
+        db_session,
+        schemas.TaskCreateApiInput(name="Delete Me", label_ids=[label.id]),
+    )
+    routine = models.Task(name="Routine", labels=[label], isRecurring=True)
+    db_session.add(routine)
+    db_session.commit()
+    ids = [str(task.id), str(routine.id), str(uuid4())]
+
+    # Act
+    response = client.post("/api/v1/tasks/batch/delete", json={"ids": ids})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert [r["status"] for r in body["results"]] == [204, 404, 404]
+    assert [r["id"] for r in body["results"]] == ids
+    db_session.expire_all()
+    assert crud.get_task(db_session, task_id=ids[0]) is None
+    assert crud.get_task(db_session, task_id=ids[1]) is not None
+
+
+def test_tasks_batch_limit(client: TestClient):
+    """POST /tasks/batch: 最大件数を超える場合は 422"""
+    items = [
+        {"name": f"Over {i}", "label_ids": [str(uuid4())]}
+        for i in range(schemas.TASK_BATCH_MAX_ITEMS + 1)
+    ]
+
+    response = client.post("/api/v1/tasks/batch", json={"items": items})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
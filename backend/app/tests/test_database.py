@@ -0,0 +1,30 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import models
+from database import create_async_session_factory
+
+
+def test_async_session_keeps_attributes_after_commit(
+    async_engine: AsyncEngine,
+):
+    """AsyncSession: コミット後も属性を I/O なし (run_sync の外) で読めるか"""
+
+    async def create_and_read() -> tuple[str, str | None]:
+        async with async_engine.connect() as connection:
+            transaction = await connection.begin()
+            session_local = create_async_session_factory(async_engine)
+            async with session_local(
+                bind=connection, join_transaction_mode="create_savepoint"
+            ) as db:
+                label = models.Label(name="Async Commit", color="#ABCDEF")
+                db.add(label)
+                await db.commit()
+                # 属性が失効していると、ここで遅延読み込みが発生して失敗する
+                result = (label.name, label.color)
+            await transaction.rollback()
+        return result
+
+    # Act & Assert
+    assert asyncio.run(create_and_read()) == ("Async Commit", "#ABCDEF")
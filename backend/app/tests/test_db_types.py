@@ -0,0 +1,56 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import crud
+import db_types
+import models
+import schemas
+
+
+def test_binary_uuid_round_trip():
+    """BinaryUUID: 文字列 <-> 16 バイトの変換が可逆か"""
+    column_type = db_types.BinaryUUID()
+    value = str(uuid.uuid4())
+
+    stored = column_type.process_bind_param(value, None)
+
+    assert isinstance(stored, bytes) and len(stored) == 16
+    assert column_type.process_result_value(stored, None) == value
+    assert column_type.process_bind_param(None, None) is None
+
+
+def test_binary_uuid_rejects_invalid_string():
+    """BinaryUUID: UUID でない文字列は ValueError になるか"""
+    with pytest.raises(ValueError):
+        db_types.BinaryUUID().process_bind_param("not-a-uuid", None)
+
+
+def test_uuid7_is_time_ordered():
+    """uuid7: バージョン 7 で、生成順にソートされるか"""
+    ids = []
+    for _ in range(3):
+        ids.append(db_types.uuid7())
+        time.sleep(0.002)  # ミリ秒単位の時刻が変わるようにする
+
+    assert all(value.version == 7 for value in ids)
+    assert sorted(ids, key=lambda value: value.bytes) == ids
+
+
+def test_task_ids_are_stored_as_binary(db_session: Session):
+    """ID は BINARY(16) で保存され、モデルでは文字列として読めるか"""
+    label = crud.create_label(db_session, schemas.LabelCreate(name="Binary"))
+    task = crud.create_task(
+        db_session,
+        schemas.TaskCreateApiInput(name="Binary Task", label_ids=[label.id]),
+    )
+
+    raw_id = db_session.execute(text("SELECT id FROM tasks")).scalar_one()
+
+    assert bytes(raw_id) == uuid.UUID(task.id).bytes
+    fetched = db_session.get(models.Task, task.id)
+    assert fetched is not None
+    assert fetched.id == task.id
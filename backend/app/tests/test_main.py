@@ -0,0 +1,22 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+def test_health_check(client: TestClient):
+    """GET /health: 常に OK を返す"""
+    response = client.get("/api/v1/health")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "OK"}
+
+
+def test_db_pool_status(client: TestClient):
+    """GET /health/db-pool: コネクションプールの統計が返る"""
+    response = client.get("/api/v1/health/db-pool")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["poolClass"]
+    assert data["checkedOut"] >= 0
+    assert data["overflow"] >= 0
+    assert data["avgWaitMs"] >= 0
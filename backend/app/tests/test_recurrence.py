@@ -0,0 +1,128 @@
+from datetime import date, datetime
+
+import pytest
+
+import recurrence
+
+# 2025-05-05 は月曜日
+MONDAY = date(2025, 5, 5)
+
+
+@pytest.mark.parametrize(
+    "rule, day, expected",
+    [
+        ("daily", MONDAY, True),
+        ("weekdays", date(2025, 5, 9), True),  # 金曜
+        ("weekdays", date(2025, 5, 10), False),  # 土曜
+        ("weekly:Tue,Fri", date(2025, 5, 6), True),
+        ("weekly:Tue,Fri", MONDAY, False),
+        ("FREQ=WEEKLY;BYDAY=MO,TH", MONDAY, True),
+        ("RRULE:FREQ=WEEKLY;BYDAY=TH", MONDAY, False),
+        ("FREQ=MONTHLY;BYMONTHDAY=5", MONDAY, True),
+        ("FREQ=MONTHLY;BYMONTHDAY=-1", date(2025, 2, 28), True),
+        ("monthly:-1", date(2024, 2, 28), False),  # うるう年
+        ("monthly:1,15", date(2025, 5, 15), True),
+    ],
+)
+def test_occurs_on(rule: str, day: date, expected: bool):
+    """短縮形と RRULE 形式のルールが指定日に発生するか判定できる"""
+    assert recurrence.occurs_on(rule, day) is expected
+
+
+def test_occurs_on_interval_uses_start_date():
+    """INTERVAL は DTSTART (なければ作成日) を起点に数える"""
+    start = MONDAY
+    rule = "FREQ=WEEKLY;INTERVAL=2"
+    assert recurrence.occurs_on(rule, date(2025, 5, 19), start) is True
+    assert recurrence.occurs_on(rule, date(2025, 5, 12), start) is False
+    assert recurrence.occurs_on(rule, date(2025, 4, 21), start) is False
+
+    dtstart_rule = "FREQ=DAILY;INTERVAL=3;DTSTART=20250501"
+    assert recurrence.occurs_on(dtstart_rule, date(2025, 5, 4)) is True
+    assert recurrence.occurs_on(dtstart_rule, date(2025, 5, 5)) is False
+
+
+def test_occurs_on_until_and_count():
+    """UNTIL はその日まで、COUNT は開始日から指定回数だけ発生する"""
+    until_rule = "FREQ=WEEKLY;BYDAY=MO;UNTIL=20250512T000000Z"
+    assert recurrence.occurs_on(until_rule, date(2025, 5, 12)) is True
+    assert recurrence.occurs_on(until_rule, date(2025, 5, 19)) is False
+
+    # 開始日 (作成日) の月曜から平日 3 回 = 月・火・水
+    count_rule = "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR;COUNT=3"
+    assert recurrence.occurs_on(count_rule, date(2025, 5, 7), MONDAY) is True
+    assert recurrence.occurs_on(count_rule, date(2025, 5, 8), MONDAY) is False
+    assert recurrence.occurs_on(count_rule, date(2025, 5, 12), MONDAY) is False
+    assert (
+        recurrence.routines_occurring_on(
+            [("a", "FREQ=DAILY;COUNT=3", datetime(2025, 5, 1))], MONDAY
+        )
+        == []
+    )
+
+
+def test_occurs_on_byday_and_bymonthday_combined():
+    """BYDAY と BYMONTHDAY は FREQ によらず、指定されたものすべてで判定する"""
+    created = date(2025, 4, 10)  # 木曜 (作成日の曜日/日付を使わないこと)
+
+    # FREQ=MONTHLY;BYDAY=MO は毎月の毎週月曜
+    mondays = [date(2025, 5, d) for d in (5, 12, 19, 26)]
+    assert all(
+        recurrence.occurs_on("FREQ=MONTHLY;BYDAY=MO", day, created)
+        for day in mondays
+    )
+    assert not recurrence.occurs_on(
+        "FREQ=MONTHLY;BYDAY=MO", date(2025, 5, 10), created
+    )
+
+    # FREQ=DAILY;BYMONTHDAY=1 は毎月 1 日のみ
+    assert recurrence.occurs_on(
+        "FREQ=DAILY;BYMONTHDAY=1", date(2025, 6, 1), created
+    )
+    assert not recurrence.occurs_on(
+        "FREQ=DAILY;BYMONTHDAY=1", date(2025, 6, 2), created
+    )
+
+    # 両方を指定した場合は両方に一致する日 (2025-09-01 は月曜)
+    both = "FREQ=MONTHLY;BYDAY=MO;BYMONTHDAY=1"
+    assert recurrence.occurs_on(both, date(2025, 9, 1), created)
+    assert not recurrence.occurs_on(both, date(2025, 10, 1), created)
+    assert not recurrence.occurs_on(both, date(2025, 9, 8), created)
+    assert recurrence.routines_occurring_on(
+        [("a", "FREQ=MONTHLY;BYDAY=MO", datetime(2025, 4, 10))], MONDAY
+    ) == ["a"]
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        "FREQ=YEARLY",
+        "FREQ=WEEKLY;BYMONTHDAY=1",  # RFC 5545 で禁止されている組み合わせ
+        "FREQ=MONTHLY;BYDAY=1MO",  # 序数付きの曜日は未対応
+        "weekly:Xyz",
+        "FREQ=MONTHLY;BYMONTH=1",  # 未対応のキー
+        "FREQ=MONTHLY;BYDAY=MO;BYSETPOS=1",
+        "FREQ=DAILY;COUNT=3;UNTIL=20250601",
+        "FREQ=DAILY;COUNT=0",
+    ],
+)
+def test_compile_rule_invalid(rule: str):
+    """解釈できないルール (未対応のキーを含む) は ValueError"""
+    with pytest.raises(ValueError):
+        recurrence.compile_rule(rule)
+
+
+def test_routines_occurring_on_bulk():
+    """複数の定常タスクを一括で判定し、該当する ID のみを入力順で返す"""
+    created = datetime(2025, 4, 28, 9, 0)  # 月曜
+    routines = [
+        ("a", "daily", created),
+        ("b", "weekly:Tue", created),
+        ("c", None, created),  # ルールなしは毎日扱い
+        ("d", "FREQ=WEEKLY;INTERVAL=2", created),  # 隔週月曜
+        ("e", "not a rule", created),  # 不正なルールも毎日扱い
+    ]
+
+    due_ids = recurrence.routines_occurring_on(routines, MONDAY)
+
+    assert due_ids == ["a", "c", "e"]
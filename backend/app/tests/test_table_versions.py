@@ -0,0 +1,42 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import models
+import table_versions
+
+
+def test_bump_version_creates_and_increments(db_session: Session):
+    """bump_version: 行がなければ 1 で作成し、以降はインクリメントするか"""
+    # Act
+    table_versions.bump_version(db_session, "bump_test")
+    table_versions.bump_version(db_session, "bump_test")
+
+    # Assert
+    assert table_versions.get_version(db_session, "bump_test") == 2
+    assert table_versions.get_versions(
+        db_session, ["bump_test", "unknown"]
+    ) == {"bump_test": 2, "unknown": 0}
+
+
+def test_bump_version_flushes_pending_changes_first(db_session: Session):
+    """bump_version: 保留中の変更を先に書き込み、バージョンの行を最後に更新するか"""
+    # Arrange
+    db_session.add(models.Task(name="Pending"))
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))  # (conn, cursor, statement, ...)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        # Act
+        table_versions.bump_version(db_session, "tasks")
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    # Assert
+    writes = [s for s in statements if s.startswith(("INSERT", "UPDATE"))]
+    assert len(writes) == 2
+    assert "INTO tasks" in writes[0]
+    assert "table_versions" in writes[1]
@@ -0,0 +1,247 @@
+import functools
+import itertools
+import json
+import random
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+import crud
+import explain
+import models
+
+# ソート -> ページ取得に使うインデックス名の接尾辞 (ソート列)
+SORT_INDEXES = {
+    "createdAt_desc": "created",
+    "createdAt_asc": "created",
+    "dueDate_asc": "due_sort",
+    "dueDate_desc": "due",
+}
+SORTS = list(SORT_INDEXES)
+# 定常タスクの発生記録を投入する日 (get_tasks の routine_date)
+ROUTINE_DATE = date(2025, 6, 1)
+ASSIGNEE_ID = str(uuid4())
+N_TASKS = 2000
+
+
+def _seed(db: Session) -> None:
+    """オプティマイザが実際のデータ分布で計画を立てられるだけの行を投入する。"""
+    rng = random.Random(0)
+    label_ids = [str(uuid4()) for _ in range(5)]
+    db.execute(
+        insert(models.Label),
+        [
+            {"id": label_id, "name": f"Index Label {i}"}
+            for i, label_id in enumerate(label_ids)
+        ],
+    )
+    assignees = [ASSIGNEE_ID] + [str(uuid4()) for _ in range(9)] + [None]
+    base_time = datetime(2025, 1, 1)
+    task_rows = []
+    link_rows = []
+    for i in range(N_TASKS):
+        task_id = str(uuid4())
+        task_rows.append(
+            {
+                "id": task_id,
+                "name": f"Index Task {i}",
+                "assigneeId": rng.choice(assignees),
+                "dueDate": (
+                    base_time + timedelta(days=rng.randint(0, 365))
+                    if rng.random() < 0.7
+                    else None
+                ),
+                "isCompleted": rng.random() < 0.3,
+                "isRecurring": rng.random() < 0.05,
+                "createdAt": base_time + timedelta(minutes=i),
+                "updatedAt": base_time + timedelta(minutes=i),
+            }
+        )
+        for label_id in rng.sample(label_ids, rng.randint(1, 3)):
+            link_rows.append({"task_id": task_id, "label_id": label_id})
+    db.execute(insert(models.Task), task_rows)
+    db.execute(insert(models.task_labels_table), link_rows)
+    # 定常タスクの発生記録 (ROUTINE_DATE を含む 30 日分)
+    db.execute(
+        insert(models.RoutineOccurrence),
+        [
+            {"task_id": row["id"], "date": ROUTINE_DATE - timedelta(days=d)}
+            for row in task_rows
+            if row["isRecurring"]
+            for d in range(30)
+        ],
+    )
+
+
+@pytest.fixture
+def seeded_db(db_session: Session) -> Session:
+    if db_session.get_bind().dialect.name != "mysql":
+        pytest.skip("EXPLAIN FORMAT=JSON requires MySQL")
+    _seed(db_session)
+    return db_session
+
+
+def _explain_executed(
+    db: Session, run: Callable[[], object]
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """run の中で実際に実行された SELECT 文と、その実行計画のリストを返す。"""
+    executed: List[Tuple[str, Any]] = []
+
+    def record(*args: object) -> None:
+        statement = str(args[2])  # (conn, cursor, statement, parameters, ...)
+        if statement.lstrip().upper().startswith("SELECT"):
+            executed.append((statement, args[3]))
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        run()
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+    connection = db.connection()
+    return [
+        (
+            statement,
+            json.loads(
+                connection.exec_driver_sql(
+                    f"EXPLAIN FORMAT=JSON {statement}", parameters
+                ).scalar_one()
+            ),
+        )
+        for statement, parameters in executed
+    ]
+
+
+def _expected_index(
+    has_assignee: bool, is_completed: Optional[bool], sort: str
+) -> str:
+    """フィルター/ソートの組み合わせで、ページ取得に使われるべきインデックス。"""
+    if has_assignee:
+        prefix = "assignee_"
+    elif is_completed is not None:
+        prefix = "completed_"
+    else:
+        prefix = ""
+    return f"ix_tasks_list_{prefix}{SORT_INDEXES[sort]}"
+
+
+def _check_list_plans(
+    plans: List[Tuple[str, Dict[str, Any]]],
+    expected_index: str,
+    first_page: bool,
+    has_next_page: bool,
+) -> Tuple[List[str], Set[str]]:
+    """
+    get_tasks 1 回分の実行計画を確認する。
+
+    Returns:
+        タプル: (問題点のリスト, ページ取得で tasks に使われたインデックス名)
+    """
+    problems: List[str] = []
+    chosen: Set[str] = set()
+    statements = [statement for statement, _ in plans]
+    page_plans = [
+        plan
+        for statement, plan in plans
+        if "FROM tasks" in statement
+        and "LIMIT" in statement
+        and "OVER (" not in statement
+    ]
+    if len(page_plans) != 1:
+        problems.append(f"page queries: {len(page_plans)}")
+    for plan in page_plans:
+        keys = explain.table_keys(plan, "tasks")
+        chosen.update(keys)
+        if (
+            explain.uses_filesort(plan)
+            or explain.full_scan_tables(plan)
+            or keys != [expected_index]
+        ):
+            problems.append(f"expected {expected_index}: {plan}")
+    for statement, plan in plans:
+        scanned = {"tasks", "routine_occurrences"}.intersection(
+            explain.full_scan_tables(plan)
+        )
+        if scanned:
+            problems.append(f"full scan {scanned}: {statement}")
+    if first_page:
+        # 最初のページでは今日の定常タスクと fused モードのページを読み、
+        # 1 ページに収まらない場合は総数を数える
+        for marker in ("routine_occurrences", "OVER ("):
+            if not any(marker in stmt for stmt in statements):
+                problems.append(f"no query with {marker!r}")
+        if has_next_page and not any("count(" in s for s in statements):
+            problems.append("no count query")
+    return problems, chosen
+
+
+def test_task_list_queries_use_indexes(seeded_db: Session):
+    """
+    タスク一覧のすべてのフィルター/ソートの組み合わせで、get_tasks が実際に
+    発行するクエリ (ページ・総数・今日の定常タスク) を EXPLAIN し、
+    ページは想定した ix_tasks_list_* のインデックス順に読まれ (filesort なし)、
+    どのクエリも tasks / routine_occurrences をフルスキャンしないか
+    (各 ix_tasks_list_* インデックスは、いずれかの組み合わせで選ばれる)。
+    fused モードの COUNT(*) OVER () 付きのページは、一致する全行を読んでから
+    並べるため filesort は許容し、フルスキャンのみ確認する。
+    """
+    failures: List[str] = []
+    chosen: Set[str] = set()
+    for assignee_id, is_completed, labels, sort, paged in itertools.product(
+        [None, ASSIGNEE_ID],
+        [None, False, True],
+        [None, ["Index Label 0"], ["Index Label 0", "Index Label 1"]],
+        SORTS,
+        [False, True],
+    ):
+        params: Dict[str, Any] = dict(
+            assignee_id=assignee_id,
+            is_completed=is_completed,
+            labels=labels,
+            sort=sort,
+            limit=10,
+            routine_date=ROUTINE_DATE,
+        )
+        next_cursor = crud.get_tasks(seeded_db, **params)[2]
+        if paged:
+            # 2 ページ目以降はキーセット方式 (カーソル) で読む
+            if next_cursor is None:
+                continue
+            params["cursor"] = next_cursor
+        plans = _explain_executed(
+            seeded_db, functools.partial(crud.get_tasks, seeded_db, **params)
+        )
+        if not paged:
+            # fused モードの COUNT(*) OVER () 付きのページ (キーセット方式以外)
+            plans += _explain_executed(
+                seeded_db,
+                functools.partial(
+                    crud.get_tasks, seeded_db, query_mode="fused", **params
+                ),
+            )
+
+        problems, keys = _check_list_plans(
+            plans,
+            _expected_index(assignee_id is not None, is_completed, sort),
+            first_page=not paged,
+            has_next_page=next_cursor is not None,
+        )
+        chosen |= keys
+        failures.extend(
+            f"assignee={assignee_id is not None} completed={is_completed} "
+            f"labels={labels} sort={sort} cursor={paged}: {problem}"
+            for problem in problems
+        )
+
+    assert not failures, "\n".join(failures)
+    # 選ばれないインデックスは書き込みのコストになるだけなので置かない
+    list_indexes = {
+        index.name
+        for index in models.Task.__table__.indexes
+        if str(index.name).startswith("ix_tasks_list_")
+    }
+    assert list_indexes - chosen == set()
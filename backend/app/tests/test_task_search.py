@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+
+import models
+import task_search
+
+
+@pytest.mark.parametrize(
+    "q, expected",
+    [
+        ("買い物", ["買い物"]),
+        ("買い物　掃除 買い物", ["買い物", "掃除"]),  # 全角空白、重複
+        ('+洗濯 -"掃除" *', ["洗濯", "掃除"]),  # BOOLEAN MODE の演算子
+        ("   ", []),
+    ],
+)
+def test_parse_terms(q: str, expected: list[str]):
+    """検索文字列を検索語に分割し、演算子の文字を取り除く"""
+    assert task_search.parse_terms(q) == expected
+
+
+def test_fulltext_match_uses_phrase_per_term():
+    """各語を必須のフレーズ (ngram より短い語は前方一致) として検索する"""
+    stmt = select(models.Task.id).where(
+        task_search.fulltext_match(["買い物", "A"])
+    )
+    compiled = stmt.compile(dialect=mysql.dialect())
+    assert "MATCH (tasks.name) AGAINST (%s IN BOOLEAN MODE)" in str(compiled)
+    assert list(compiled.params.values()) == ['+"買い物" +A*']
+
+
+def test_matches():
+    """DB を使わない絞り込みも、すべての語を含む場合のみ一致する"""
+    assert task_search.matches("毎朝の Cleaning", ["clean", "毎朝"])
+    assert not task_search.matches("毎朝の Cleaning", ["clean", "夜"])
@@ -0,0 +1,117 @@
+"""initial schema
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+これまで各環境で autogenerate していたスキーマ (UUID は CHAR(36)) の基準点。
+既存のデータベースには適用せず `alembic stamp 0001_initial_schema` を実行する。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_initial_schema"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column(
+            "createdAt",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updatedAt",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "labels",
+        sa.Column("id", sa.CHAR(36), primary_key=True),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("color", sa.String(7), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_labels_name", "labels", ["name"], unique=True)
+
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.CHAR(36), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("assigneeId", sa.CHAR(36), nullable=True),
+        sa.Column("dueDate", sa.DateTime(), nullable=True),
+        sa.Column("isCompleted", sa.Boolean(), nullable=False),
+        sa.Column("isRecurring", sa.Boolean(), nullable=False),
+        sa.Column("recurrenceRule", sa.String(100), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_tasks_name", "tasks", ["name"])
+    op.create_index("ix_tasks_assigneeId", "tasks", ["assigneeId"])
+    op.create_index("ix_tasks_isCompleted", "tasks", ["isCompleted"])
+    op.create_index("ix_tasks_isRecurring", "tasks", ["isRecurring"])
+
+    op.create_table(
+        "task_labels",
+        sa.Column(
+            "task_id",
+            sa.CHAR(36),
+            sa.ForeignKey("tasks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "label_id",
+            sa.CHAR(36),
+            sa.ForeignKey("labels.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+    )
+
+    op.create_table(
+        "routine_occurrences",
+        sa.Column(
+            "task_id",
+            sa.CHAR(36),
+            sa.ForeignKey("tasks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("date", sa.Date(), primary_key=True),
+        sa.Column("isCompleted", sa.Boolean(), nullable=False),
+        sa.Column("completedAt", sa.DateTime(timezone=True), nullable=True),
+        *_timestamps(),
+    )
+    op.create_index(
+        "ix_routine_occurrences_date", "routine_occurrences", ["date"]
+    )
+
+    op.create_table(
+        "table_versions",
+        sa.Column("name", sa.String(64), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updatedAt",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("table_versions")
+    op.drop_table("routine_occurrences")
+    op.drop_table("task_labels")
+    op.drop_table("tasks")
+    op.drop_table("labels")
@@ -0,0 +1,134 @@
+"""store uuids as binary(16)
+
+Revision ID: 0002_binary_uuid
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 10:30:00.000000
+
+UUID のカラムを CHAR(36) から BINARY(16) に変換する (MySQL 8.0 以降)。
+
+1. 外部キーを削除し、変換先の <カラム>_bin を追加する
+2. UUID_TO_BIN で BATCH_SIZE 行ずつ埋める (1 バッチ 1 トランザクション)
+3. 元のカラムと入れ替え、主キー・インデックス・外部キーを作り直す
+
+2 の間はアプリケーションを停止しておくこと (書き込まれた行は 3 で
+NOT NULL 制約に違反する)。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_binary_uuid"
+down_revision: Union[str, None] = "0001_initial_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10_000
+
+# テーブル -> (UUID カラム, NULL を許可するか) のリスト
+UUID_COLUMNS = {
+    "labels": [("id", False)],
+    "tasks": [("id", False), ("assigneeId", True)],
+    "task_labels": [("task_id", False), ("label_id", False)],
+    "routine_occurrences": [("task_id", False)],
+}
+
+# 主キー (入れ替えで削除されるため作り直す)
+PRIMARY_KEYS = {
+    "labels": ["id"],
+    "tasks": ["id"],
+    "task_labels": ["task_id", "label_id"],
+    "routine_occurrences": ["task_id", "date"],
+}
+
+# UUID カラムを含むセカンダリインデックス: (インデックス名, テーブル, カラム)
+INDEXES = [("ix_tasks_assigneeId", "tasks", ["assigneeId"])]
+
+# 外部キー: (制約名, テーブル, カラム, 参照先テーブル)
+FOREIGN_KEYS = [
+    ("fk_task_labels_task_id", "task_labels", "task_id", "tasks"),
+    ("fk_task_labels_label_id", "task_labels", "label_id", "labels"),
+    (
+        "fk_routine_occurrences_task_id",
+        "routine_occurrences",
+        "task_id",
+        "tasks",
+    ),
+]
+
+
+def _drop_foreign_keys() -> None:
+    # 既存の制約名は環境 (autogenerate / create_all) によって異なるため調べる
+    inspector = sa.inspect(op.get_bind())
+    for table in {fk[1] for fk in FOREIGN_KEYS}:
+        for fk in inspector.get_foreign_keys(table):
+            op.drop_constraint(fk["name"], table, type_="foreignkey")
+
+
+def _create_foreign_keys() -> None:
+    for name, table, column, referent in FOREIGN_KEYS:
+        op.create_foreign_key(
+            name, table, referent, [column], ["id"], ondelete="CASCADE"
+        )
+
+
+def _convert(new_type: str, convert_fn: str) -> None:
+    """UUID カラムを new_type に変換する (convert_fn で値を変換する)。"""
+    bind = op.get_bind()
+    if bind.dialect.name != "mysql":
+        raise NotImplementedError("This migration supports MySQL only")
+
+    _drop_foreign_keys()
+    for table, columns in UUID_COLUMNS.items():
+        op.execute(
+            f"ALTER TABLE `{table}` "
+            + ", ".join(
+                f"ADD COLUMN `{column}_new` {new_type} NULL"
+                for column, _ in columns
+            )
+        )
+
+    # 値の変換: 大きなテーブルでも undo ログやロックが肥大化しないよう、
+    # BATCH_SIZE 行ごとにコミットする
+    with op.get_context().autocommit_block():
+        for table, columns in UUID_COLUMNS.items():
+            for column, _ in columns:
+                stmt = sa.text(
+                    f"UPDATE `{table}` "
+                    f"SET `{column}_new` = {convert_fn}(`{column}`) "
+                    f"WHERE `{column}_new` IS NULL "
+                    f"AND `{column}` IS NOT NULL LIMIT :batch_size"
+                )
+                while True:
+                    result = bind.execute(stmt, {"batch_size": BATCH_SIZE})
+                    if result.rowcount < BATCH_SIZE:
+                        break
+
+    # カラムの入れ替え (元のカラムを削除すると主キーと単一カラムの
+    # インデックスも削除されるため、あわせて作り直す)
+    for table, columns in UUID_COLUMNS.items():
+        clauses = ["DROP PRIMARY KEY"]
+        for column, nullable in columns:
+            clauses.append(f"DROP COLUMN `{column}`")
+            clauses.append(
+                f"CHANGE COLUMN `{column}_new` `{column}` {new_type} "
+                + ("NULL" if nullable else "NOT NULL")
+            )
+        primary_key = ", ".join(f"`{c}`" for c in PRIMARY_KEYS[table])
+        clauses.append(f"ADD PRIMARY KEY ({primary_key})")
+        for name, index_table, index_columns in INDEXES:
+            if index_table == table:
+                index_cols = ", ".join(f"`{c}`" for c in index_columns)
+                clauses.append(f"ADD INDEX `{name}` ({index_cols})")
+        op.execute(f"ALTER TABLE `{table}` " + ", ".join(clauses))
+    _create_foreign_keys()
+
+
+def upgrade() -> None:
+    _convert("BINARY(16)", "UUID_TO_BIN")
+
+
+def downgrade() -> None:
+    _convert("CHAR(36)", "BIN_TO_UUID")
@@ -0,0 +1,74 @@
+"""composite indexes for task list queries
+
+Revision ID: 0003_task_list_indexes
+Revises: 0002_binary_uuid
+Create Date: 2026-10-18 11:00:00.000000
+
+タスク一覧 (crud.get_tasks) のフィルター (isRecurring + assigneeId /
+isCompleted) とソート (createdAt / dueDate) に合わせた複合インデックスを追加し、
+それらが先頭に含む単一カラムのインデックスを削除する。
+assigneeId と isCompleted の両方を含むインデックスは作らない (担当者の
+インデックスで絞り込めば十分で、書き込みのたびに更新するコストに見合わない)。
+
+dueDate 昇順 (NULL は最後) はインデックスで並べられないため、NULL を最大値に
+置き換えた生成列 dueDateSortKey (VIRTUAL) を追加して、その列で並べる。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_task_list_indexes"
+down_revision: Union[str, None] = "0002_binary_uuid"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# インデックス名の接頭辞 -> 先頭の等価条件のカラム
+PREFIXES = {
+    "": ["isRecurring"],
+    "completed_": ["isRecurring", "isCompleted"],
+    "assignee_": ["assigneeId", "isRecurring"],
+}
+# インデックス名の接尾辞 -> ソート列
+SORT_COLUMNS = {
+    "created": "createdAt",
+    "due": "dueDate",
+    "due_sort": "dueDateSortKey",
+}
+LIST_INDEXES = {
+    f"ix_tasks_list_{prefix}{suffix}": [*columns, sort_column]
+    for prefix, columns in PREFIXES.items()
+    for suffix, sort_column in SORT_COLUMNS.items()
+}
+
+# 複合インデックスの先頭に含まれるため不要になる単一カラムのインデックス
+OLD_INDEXES = {
+    "ix_tasks_assigneeId": ["assigneeId"],
+    "ix_tasks_isCompleted": ["isCompleted"],
+    "ix_tasks_isRecurring": ["isRecurring"],
+}
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "dueDateSortKey",
+            sa.DateTime(),
+            sa.Computed("COALESCE(dueDate, '9999-12-31 23:59:59')"),
+        ),
+    )
+    for name, columns in LIST_INDEXES.items():
+        op.create_index(name, "tasks", columns)
+    for name in OLD_INDEXES:
+        op.drop_index(name, table_name="tasks")
+
+
+def downgrade() -> None:
+    for name, columns in OLD_INDEXES.items():
+        op.create_index(name, "tasks", columns)
+    for name in LIST_INDEXES:
+        op.drop_index(name, table_name="tasks")
+    op.drop_column("tasks", "dueDateSortKey")
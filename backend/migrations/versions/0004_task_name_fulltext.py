@@ -0,0 +1,35 @@
+"""fulltext index for task name search
+
+Revision ID: 0004_task_name_fulltext
+Revises: 0003_task_list_indexes
+Create Date: 2026-10-18 12:00:00.000000
+
+タスク名の検索 (GET /tasks の q) 用に、ngram パーサーの FULLTEXT インデックスを
+追加する。InnoDB は最初の FULLTEXT インデックスの追加時に非表示の FTS_DOC_ID 列を
+追加するためテーブルを再構築する (件数が多い場合はメンテナンス時間に実行する)。
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_task_name_fulltext"
+down_revision: Union[str, None] = "0003_task_list_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ft_tasks_name",
+        "tasks",
+        ["name"],
+        mysql_prefix="FULLTEXT",
+        mysql_with_parser="ngram",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ft_tasks_name", table_name="tasks")
@@ -0,0 +1,43 @@
+"""task change feed: deletion tombstones and updatedAt index
+
+Revision ID: 0005_task_changes
+Revises: 0004_task_name_fulltext
+Create Date: 2026-10-18 13:00:00.000000
+
+タスクの変更フィード (GET /tasks/changes) 用に、削除したタスクの記録
+(task_deletions) と、通常タスクを updatedAt 順に読むためのインデックスを追加する。
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_task_changes"
+down_revision: Union[str, None] = "0004_task_name_fulltext"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_deletions",
+        sa.Column("task_id", sa.BINARY(16), primary_key=True),
+        sa.Column(
+            "deletedAt",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_task_deletions_deletedAt", "task_deletions", ["deletedAt"]
+    )
+    op.create_index("ix_tasks_changes", "tasks", ["isRecurring", "updatedAt"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_changes", table_name="tasks")
+    op.drop_table("task_deletions")